@@ -0,0 +1,101 @@
+"""
+Benchmark building the Latin-English dictionary on a synthetic lexicon.
+
+Compares the old list-backed reverse index, which checks `latin_word not in list` on every insert, with the
+set-backed build used by dictionary_manager, on the Zipf-distributed lexicon from common.synthetic_lexicon.
+
+    python benchmarks/bench_dictionary.py --entries 100000
+"""
+
+import time
+import argparse
+
+from common import synthetic_lexicon
+from minerva_cli import dictionary_manager
+
+
+def list_backed_build(lexicon: list[tuple[str, list[str]]]) -> dict:
+    """
+    Build the dictionary the way generate_dictionary originally did, with list membership checks.
+
+    :param lexicon: The lexicon to build from.
+    :return: A dictionary with 'english' and 'latin' maps.
+    """
+
+    latin_dictionary: dict = {}
+    english_dictionary: dict = {}
+
+    for latin_word, english_words in lexicon:
+        latin_dictionary[latin_word] = {"english" : english_words}
+
+        for english_word in english_words:
+            english_word = english_word.lower()
+            english_dictionary.setdefault(english_word, [])
+
+            if latin_word not in english_dictionary[english_word]:
+                english_dictionary[english_word].append(latin_word)
+
+    return {'english': english_dictionary, 'latin': latin_dictionary}
+
+
+def set_backed_build(lexicon: list[tuple[str, list[str]]]) -> dict:
+    """
+    Build the dictionary with dictionary_manager's set-backed reverse index.
+
+    :param lexicon: The lexicon to build from.
+    :return: A dictionary with 'english' and 'latin' maps.
+    """
+
+    dictionary: dict = dictionary_manager.new_dictionary()
+
+    for latin_word, english_words in lexicon:
+        dictionary_manager.add_entry(dictionary, latin_word, english_words)
+
+    return dictionary_manager.freeze_dictionary(dictionary)
+
+
+def measure(build, lexicon: list[tuple[str, list[str]]], repeat: int) -> tuple[float, dict]:
+    """
+    Time a build function, keeping the best of several runs.
+
+    :param build: The build function.
+    :param lexicon: The lexicon to build from.
+    :param repeat: The number of runs.
+    :return: The best time in seconds and the built dictionary.
+    """
+
+    best: float = float('inf')
+    dictionary: dict = {}
+
+    for _ in range(repeat):
+        start_time: float = time.perf_counter()
+        dictionary = build(lexicon)
+        best = min(best, time.perf_counter() - start_time)
+
+    return (best, dictionary)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the dictionary reverse index build.')
+    parser.add_argument('--entries', type=int, default=100000, help='number of synthetic Latin entries')
+    parser.add_argument('--glosses', type=int, default=20000, help='number of distinct English glosses')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per build, the best is reported')
+    args = parser.parse_args()
+
+    lexicon = synthetic_lexicon(args.entries, args.glosses)
+
+    list_time, list_dictionary = measure(list_backed_build, lexicon, args.repeat)
+    set_time, set_dictionary = measure(set_backed_build, lexicon, args.repeat)
+
+    for english_word, latin_words in list_dictionary['english'].items():
+        assert tuple(latin_words) == set_dictionary['english'][english_word]
+
+    largest: int = max(len(latin_words) for latin_words in set_dictionary['english'].values())
+
+    print(f'{args.entries} entries, {len(set_dictionary["english"])} glosses, largest gloss has {largest} Latin words')
+    print(f'list-backed build: {list_time:.3f} s')
+    print(f'set-backed build:  {set_time:.3f} s ({list_time / set_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the memory used by the plain in-memory dictionary and the memory-mapped index.
+
+Both are built from the same synthetic lexicon. The plain dictionary is measured with tracemalloc, as the memory it
+keeps alive once the build is done. The index is compiled to a temporary file first, then opened and measured the same
+way: its entries stay in the file and are only paged in by the lookups that touch them, in pages shared by every
+process that maps the index and reclaimable by the operating system, so the file size is an upper bound on what it adds.
+
+    python benchmarks/bench_memory.py --entries 100000
+"""
+
+import gc
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from common import synthetic_lexicon
+from minerva_cli import dictionary_manager
+
+
+def plain_build(lexicon: list[tuple[str, list[str]]]) -> dict:
+    """
+    Build the frozen nested dict dictionary returned by generate_dictionary.
+
+    :param lexicon: The lexicon to build from.
+    :return: A dictionary with 'english', 'latin', 'folded' and 'forms' maps.
+    """
+
+    dictionary: dict = dictionary_manager.new_dictionary()
+
+    for latin_word, english_words in lexicon:
+        dictionary_manager.add_entry(dictionary, latin_word, english_words)
+
+    return dictionary_manager.freeze_dictionary(dictionary)
+
+
+def measure(build, *args) -> tuple[int, int, float, object]:
+    """
+    Measure the memory kept and peaked by a build function.
+
+    :param build: The build function.
+    :param args: The arguments of the build function.
+    :return: The bytes kept after the build, the peak bytes during it, the build time in seconds and the dictionary.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    start_time: float = time.perf_counter()
+    dictionary = build(*args)
+    elapsed: float = time.perf_counter() - start_time
+
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (kept, peak, elapsed, dictionary)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare the memory used by the plain dictionary and the memory-mapped index.')
+    parser.add_argument('--entries', type=int, default=100000, help='number of synthetic Latin entries')
+    parser.add_argument('--glosses', type=int, default=20000, help='number of distinct English glosses')
+    args = parser.parse_args()
+
+    # Copy every string so that the build does not share string objects with the lexicon
+    lexicon = [(''.join(latin_word), [''.join(english_word) for english_word in english_words]) for latin_word, english_words in synthetic_lexicon(args.entries, args.glosses)]
+
+    plain_kept, plain_peak, plain_time, plain_dictionary = measure(plain_build, lexicon)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path: str = os.path.join(directory, 'dictionary.idx')
+        dictionary_manager.write_index(plain_dictionary, index_path, bytes(32))
+        index_size: int = os.path.getsize(index_path)
+
+        index_kept, index_peak, index_time, index_dictionary = measure(dictionary_manager.CompiledDictionary, index_path)
+
+        with index_dictionary:
+            assert index_dictionary.to_dict() == {section: plain_dictionary[section] for section in dictionary_manager.INDEX_SECTIONS}
+
+    print(f'{args.entries} entries, {len(plain_dictionary["english"])} glosses')
+    print(f'plain dict:   {plain_kept / 2 ** 20:8.1f} MB kept, {plain_peak / 2 ** 20:8.1f} MB peak, {plain_time:.3f} s')
+    print(f'index:        {index_kept / 2 ** 20:8.1f} MB kept, {index_peak / 2 ** 20:8.1f} MB peak, {index_time:.3f} s to open, {index_size / 2 ** 20:.1f} MB mapped ({plain_kept / index_size:.1f}x smaller even if fully paged in)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Shared helpers for the benchmarks: synthetic lexicons, sentences and measurement.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import resource
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_lexicon(entries: int, glosses: int, seed: int = 0) -> list[tuple[str, list[str]]]:
+    """
+    Generate a synthetic lexicon.
+
+    Glosses are one to three word phrases drawn from a Zipf-like distribution so that a few of them ("to be", "man",
+    ...) are shared by a large share of the lexicon, as in the real one.
+
+    :param entries: The number of Latin entries.
+    :param glosses: The number of distinct English glosses.
+    :param seed: The random seed.
+    :return: A list of (latin word, english definitions) tuples.
+    """
+
+    rng: random.Random = random.Random(seed)
+    vocabulary: list[str] = [f'word{i}' for i in range(max(glosses // 2, 1))]
+    gloss_phrases: list[str] = list(dict.fromkeys(
+        ' '.join(rng.choices(vocabulary, k=rng.choice((1, 1, 1, 2, 2, 3)))) for _ in range(glosses)
+    ))
+    weights: list[float] = [1 / (rank + 1) for rank in range(len(gloss_phrases))]
+
+    return [(f'verbum{i}', rng.choices(gloss_phrases, weights=weights, k=rng.randint(1, 4))) for i in range(entries)]
+
+
+def english_glosses(count: int, seed: int = 0) -> list[str]:
+    """
+    Generate distinct English-looking glosses, for cases where the wordNNN keys of synthetic_lexicon would be too easy
+    to tell apart.
+
+    Words are made of random syllables, and about half the glosses are verbs starting with "to ", as in the real
+    dictionary, so that many keys share their first characters.
+
+    :param count: The number of glosses.
+    :param seed: The random seed.
+    :return: A list of glosses.
+    """
+
+    rng: random.Random = random.Random(seed)
+    onsets: list[str] = ['', 'b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'w', 'br', 'ch', 'cl', 'gr', 'pr', 'sh', 'st', 'tr']
+    nuclei: list[str] = ['a', 'e', 'i', 'o', 'u', 'ea', 'ou', 'ai']
+    codas: list[str] = ['', '', 'n', 'r', 's', 't', 'l', 'ng', 'ck', 'st']
+
+    def word() -> str:
+        return ''.join(rng.choice(onsets) + rng.choice(nuclei) + rng.choice(codas) for _ in range(rng.choice((1, 2, 2, 3))))
+
+    vocabulary: list[str] = list(dict.fromkeys(word() for _ in range(max(count // 2, 1))))
+    glosses: dict[str, None] = {}
+
+    while len(glosses) < count:
+        words: list[str] = rng.choices(vocabulary, k=rng.choice((1, 1, 2)))
+        chance: float = rng.random()
+
+        if chance < 0.5:
+            words.insert(0, 'to')
+        elif chance < 0.6:
+            words.insert(0, rng.choice(('the', 'a')))
+
+        glosses[' '.join(words)] = None
+
+    return list(glosses)
+
+
+def synthetic_sentences(lexicon: list[tuple[str, list[str]]], count: int, length: int = 12, seed: int = 0) -> list[str]:
+    """
+    Generate English sentences made of dictionary glosses and filler words.
+
+    :param lexicon: The lexicon to draw glosses from.
+    :param count: The number of sentences.
+    :param length: The approximate number of words per sentence.
+    :param seed: The random seed.
+    :return: A list of sentences.
+    """
+
+    rng: random.Random = random.Random(seed)
+    sentences: list[str] = []
+
+    for _ in range(count):
+        words: list[str] = []
+
+        while len(words) < length:
+            if rng.random() < 0.6:
+                words.extend(rng.choice(rng.choice(lexicon)[1]).split(' '))
+            else:
+                words.append(rng.choice(('the', 'a', 'and', 'of', 'with', 'quickly')))
+
+        sentences.append(' '.join(words))
+
+    return sentences
+
+
+def write_lexicon(lexicon: list[tuple[str, list[str]]], directory: str) -> list[str]:
+    """
+    Write a lexicon as one JSON file per entry, like DATA_DIR/dictionary.
+
+    :param lexicon: The lexicon to write.
+    :param directory: The directory to write to.
+    :return: The written file paths.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    files: list[str] = []
+
+    for position, (latin_word, english_words) in enumerate(lexicon):
+        file: str = os.path.join(directory, f'{position}.json')
+
+        with open(file, mode='w', encoding='utf-8') as f:
+            json.dump({'word': latin_word, 'definitions': english_words}, f)
+
+        files.append(file)
+
+    return files
+
+
+def peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of the current process.
+
+    :return: The peak RSS in megabytes.
+    """
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+
+    return peak / 1024
+
+
+def timed(function, *args, **kwargs) -> tuple[float, object]:
+    """
+    Call a function and time it.
+
+    :param function: The function to call.
+    :return: The wall time in seconds and the function's return value.
+    """
+
+    start_time: float = time.perf_counter()
+    value = function(*args, **kwargs)
+
+    return (time.perf_counter() - start_time, value)
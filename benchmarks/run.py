@@ -0,0 +1,481 @@
+"""
+Benchmark the dictionary and candidate-generation hot paths.
+
+Every case runs in a fresh process so that its peak RSS is its own. Lexicons are synthetic, at each of --sizes
+entries, plus the real dictionary when --fixture points at a DATA_DIR/dictionary directory.
+
+    python benchmarks/run.py --sizes 1000 10000 100000 --save baseline.json
+    python benchmarks/run.py --sizes 1000 10000 100000 --compare baseline.json
+
+Sentence cases use --corpus when given. Cases that need NLTK data (convert_to_base, synonym_extractor) are skipped when it is not installed.
+"""
+
+import os
+import glob
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from common import english_glosses, synthetic_lexicon, synthetic_sentences, write_lexicon, peak_rss_mb, timed
+
+
+@contextlib.contextmanager
+def _quiet():
+    """
+    Silence the progress messages printed by dictionary_manager.
+    """
+
+    with open(os.devnull, mode='w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _load(files: list[str], index_path: str | None) -> object:
+    """
+    Load the dictionary for a case, from the compiled index if a path is given.
+    """
+
+    from minerva_cli import dictionary_manager
+
+    with _quiet():
+        if index_path is None:
+            return dictionary_manager.generate_dictionary(files)
+
+        return dictionary_manager.load_dictionary(files, index_path)
+
+
+def _sample(keys: list[str], count: int, seed: int = 0) -> list[str]:
+    """
+    Sample lookup queries, a tenth of them misses.
+    """
+
+    rng: random.Random = random.Random(seed)
+
+    return [rng.choice(keys) if rng.random() < 0.9 else f'missing {i}' for i in range(count)]
+
+
+def case_generate_dictionary(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import dictionary_manager
+
+    with _quiet():
+        wall, _ = timed(dictionary_manager.generate_dictionary, files)
+
+    return {'wall_s': wall, 'ops': len(files)}
+
+
+def case_compile_dictionary(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import dictionary_manager
+
+    with _quiet():
+        wall, _ = timed(dictionary_manager.compile_dictionary, files, index_path)
+
+    return {'wall_s': wall, 'ops': len(files)}
+
+
+def _update(files: list[str], index_path: str, edit: bool) -> dict:
+    from minerva_cli import dictionary_manager
+
+    # Compile to an index of its own, then time the update after one source file changes, or after none did to measure
+    # the scan of the sources every update starts with
+    update_path: str = f'{os.path.splitext(index_path)[0]}-update.idx'
+    file: str = files[len(files) // 2]
+    stat = os.stat(file)
+
+    with open(file, mode='rb') as f:
+        original: bytes = f.read()
+
+    with _quiet():
+        dictionary_manager.compile_dictionary(files, update_path)
+
+    if edit:
+        data: dict = json.loads(original)
+        data['definitions'] = [*data['definitions'], 'updated gloss']
+
+        with open(file, mode='w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    try:
+        with _quiet():
+            wall, _ = timed(dictionary_manager.update_dictionary, files, update_path)
+    finally:
+        with open(file, mode='wb') as f:
+            f.write(original)
+
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    return {'wall_s': wall, 'ops': 1}
+
+
+def case_update_dictionary(files: list[str], index_path: str, queries: int) -> dict:
+    return _update(files, index_path, True)
+
+
+def case_update_unchanged(files: list[str], index_path: str, queries: int) -> dict:
+    return _update(files, index_path, False)
+
+
+def case_load_index(files: list[str], index_path: str, queries: int) -> dict:
+    _load(files, index_path).close()
+    wall, _ = timed(_load, files, index_path)
+
+    return {'wall_s': wall, 'ops': 1}
+
+
+def _translate(files: list[str], index_path: str | None, queries: int) -> dict:
+    from minerva_cli.assignments import composition
+
+    dictionary = _load(files, index_path)
+
+    words: list[str] = _sample(list(dictionary['english']), queries)
+
+    def lookup_all() -> None:
+        for word in words:
+            composition.translate(word=word, language='english', dictionary=dictionary)
+
+    wall, _ = timed(lookup_all)
+
+    return {'wall_s': wall, 'ops': len(words)}
+
+
+def case_translate_dict(files: list[str], index_path: str, queries: int) -> dict:
+    return _translate(files, None, queries)
+
+
+def case_translate_index(files: list[str], index_path: str, queries: int) -> dict:
+    return _translate(files, index_path, queries)
+
+
+def case_translate_folded(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli.assignments import composition
+
+    dictionary = _load(files, index_path)
+    words: list[str] = [word.upper() for word in _sample(list(dictionary['latin']), queries)]
+
+    def lookup_all() -> None:
+        for word in words:
+            composition.translate(word=word, language='latin', dictionary=dictionary, accent_insensitive=True)
+
+    wall, _ = timed(lookup_all)
+
+    return {'wall_s': wall, 'ops': len(words)}
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    """
+    Replace one character of a word, keeping spaces.
+    """
+
+    positions: list[int] = [i for i, char in enumerate(word) if char != ' ']
+    position: int = rng.choice(positions)
+
+    return word[:position] + 'x' + word[position + 1:]
+
+
+def case_fuzzy_build(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import fuzzy_matcher
+
+    dictionary = _load(files, None)
+    wall, _ = timed(fuzzy_matcher.FuzzyMatcher, dictionary['english'])
+
+    return {'wall_s': wall, 'ops': len(dictionary['english'])}
+
+
+def case_fuzzy_lookup(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import fuzzy_matcher
+
+    dictionary = _load(files, None)
+    matcher = fuzzy_matcher.FuzzyMatcher(dictionary['english'])
+    rng: random.Random = random.Random(0)
+    words: list[str] = [_typo(word, rng) for word in _sample(list(dictionary['english']), queries // 10)]
+
+    def lookup_all() -> None:
+        for word in words:
+            matcher.lookup(word)
+
+    wall, _ = timed(lookup_all)
+
+    return {'wall_s': wall, 'ops': len(words)}
+
+
+def case_fuzzy_lookup_glosses(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import fuzzy_matcher
+
+    # As many English-looking keys as the lexicon has entries, half of them "to ..." verbs sharing their first letters
+    keys: list[str] = english_glosses(len(files))
+    matcher = fuzzy_matcher.FuzzyMatcher(keys)
+    rng: random.Random = random.Random(0)
+    words: list[str] = [_typo(rng.choice(keys), rng) for _ in range(queries // 10)]
+
+    def lookup_all() -> None:
+        for word in words:
+            matcher.lookup(word)
+
+    wall, _ = timed(lookup_all)
+
+    return {'wall_s': wall, 'ops': len(words)}
+
+
+def case_phrase_matcher_build(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import phrase_matcher
+
+    dictionary = _load(files, None)
+    wall, _ = timed(phrase_matcher.PhraseMatcher, dictionary['english'])
+
+    return {'wall_s': wall, 'ops': len(dictionary['english'])}
+
+
+def _sentences(dictionary: dict, count: int) -> list[str]:
+    """
+    Get the sentences for a case: the lines of the --corpus file if one was given, synthetic ones built from the
+    dictionary otherwise.
+    """
+
+    corpus: str | None = os.environ.get('MINERVA_BENCH_CORPUS')
+
+    if corpus:
+        with open(corpus, mode='r', encoding='utf-8') as file:
+            return [line.strip() for line in file if line.strip() != ''][:count]
+
+    lexicon: list[tuple[str, list[str]]] = [(latin_word, [english_word]) for english_word, latin_words in dictionary['english'].items() for latin_word in latin_words[:1]]
+
+    return synthetic_sentences(lexicon, count)
+
+
+def case_span_candidates(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import phrase_matcher
+
+    dictionary = _load(files, None)
+    matcher = phrase_matcher.PhraseMatcher(dictionary['english'])
+    sentences: list[list[str]] = [phrase_matcher.tokenize(sentence) for sentence in _sentences(dictionary, queries // 10)]
+
+    def match_all() -> None:
+        for tokens in sentences:
+            matcher.candidates(tokens)
+
+    wall, _ = timed(match_all)
+
+    return {'wall_s': wall, 'ops': len(sentences)}
+
+
+def case_candidate_generation(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import candidate_generator
+    from minerva_cli import synonym_manager
+
+    dictionary = _load(files, None)
+    english_words: list[str] = list(dictionary['english'])
+    rng: random.Random = random.Random(0)
+    table = synonym_manager.SynonymTable({english_word: tuple(rng.sample(english_words, 3)) for english_word in english_words[::10]})
+    generator = candidate_generator.CandidateGenerator(dictionary, synonyms=table.get)
+    sentences: list[str] = _sentences(dictionary, queries // 10)
+
+    wall, candidates = timed(generator.generate_all, sentences)
+
+    return {'wall_s': wall, 'ops': len(sentences), 'candidates': sum(len(latin_words) for latin_words in candidates)}
+
+
+def case_candidate_top_k(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import candidate_generator
+
+    dictionary = _load(files, index_path)
+    generator = candidate_generator.CandidateGenerator(dictionary)
+    sentences: list[str] = _sentences(dictionary, queries // 10)
+
+    wall, candidates = timed(generator.generate_all, sentences, 10)
+
+    return {'wall_s': wall, 'ops': len(sentences), 'candidates': sum(len(latin_words) for latin_words in candidates)}
+
+
+def case_convert_to_base(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import lemmatizer
+    from minerva_cli import phrase_matcher
+
+    dictionary = _load(files, None)
+    sentences: list[list[str]] = [phrase_matcher.tokenize(sentence) for sentence in _sentences(dictionary, queries // 10)]
+    shared = lemmatizer.Lemmatizer()
+
+    def lemmatize_all() -> None:
+        for tokens in sentences:
+            shared.lemmatize(tokens)
+
+    wall, _ = timed(lemmatize_all)
+
+    return {'wall_s': wall, 'ops': len(sentences), 'cache_hit_rate': shared.hits / max(shared.hits + shared.misses, 1)}
+
+
+def case_synonym_extractor(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli.assignments import composition
+
+    dictionary = _load(files, None)
+    words: list[str] = _sample(list(dictionary['english']), queries // 10)
+
+    def extract_all() -> None:
+        for word in words:
+            composition.synonym_extractor(word)
+
+    wall, _ = timed(extract_all)
+
+    return {'wall_s': wall, 'ops': len(words)}
+
+
+def case_translation_cache(files: list[str], index_path: str, queries: int) -> dict:
+    from minerva_cli import translation_cache
+
+    dictionary = _load(files, None)
+    sentences: list[str] = _sentences(dictionary, queries // 10)
+    cache_path: str = os.path.join(os.path.dirname(index_path), 'translations.sqlite')
+
+    # Every sentence is translated twice, so half of the lookups miss and half hit
+    with translation_cache.CachedTranslator(translation_cache.StubTranslator(), cache_path) as translator:
+        def translate_all() -> None:
+            for sentence in sentences * 2:
+                translator.translate(sentence, dest='la', src='en')
+
+        wall, _ = timed(translate_all)
+
+        return {'wall_s': wall, 'ops': len(sentences) * 2, 'cache_hit_rate': translator.hits / max(translator.hits + translator.misses, 1)}
+
+
+CASES: dict = {
+    'generate_dictionary': case_generate_dictionary,
+    'compile_dictionary': case_compile_dictionary,
+    'update_dictionary': case_update_dictionary,
+    'update_unchanged': case_update_unchanged,
+    'load_index': case_load_index,
+    'translate_dict': case_translate_dict,
+    'translate_index': case_translate_index,
+    'translate_folded': case_translate_folded,
+    'phrase_matcher_build': case_phrase_matcher_build,
+    'fuzzy_build': case_fuzzy_build,
+    'fuzzy_lookup': case_fuzzy_lookup,
+    'fuzzy_lookup_glosses': case_fuzzy_lookup_glosses,
+    'span_candidates': case_span_candidates,
+    'candidate_generation': case_candidate_generation,
+    'candidate_top_k': case_candidate_top_k,
+    'convert_to_base': case_convert_to_base,
+    'synonym_extractor': case_synonym_extractor,
+    'translation_cache': case_translation_cache,
+}
+
+
+def run_case(name: str, files: list[str], index_path: str, queries: int) -> dict:
+    """
+    Run one case in the current process.
+
+    :return: The case's measurements, or a 'skipped' reason if a dependency is missing.
+    """
+
+    try:
+        result: dict = CASES[name](files, index_path, queries)
+    except (ImportError, LookupError) as e:
+        return {'skipped': f'{type(e).__name__}: {e}'.splitlines()[0]}
+
+    result['ops_per_s'] = result['ops'] / result['wall_s'] if result['wall_s'] > 0 else None
+    result['peak_rss_mb'] = peak_rss_mb()
+
+    return result
+
+
+def git_commit() -> str | None:
+    """
+    Get the current commit, if the benchmarks are run from a git checkout.
+    """
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """
+    Print the wall time of each case relative to a saved baseline.
+    """
+
+    with open(baseline_path, mode='r', encoding='utf-8') as file:
+        baseline: dict = json.load(file)
+
+    previous: dict = {(result['case'], result['lexicon']): result for result in baseline['results']}
+
+    print(f'\nCompared with {baseline_path} ({baseline["meta"].get("commit")}):')
+
+    for result in results:
+        before: dict | None = previous.get((result['case'], result['lexicon']))
+
+        if before is None or 'wall_s' not in before or 'wall_s' not in result:
+            continue
+
+        print(f'  {result["case"]:<22} {result["lexicon"]:<16} {before["wall_s"]:10.4f} s -> {result["wall_s"]:10.4f} s ({before["wall_s"] / result["wall_s"]:.2f}x)')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the dictionary and candidate-generation hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[1000, 10000, 100000], help='synthetic lexicon sizes')
+    parser.add_argument('--fixture', help='a DATA_DIR/dictionary directory to benchmark as well')
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), default=list(CASES), help='cases to run')
+    parser.add_argument('--queries', type=int, default=100000, help='lookups per lookup case, a tenth of that for sentence and fuzzy cases')
+    parser.add_argument('--corpus', help='a text file with one English sentence per line to use instead of synthetic sentences')
+    parser.add_argument('--save', help='write the results to a baseline JSON file')
+    parser.add_argument('--compare', help='compare the results with a baseline JSON file')
+    args = parser.parse_args()
+
+    if args.corpus:
+        os.environ['MINERVA_BENCH_CORPUS'] = os.path.abspath(args.corpus)
+
+    results: list[dict] = []
+    context = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        lexicons: list[tuple[str, list[str]]] = []
+
+        for size in args.sizes:
+            files: list[str] = write_lexicon(synthetic_lexicon(size, max(size // 5, 10)), os.path.join(temp_dir, f'synthetic-{size}'))
+            lexicons.append((f'synthetic-{size}', files))
+
+        if args.fixture:
+            lexicons.append(('fixture', sorted(glob.glob(os.path.join(args.fixture, '*.json')))))
+
+        print(f'{"case":<22} {"lexicon":<16} {"wall [s]":>10} {"ops/s":>12} {"peak RSS [MB]":>14}')
+
+        for lexicon_name, files in lexicons:
+            index_path: str = os.path.join(temp_dir, f'{lexicon_name}.idx')
+
+            for name in args.cases:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result: dict = executor.submit(run_case, name, files, index_path, args.queries).result()
+
+                result = {'case': name, 'lexicon': lexicon_name, 'entries': len(files), **result}
+                results.append(result)
+
+                if 'skipped' in result:
+                    print(f'{name:<22} {lexicon_name:<16} skipped ({result["skipped"]})')
+                    continue
+
+                ops_per_s: str = f'{result["ops_per_s"]:12.0f}' if result['ops_per_s'] is not None else f'{"-":>12}'
+                print(f'{name:<22} {lexicon_name:<16} {result["wall_s"]:10.4f} {ops_per_s} {result["peak_rss_mb"]:14.1f}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.save:
+        meta: dict = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'queries': args.queries,
+        }
+
+        with open(args.save, mode='w', encoding='utf-8') as file:
+            json.dump({'meta': meta, 'results': results}, file, indent=4)
+
+        print(f'\nSaved results to {args.save}')
+
+
+if __name__ == '__main__':
+    main()
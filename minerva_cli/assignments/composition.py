@@ -1,17 +1,24 @@
 import os
 import time
 import json
-import nltk
 import random
 import hashlib
-import inflect
-import selenium
-import pyinflect
 import unicodedata
-from nltk.corpus import wordnet
-from googletrans import Translator
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import selenium
+    from googletrans import Translator
+
+    from .. import translation_cache
+
+from .. import lemmatizer
+from .. import candidate_generator
+from .. import phrase_matcher
+from .. import synonym_manager
+from .. import dictionary_manager
+from .. import fuzzy_matcher
+from .. import instrumentation
 
 def encode_file_name(file_name: str) -> str:
     """
@@ -43,11 +50,16 @@ def install_wordnet():
     This function downloads the WordNet data if it is not already present.
     """
 
-    try:
-        nltk.download('wordnet')
-        nltk.download('omw-1.4')
-    except Exception as e:
-        print(f"Error installing WordNet: {e}")
+    import nltk
+
+    for resource, package in (('corpora/wordnet', 'wordnet'), ('corpora/omw-1.4', 'omw-1.4')):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            try:
+                nltk.download(package)
+            except Exception as e:
+                print(f"Error installing WordNet: {e}")
 
 
 def strip_accents(text: str) -> str:
@@ -61,6 +73,7 @@ def strip_accents(text: str) -> str:
     return str(''.join(char for char in unicodedata.normalize('NFKD', text) if unicodedata.category(char) != 'Mn')).lower()
 
 
+@instrumentation.timed('wordnet synonyms')
 def synonym_extractor(phrase: str) -> list[str]:
     """
     Extract synonyms for a given phrase using NLTK WordNet.
@@ -69,6 +82,8 @@ def synonym_extractor(phrase: str) -> list[str]:
     :return: A list of synonyms as strings.
     """
 
+    from nltk.corpus import wordnet
+
     synonyms: list[str] = []
 
     for syn in wordnet.synsets(phrase):
@@ -83,47 +98,12 @@ def generate_dictionary(file_list: list[str]) -> dict:
     Get the Latin-English dictionary.
 
     This function retrieves and constructs a Latin-English dictionary from JSON files located in the specified directory.
+    See dictionary_manager.load_dictionary for the compiled, memory-mapped equivalent.
 
     :return: A dictionary containing Latin and English word mappings with morphology information.
     """
 
-    dictionary: dict = {}
-    latin_dictionary: dict = {}
-    english_dictionary: dict = {}
-
-    print(f'Generating dictionary... {len(file_list)} files found')
-    start_time = time.time()
-
-    for file in file_list:
-        with open(file, mode='r', encoding='utf-8') as f:
-            temp_data = json.load(f)
-        
-        latin_word: str | None = temp_data.get('word', None)
-
-        if latin_word is None:
-            continue
-
-        latin_word = latin_word.encode('utf-8').decode('unicode_escape')
-
-        english_words: list[str] | None = temp_data.get('definitions', None)
-        latin_dictionary[latin_word] = {"english" : english_words}
-
-        if english_words is None:
-            continue
-
-        for english_word in english_words:
-            english_word = english_word.lower()
-            english_dictionary.setdefault(english_word, [])
-
-            if latin_word not in english_dictionary[english_word]:
-                english_dictionary[english_word].append(latin_word)
-    
-    dictionary['english'] = english_dictionary
-    dictionary['latin'] = latin_dictionary
-
-    print(f'Dictionary generated in {time.time() - start_time} seconds')
-
-    return dictionary
+    return dictionary_manager.generate_dictionary(file_list)
 
 
 def convert_to_base(word: str) -> str:
@@ -131,35 +111,39 @@ def convert_to_base(word: str) -> str:
     Convert an English word to its base form.
 
     This function takes an English word, analyzes its part of speech (noun or verb), and converts it to its base form
-    using linguistic libraries.
+    using linguistic libraries. Base forms are cached by the shared lemmatizer.
 
     :param word: The English word to be converted.
     :return: The base form of the English word.
     """
-    p: inflect.engine = inflect.engine()
-    words: list[str] = word.split(' ')
-    base_words: list[str] = []
 
-    for word in words:
-        if word == '':
-            continue
+    return lemmatizer.get_lemmatizer().convert(word)
 
-        try:
-            word_type: str = nltk.pos_tag(nltk.word_tokenize(word))[0][1]
 
-            if word_type.startswith("N") and p.singular_noun(word) is not False:
-                word = p.singular_noun(word)
-            elif word_type.startswith("V") and pyinflect.getInflection(word, 'VB')[0] is not False:
-                word = pyinflect.getInflection(word, 'VB')[0]
+def merge_translations(dictionary: dict, language: str, keys: list[str]):
+    """
+    Merge the translations of several keys, such as the closest matches of a fuzzy lookup.
+
+    :param dictionary: The Latin-English dictionary.
+    :param language: The language of the keys ('latin' or 'english').
+    :param keys: The keys, best first.
+    :return: The translations as returned by translate, with the keys listed under "matches" for Latin, or None if
+        there are no keys.
+    """
+
+    if len(keys) == 0:
+        return None
+
+    if language.lower() == 'latin':
+        return {"english" : dictionary_manager.merge_entries(dictionary, keys), "matches" : tuple(keys)}
 
-            base_words.append(word)
-        except:
-            base_words.append(word)
+    language_dict: dict = dictionary[language.lower()]
 
-    return ' '.join(base_words)
+    return tuple(dict.fromkeys(latin_word for key in keys for latin_word in language_dict[key]))
 
 
-def translate(word: str, language: str, dictionary: dict | None, use_base: bool = False) -> list:
+@instrumentation.timed('lookup')
+def translate(word: str, language: str, dictionary: dict | None, use_base: bool = False, accent_insensitive: bool = False, inflected: bool = False, fuzzy: fuzzy_matcher.FuzzyMatcher | None = None, top_k: int = 1) -> list:
     """
     Translate a word between Latin and English.
 
@@ -170,6 +154,13 @@ def translate(word: str, language: str, dictionary: dict | None, use_base: bool
     :param language: The starting language ('latin' or 'english') for translation.
     :param dictionary: The Latin-English dictionary.
     :param use_base: Whether to use the base form of English words for translation.
+    :param accent_insensitive: Whether Latin words are matched ignoring macrons, case and i/j, u/v spelling, using the
+        dictionary's precomputed folded keys.
+    :param inflected: Whether Latin words that are not headwords are looked up as inflected forms, in which case the
+        result also lists the headwords they come from under "lemmas".
+    :param fuzzy: A fuzzy matcher over the keys of the starting language, used when the word has no exact match. The
+        translations of its closest keys are merged, and for Latin the keys are listed under "matches".
+    :param top_k: The number of closest keys to merge for fuzzy lookups.
     :return: A list of translations for the input word in the target language.
     """
 
@@ -186,11 +177,22 @@ def translate(word: str, language: str, dictionary: dict | None, use_base: bool
     
     if word == "":
         return None
+
+    if language.lower() == 'latin' and (accent_insensitive == True or inflected == True):
+        translations = dictionary_manager.lookup_folded(dictionary, word) if accent_insensitive == True else language_dict.get(word.lower())
+
+        if translations is None and inflected == True:
+            translations = dictionary_manager.lookup_inflected(dictionary, word)
+    else:
+        translations = language_dict.get(word.lower())
+
+    if translations is None and fuzzy is not None:
+        return merge_translations(dictionary, language, [key for key, _ in fuzzy.lookup(word, top_k=top_k)])
         
-    return language_dict.get(word.lower())
+    return translations
 
 
-def solve(driver: selenium.webdriver, compositions_fallback: bool, translator: Translator | None, dictionary: dict, compositions_synonyms_enabled: bool, cache_path: str | None, human_mode: bool) -> None:
+def solve(driver: 'selenium.webdriver', compositions_fallback: bool, translator: 'Translator | translation_cache.CachedTranslator | None', dictionary: dict, compositions_synonyms_enabled: bool, cache_path: str | None, human_mode: bool, matcher: phrase_matcher.PhraseMatcher | None = None, synonym_table: synonym_manager.SynonymTable | None = None, fuzzy: fuzzy_matcher.FuzzyMatcher | None = None, candidate_limit: int | None = None) -> None:
     """
     Solve Latin-English composition assignments.
 
@@ -198,9 +200,25 @@ def solve(driver: selenium.webdriver, compositions_fallback: bool, translator: T
     entering the Latin translations into text input fields on a web page. It also handles translation fallback using
     Google Translate if enabled.
 
+    Candidates for each prompt come from candidate_generator.CandidateGenerator. Pass a phrase matcher built once for the
+    dictionary to avoid rebuilding it on every call. Synonyms come from the precomputed synonym table when one is given,
+    and from WordNet otherwise. Pass a fuzzy matcher over the English keys to also try the phrases closest to
+    misspelled spans. Candidates are tried best first, and only the best candidate_limit of them if it is given.
+    The translator can be any object with the googletrans translate method, such as a
+    translation_cache.CachedTranslator, so that prompts translated before are answered without the network.
+
     :return: None
     """
 
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+
+    synonyms = None
+    if compositions_synonyms_enabled == True:
+        synonyms = synonym_table.get if synonym_table is not None else synonym_extractor
+
+    generator = candidate_generator.CandidateGenerator(dictionary, matcher, lemmatizer.get_lemmatizer().lemmatize, synonyms, fuzzy)
+
     parentElement = driver.find_element(By.CLASS_NAME, 'ui-block-a')
     english_text_parents = parentElement.find_elements(By.XPATH, "// p[@style='white-space:pre-wrap;margin-right:2em;font-size:1em']")
     latin_inputs = parentElement.find_elements(By.XPATH, "// div[@class='latin composition ui-input-text ui-shadow-inset ui-body-inherit ui-corner-all ui-textinput-autogrow']")
@@ -226,53 +244,10 @@ def solve(driver: selenium.webdriver, compositions_fallback: bool, translator: T
 
             trans_words = trans_words.split(' ')
             
-        english_text: list[str] = english_text.split(' ')
+        inputs: list[str] = generator.generate(english_text, candidate_limit)
 
-        processed_words: list[str] = []
-
-        inputs: list[str] = []
-        for i in range(len(english_text)):
-            for j in range(i+1, len(english_text)+1):
-                combined_word = ''.join(english_text[i:j])
-                synonyms = None
-
-                if compositions_synonyms_enabled == True:
-                    synonyms = synonym_extractor(combined_word)
-
-                if combined_word in processed_words:
-                    continue
-                    
-                processed_words.append(combined_word)
-
-                output = []
-
-                if synonyms is not None or synonyms != [] and compositions_synonyms_enabled == True:
-                    for synonym in synonyms:
-                        processed_words.append(synonym)
-
-                        synonym_translation = translate(word=synonym, language='english', dictionary=dictionary, use_base=False)
-                        base_synonym_translation = translate(word=synonym, language='english', dictionary=dictionary, use_base=False)
-
-                        if synonym_translation is not None and synonym_translation not in output:
-                            output.extend(synonym_translation)
-
-                        if base_synonym_translation is not None and base_synonym_translation not in output:
-                            output.extend(base_synonym_translation)
-
-                translation_output = translate(word=combined_word, language='english', dictionary=dictionary, use_base=False)
-                base_translation_output = translate(word=combined_word, language='english', dictionary=dictionary, use_base=True)
-
-                if translation_output is not None and translation_output not in output:
-                    output.extend(translation_output)
-                
-                if base_translation_output is not None and base_translation_output not in output:
-                    output.extend(base_translation_output)
-
-                if output is not None:
-                    inputs.append(output)
-        
         if compositions_fallback == True and translator is not None:
-            inputs.append(trans_words)
+            inputs = list(dict.fromkeys([*inputs, *trans_words]))
         
         all_inputs.append(inputs)
     all_answers = []
@@ -328,81 +303,69 @@ def solve(driver: selenium.webdriver, compositions_fallback: bool, translator: T
     
     save_file(cache_file, data)
 
-    total_inputs: int = 0
+    total_inputs: int = sum(len(inputs) for inputs in all_inputs)
 
-    for a in range(0, len(all_inputs)):
-        for b in range(0, len(all_inputs[a])):
-            same_inputs: list[str] = []
-
-            for c in range(0, len(all_inputs[a][b])):
-                if all_inputs[a][b][c] in same_inputs:
-                    continue
-                
-                same_inputs.append(all_inputs[a][b][c])
-                total_inputs += 1
-    
     print(f'Total inputs: {total_inputs}')
 
     input_number: int = 0
 
     for a in range(0, len(all_inputs)):
-        for b in range(0, len(all_inputs[a])):
-            same_inputs: list[str] = []
+        same_inputs: set[str] = set()
 
-            for c in range(0, len(all_inputs[a][b])):
-                input_number += 1
-                latin_word = strip_accents(all_inputs[a][b][c])
+        for b in range(0, len(all_inputs[a])):
+            input_number += 1
+            latin_word = dictionary_manager.plain_spelling(dictionary, all_inputs[a][b])
 
-                if latin_word in same_inputs:
-                    continue
+            if latin_word in same_inputs:
+                continue
 
-                driver.execute_script("arguments[0].scrollIntoView();", latin_inputs[a])
+            driver.execute_script("arguments[0].scrollIntoView();", latin_inputs[a])
 
-                if latin_word in data[english_texts[a]]['incorrect']:
-                    continue
+            if latin_word in data[english_texts[a]]['incorrect']:
+                continue
+            
+            elif latin_word in data[english_texts[a]]['correct']:
+                if latin_word not in all_answers[a]:
+                    all_answers[a].append(latin_word)
                 
-                elif latin_word in data[english_texts[a]]['correct']:
-                    if latin_word not in all_answers[a]:
-                        all_answers[a].append(latin_word)
-                    
-                    continue
-
-                latin_inputs[a].clear()
-                latin_inputs[a].send_keys(latin_word)
-                latin_inputs[a].send_keys(Keys.ENTER + ' a')
+                continue
 
-                while len(str(latin_inputs[a].text).split('\n')) != 1:
-                    time.sleep(.05)
+            latin_inputs[a].clear()
+            latin_inputs[a].send_keys(latin_word)
+            latin_inputs[a].send_keys(Keys.ENTER + ' a')
 
+            while len(str(latin_inputs[a].text).split('\n')) != 1:
                 time.sleep(.05)
 
-                default_color: str = 'green'
-                if 'color:red' in str(latin_inputs[a].get_attribute('style')).replace(' ', ''):
-                    default_color = 'red'
+            time.sleep(.05)
 
-                span_texts = latin_inputs[a].find_elements(By.TAG_NAME, 'span')
+            default_color: str = 'green'
+            if 'color:red' in str(latin_inputs[a].get_attribute('style')).replace(' ', ''):
+                default_color = 'red'
 
-                if default_color == 'red' and len(span_texts) != 0 and latin_word not in all_answers[a]:
-                    all_answers[a].append(latin_word)
+            span_texts = latin_inputs[a].find_elements(By.TAG_NAME, 'span')
 
-                elif default_color == 'green' and len(span_texts) == 0 and latin_word not in all_answers[a]:
-                    all_answers[a].append(latin_word)
-                
-                else:
-                    temp_list = data[english_texts[a]]['incorrect']
-                    temp_list.append(latin_word)
-                    data[english_texts[a]]['incorrect'] = temp_list
+            if default_color == 'red' and len(span_texts) != 0 and latin_word not in all_answers[a]:
+                all_answers[a].append(latin_word)
 
-                same_inputs.append(latin_word)
-                
-                if input_number % 100 == 0:
-                    data[english_texts[a]]['correct'] = all_answers[a]
-                    save_file(cache_file, data)
+            elif default_color == 'green' and len(span_texts) == 0 and latin_word not in all_answers[a]:
+                all_answers[a].append(latin_word)
+            
+            else:
+                temp_list = data[english_texts[a]]['incorrect']
+                temp_list.append(latin_word)
+                data[english_texts[a]]['incorrect'] = temp_list
 
-                    print(f'Completed {input_number} inputs out of {total_inputs}')
-                
-                if human_mode:
-                    time.sleep(random.randint(200, 500)/100)
+            same_inputs.add(latin_word)
+            
+            if input_number % 100 == 0:
+                data[english_texts[a]]['correct'] = all_answers[a]
+                save_file(cache_file, data)
+
+                print(f'Completed {input_number} inputs out of {total_inputs}')
+            
+            if human_mode:
+                time.sleep(random.randint(200, 500)/100)
 
         data[english_texts[a]]['correct'] = all_answers[a]
         save_file(cache_file, data)
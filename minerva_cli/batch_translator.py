@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from . import candidate_generator
+from . import dictionary_manager
+from . import phrase_matcher
+
+
+# The state shared by the batch workers, set up once by _set_up before they are forked, or by _init_worker in each of
+# them where processes cannot be forked
+_worker: dict = {}
+
+
+def _set_up(dictionary: dictionary_manager.CompiledDictionary, synonym_table_path: str | None, base: bool, fuzzy_distance: int, top_k: int | None) -> None:
+    """
+    Build the phrase matcher, fuzzy matcher, synonym table and candidate generator used to translate sentences.
+
+    :param dictionary: The compiled dictionary.
+    :param synonym_table_path: The path of the synonym table, synonyms are not used if None.
+    :param base: Whether to also look up the base forms of the words.
+    :param fuzzy_distance: The largest edit distance for close matches, 0 to not use them.
+    :param top_k: The maximum number of candidates per sentence, every candidate if None.
+    :return: None
+    """
+
+    lemmatize = None
+    synonyms = None
+    fuzzy = None
+
+    if base:
+        from . import lemmatizer
+
+        lemmatize = lemmatizer.get_lemmatizer().lemmatize
+
+    if synonym_table_path is not None:
+        from . import synonym_manager
+
+        synonyms = synonym_manager.load_synonym_table(dictionary['english'], synonym_table_path).get
+
+    if fuzzy_distance > 0:
+        from . import fuzzy_matcher
+
+        fuzzy = fuzzy_matcher.FuzzyMatcher(dictionary['english'], fuzzy_distance)
+
+    matcher = phrase_matcher.PhraseMatcher(dictionary['english'])
+
+    _worker['dictionary'] = dictionary
+    _worker['matcher'] = matcher
+    _worker['generator'] = candidate_generator.CandidateGenerator(dictionary, matcher, lemmatize, synonyms, fuzzy)
+    _worker['top_k'] = top_k
+
+
+def _init_worker(index_path: str, synonym_table_path: str | None, base: bool, fuzzy_distance: int, top_k: int | None) -> None:
+    """
+    Set up a batch worker on platforms that cannot fork, by mapping the compiled index and building everything again.
+
+    :param index_path: The path of the compiled dictionary index.
+    :param synonym_table_path: The path of the synonym table, synonyms are not used if None.
+    :param base: Whether to also look up the base forms of the words.
+    :param fuzzy_distance: The largest edit distance for close matches, 0 to not use them.
+    :param top_k: The maximum number of candidates per sentence, every candidate if None.
+    :return: None
+    """
+
+    _set_up(dictionary_manager.CompiledDictionary(index_path), synonym_table_path, base, fuzzy_distance, top_k)
+
+
+def _translate_chunk(chunk: list[tuple[int, str]]) -> list[str]:
+    """
+    Translate a chunk of sentences in a worker.
+
+    :param chunk: The (line number, sentence) pairs to translate.
+    :return: One JSON line per sentence, in order.
+    """
+
+    matcher: phrase_matcher.PhraseMatcher = _worker['matcher']
+    generator: candidate_generator.CandidateGenerator = _worker['generator']
+    results: list[str] = []
+
+    for line_number, sentence in chunk:
+        tokens: list[str] = phrase_matcher.tokenize(sentence)
+        result: dict = {'line': line_number, 'sentence': sentence}
+
+        result['candidates'] = generator.generate(sentence, _worker['top_k'])
+        result['spans'] = [
+            {'start': start, 'end': end, 'phrase': ' '.join(tokens[start:end]), 'translations': list(latin_words)}
+            for (start, end), latin_words in matcher.candidates(tokens).items()
+        ]
+
+        # The lemmatizer cache already holds these from candidate generation
+        if generator.lemmatize is not None and len(tokens) != 0:
+            result['base'] = ' '.join(generator.lemmatize(tokens))
+
+        results.append(json.dumps(result, ensure_ascii=False) + '\n')
+
+    return results
+
+
+def read_sentences(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    """
+    Read the sentences of a text, one per non-empty line.
+
+    :param lines: The lines of the text.
+    :return: An iterator of (line number, sentence) pairs, numbered from 1.
+    """
+
+    for line_number, line in enumerate(lines, start=1):
+        sentence: str = line.strip()
+
+        if sentence != '':
+            yield line_number, sentence
+
+
+def _chunks(sentences: Iterable[tuple[int, str]], chunk_size: int) -> Iterator[list[tuple[int, str]]]:
+    """
+    Group sentences into chunks.
+
+    :param sentences: The (line number, sentence) pairs.
+    :param chunk_size: The number of sentences per chunk.
+    :return: An iterator of chunks, in order.
+    """
+
+    chunk: list[tuple[int, str]] = []
+
+    for sentence in sentences:
+        chunk.append(sentence)
+
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+
+    if len(chunk) != 0:
+        yield chunk
+
+
+def translate_batch(sentences: Iterable[tuple[int, str]], output: TextIO, index_path: str, workers: int = 1, chunk_size: int = 256, synonym_table_path: str | None = None, base: bool = False, fuzzy_distance: int = 0, top_k: int | None = None) -> int:
+    """
+    Translate a stream of English sentences to JSON lines.
+
+    Sentences are read lazily and sent to a process pool in chunks. Only a few chunks per worker are in flight at once,
+    so memory stays flat however large the input is, and results are written as soon as every chunk before them is
+    done, in input order. Each line holds the sentence, its ranked Latin candidates and the dictionary phrases found
+    in it.
+
+    The matchers and synonym table are built once, before the workers are forked, so the workers share them with the
+    memory-mapped index instead of building their own. Where processes cannot be forked, each worker builds them.
+
+    :param sentences: The (line number, sentence) pairs, such as from read_sentences.
+    :param output: The text stream to write JSON lines to.
+    :param index_path: The path of the compiled dictionary index, which must be up to date.
+    :param workers: The number of worker processes, 0 for one per CPU.
+    :param chunk_size: The number of sentences sent to a worker at a time.
+    :param synonym_table_path: The path of the synonym table, synonyms are not used if None.
+    :param base: Whether to also look up the base forms of the words.
+    :param fuzzy_distance: The largest edit distance for close matches, 0 to not use them.
+    :param top_k: The maximum number of candidates per sentence, every candidate if None.
+    :return: The number of sentences translated.
+    """
+
+    workers = (os.cpu_count() or 1) if workers == 0 else max(workers, 1)
+    fork: bool = 'fork' in multiprocessing.get_all_start_methods()
+    count: int = 0
+
+    print(f'Translating sentences with {workers} worker(s)...')
+    start_time = time.time()
+
+    with dictionary_manager.CompiledDictionary(index_path) as dictionary:
+        if workers == 1 or fork:
+            _set_up(dictionary, synonym_table_path, base, fuzzy_distance, top_k)
+
+        try:
+            if workers == 1:
+                for chunk in _chunks(sentences, chunk_size):
+                    output.writelines(_translate_chunk(chunk))
+                    count += len(chunk)
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+
+                if fork:
+                    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+                else:
+                    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index_path, synonym_table_path, base, fuzzy_distance, top_k))
+
+                with executor:
+                    pending: deque = deque()
+
+                    for chunk in _chunks(sentences, chunk_size):
+                        pending.append(executor.submit(_translate_chunk, chunk))
+                        count += len(chunk)
+
+                        if len(pending) >= workers * 2:
+                            output.writelines(pending.popleft().result())
+
+                    while len(pending) != 0:
+                        output.writelines(pending.popleft().result())
+        finally:
+            # The matchers hold views of the index, which is closed next
+            _worker.clear()
+
+    print(f'Translated {count} sentences in {time.time() - start_time} seconds')
+
+    return count
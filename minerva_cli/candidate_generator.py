@@ -0,0 +1,219 @@
+import heapq
+from collections.abc import Callable, Iterable, Mapping
+
+from . import phrase_matcher
+from . import fuzzy_matcher
+from . import dictionary_manager
+from . import instrumentation
+
+
+# How a span's candidates were found, from the most to the least reliable
+MATCH_EXACT: int = 3
+MATCH_LEMMA: int = 2
+MATCH_SYNONYM: int = 1
+MATCH_FUZZY: int = 0
+
+
+class CandidateGenerator:
+    """
+    Generate the Latin words to try for English sentences.
+
+    For every span of a sentence, the candidates are the Latin translations of the span itself, of its base form, of
+    its synonyms and, for spans with no exact match, of the closest dictionary phrases. Candidates are ranked by how
+    they were found, then by the length of the span, then by how often the Latin word translates an English gloss across the lexicon. This has no
+    dependency on the browser, so it can be profiled and reused on its own; lemmatization and synonym lookup are passed
+    in as callables so that any of them can be swapped out or left off.
+    """
+
+    def __init__(self, dictionary: Mapping, matcher: phrase_matcher.PhraseMatcher | None = None, lemmatize: Callable[[list[str]], list[str]] | None = None, synonyms: Callable[[str], Iterable[str]] | None = None, fuzzy: fuzzy_matcher.FuzzyMatcher | None = None, fuzzy_top_k: int = 3) -> None:
+        """
+        Create a candidate generator.
+
+        :param dictionary: The Latin-English dictionary.
+        :param matcher: A phrase matcher over the dictionary, built if not given.
+        :param lemmatize: A function converting the words of a sentence to their base forms, such as
+            Lemmatizer.lemmatize. Base forms are not used if None.
+        :param synonyms: A function returning the synonyms of a phrase, such as SynonymTable.get. Synonyms are not used
+            if None.
+        :param fuzzy: A fuzzy matcher over the dictionary's English keys. Close matches are not used if None.
+        :param fuzzy_top_k: The number of closest phrases to translate for each span with no exact match.
+        """
+
+        self.dictionary: Mapping = dictionary
+        self.matcher: phrase_matcher.PhraseMatcher = matcher or phrase_matcher.PhraseMatcher(dictionary['english'])
+        self.lemmatize: Callable[[list[str]], list[str]] | None = lemmatize
+        self.synonyms: Callable[[str], Iterable[str]] | None = synonyms
+        self.fuzzy: fuzzy_matcher.FuzzyMatcher | None = fuzzy
+        self.fuzzy_top_k: int = fuzzy_top_k
+
+    @instrumentation.timed('synonym expansion')
+    def _synonym_matches(self, tokens: list[str], lemmas: list[str] | None = None) -> dict[tuple[int, int], dict[str, None]]:
+        """
+        Translate the synonyms of every span of a sentence, up to the longest dictionary phrase.
+
+        Synonyms are listed for base forms, so a span with none, such as 'ran' or 'houses', falls back to the synonyms
+        of its base form.
+
+        :param tokens: The tokens of the sentence.
+        :param lemmas: The base forms of the tokens, no fallback if None.
+        :return: A dictionary of (start, end) spans to their Latin candidates.
+        """
+
+        english_dictionary: Mapping = self.dictionary['english']
+        processed_phrases: set[str] = set()
+        matches: dict[tuple[int, int], dict[str, None]] = {}
+
+        for i in range(len(tokens)):
+            for j in range(i + 1, min(len(tokens), i + self.matcher.max_length) + 1):
+                phrase: str = ' '.join(tokens[i:j])
+
+                if phrase in processed_phrases:
+                    continue
+
+                processed_phrases.add(phrase)
+                synonyms: Iterable[str] = self.synonyms(phrase)
+
+                if not synonyms and lemmas is not None:
+                    base_phrase: str = ' '.join(lemmas[i:j])
+
+                    if base_phrase != phrase:
+                        synonyms = self.synonyms(base_phrase)
+
+                for synonym in synonyms:
+                    latin_words = english_dictionary.get(synonym.replace('_', ' ').lower())
+
+                    if latin_words:
+                        matches.setdefault((i, j), {}).update(dict.fromkeys(latin_words))
+
+        return matches
+
+    def _fuzzy_matches(self, tokens: list[str]) -> dict[tuple[int, int], dict[str, None]]:
+        """
+        Translate the dictionary phrases closest to every span of a sentence that has no exact match, up to the longest
+        dictionary phrase.
+
+        The edit distance allowed grows with the span, one edit per four characters up to the matcher's maximum, so
+        that short words, where a single edit turns one word into another, are only matched exactly.
+
+        :param tokens: The tokens of the sentence.
+        :return: A dictionary of (start, end) spans to their Latin candidates.
+        """
+
+        english_dictionary: Mapping = self.dictionary['english']
+        matches: dict[tuple[int, int], dict[str, None]] = {}
+
+        for i in range(len(tokens)):
+            for j in range(i + 1, min(len(tokens), i + self.matcher.max_length) + 1):
+                phrase: str = ' '.join(tokens[i:j])
+                max_distance: int = len(phrase) // 4
+
+                if max_distance == 0 or phrase in english_dictionary:
+                    continue
+
+                for key, _ in self.fuzzy.lookup(phrase, max_distance, self.fuzzy_top_k):
+                    matches.setdefault((i, j), {}).update(dict.fromkeys(english_dictionary[key]))
+
+        return matches
+
+    def _sources(self, tokens: list[str]) -> list[tuple[int, dict]]:
+        """
+        Find the candidates of every span of a sentence, by match type.
+
+        :param tokens: The tokens of the sentence.
+        :return: A list of (match type, dictionary of (start, end) spans to their Latin candidates), most reliable
+            first.
+        """
+
+        sources: list[tuple[int, dict]] = [(MATCH_EXACT, self.matcher.candidates(tokens))]
+        lemmas: list[str] | None = None
+
+        if self.lemmatize is not None and len(tokens) != 0:
+            lemmas = self.lemmatize(tokens)
+            sources.append((MATCH_LEMMA, self.matcher.candidates(lemmas)))
+
+        if self.synonyms is not None:
+            sources.append((MATCH_SYNONYM, self._synonym_matches(tokens, lemmas)))
+
+        if self.fuzzy is not None:
+            sources.append((MATCH_FUZZY, self._fuzzy_matches(tokens)))
+
+        return sources
+
+    def span_candidates(self, sentence: str) -> dict[tuple[int, int], tuple[str, ...]]:
+        """
+        Get the Latin candidates for every span of a sentence.
+
+        :param sentence: The English sentence.
+        :return: A dictionary of (start, end) token spans to their candidates, direct translations first, then base
+            form, synonym and close match translations, without duplicates.
+        """
+
+        spans: dict[tuple[int, int], dict[str, None]] = {}
+
+        for _, source in self._sources(phrase_matcher.tokenize(sentence)):
+            for span, latin_words in source.items():
+                spans.setdefault(span, {}).update(dict.fromkeys(latin_words))
+
+        return {span: tuple(spans[span]) for span in sorted(spans)}
+
+    @instrumentation.timed('candidate scoring')
+    def score(self, sentence: str) -> dict[str, tuple[int, int, int]]:
+        """
+        Score the Latin candidates for a sentence.
+
+        A candidate found several ways keeps its best score. Gloss frequencies come from
+        dictionary_manager.gloss_frequency, which reads the frequencies computed when the dictionary was built.
+
+        :param sentence: The English sentence.
+        :return: A dictionary of candidate to its (match type, span length in tokens, gloss frequency) score, higher is
+            better, in the order the candidates were first found.
+        """
+
+        scores: dict[str, tuple[int, int, int]] = {}
+        frequencies: dict[str, int] = {}
+
+        for match_type, source in self._sources(phrase_matcher.tokenize(sentence)):
+            for (start, end), latin_words in sorted(source.items()):
+                for latin_word in latin_words:
+                    frequency: int | None = frequencies.get(latin_word)
+
+                    if frequency is None:
+                        frequency = frequencies[latin_word] = dictionary_manager.gloss_frequency(self.dictionary, latin_word)
+
+                    score: tuple[int, int, int] = (match_type, end - start, frequency)
+
+                    if score > scores.get(latin_word, (-1, 0, 0)):
+                        scores[latin_word] = score
+
+        return scores
+
+    def generate(self, sentence: str, top_k: int | None = None) -> list[str]:
+        """
+        Get the Latin candidates for a sentence, best first.
+
+        :param sentence: The English sentence.
+        :param top_k: The maximum number of candidates to return, taken from a heap without sorting the rest. Every
+            candidate is returned if None.
+        :return: The candidates of all its spans, ranked by score, ties in the order they were found, without
+            duplicates.
+        """
+
+        scores: dict[str, tuple[int, int, int]] = self.score(sentence)
+        instrumentation.count('sentences')
+        instrumentation.count('candidates', len(scores))
+
+        if top_k is None:
+            return sorted(scores, key=scores.__getitem__, reverse=True)
+
+        return heapq.nlargest(top_k, scores, key=scores.__getitem__)
+
+    def generate_all(self, sentences: Iterable[str], top_k: int | None = None) -> list[list[str]]:
+        """
+        Get the Latin candidates for each of several sentences.
+
+        :param sentences: The English sentences.
+        :param top_k: The maximum number of candidates per sentence, every candidate if None.
+        :return: One ranked candidate list per sentence, in order.
+        """
+
+        return [self.generate(sentence, top_k) for sentence in sentences]
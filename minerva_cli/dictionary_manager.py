@@ -0,0 +1,1670 @@
+import os
+import sys
+import json
+import mmap
+import time
+import array
+import struct
+import sqlite3
+import zlib
+import hashlib
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Callable, Mapping, Iterator, Iterable
+
+from . import inflection
+from . import instrumentation
+
+
+INDEX_MAGIC: bytes = b'MNRVIDX1'
+INDEX_VERSION: int = 7
+INDEX_SECTIONS: tuple[str, ...] = ('english', 'latin', 'folded', 'forms')
+
+# Gloss frequencies are counted in thousandths of a gloss so that they can be stored as unsigned ints
+FREQUENCY_SCALE: int = 1000
+
+_NONE: int = 0xFFFFFFFF
+_HEADER: struct.Struct = struct.Struct('<8sII32sIQQQQ32s')
+_SECTION: struct.Struct = struct.Struct('<IIIIQQQQ')
+_FINGERPRINT_OFFSET: int = 16
+_POSITION_STEP: int = 1 << 20
+_SET_SECTIONS: tuple[str, ...] = ('english', 'folded', 'forms')
+_FOLD_TABLE: dict[int, str] = str.maketrans('jv', 'iu')
+
+
+def parse_entry(data: dict) -> tuple[str | None, list[str] | None]:
+    """
+    Extract the Latin headword and English definitions from a parsed dictionary file.
+
+    :param data: The JSON contents of a dictionary file.
+    :return: A tuple of the Latin word (None if missing) and its English definitions.
+    """
+
+    latin_word: str | None = data.get('word', None)
+
+    if latin_word is not None:
+        latin_word = latin_word.encode('utf-8').decode('unicode_escape')
+
+    return (latin_word, data.get('definitions', None))
+
+
+def plain(text: str) -> str:
+    """
+    Spell a Latin word without diacritics such as macrons, in lowercase, the way answers are typed in.
+
+    :param text: The word.
+    :return: The plain spelling, 'iūlius' for 'Iūlius'.
+    """
+
+    decomposed: str = unicodedata.normalize('NFKD', text)
+
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def fold(text: str) -> str:
+    """
+    Fold a Latin word to the form used for accent-insensitive lookup.
+
+    Diacritics such as macrons are removed, the word is lowercased and the consonantal j and v are spelled i and u, so
+    that 'Iūlius', 'Julius' and 'iulius' all fold to 'iulius'.
+
+    :param text: The word to fold.
+    :return: The folded word.
+    """
+
+    return plain(text).translate(_FOLD_TABLE)
+
+
+def new_dictionary() -> dict:
+    """
+    Create an empty dictionary in its build form.
+
+    :return: A dictionary with empty 'english', 'latin', 'folded' and 'forms' maps.
+    """
+
+    return {section: {} for section in INDEX_SECTIONS}
+
+
+def add_entry(dictionary: dict, latin_word: str, english_words: list[str] | None, forms: Iterable[str] = ()) -> None:
+    """
+    Add a Latin word and its definitions to a dictionary being built.
+
+    While building, each reverse english entry is an insertion-ordered set (a dict with None values) so adding a Latin
+    word is a constant-time operation however common the gloss. See freeze_dictionary.
+
+    The word is also added under its folded spelling to the 'folded' map, which lists the Latin headwords sharing it,
+    and each of its inflected forms is added, folded, to the 'forms' map, which lists the headwords it can come from.
+
+    :param dictionary: The dictionary with 'english', 'latin', 'folded' and 'forms' maps.
+    :param latin_word: The Latin word.
+    :param english_words: The English definitions of the Latin word.
+    :param forms: The inflected forms of the Latin word, see inflection.expand.
+    :return: None
+    """
+
+    dictionary['latin'][latin_word] = {"english" : english_words}
+    dictionary['folded'].setdefault(fold(latin_word), {})[latin_word] = None
+
+    forms_dictionary: dict = dictionary['forms']
+
+    for form in forms:
+        forms_dictionary.setdefault(fold(form), {})[latin_word] = None
+
+    if english_words is None:
+        return
+
+    english_dictionary: dict = dictionary['english']
+
+    for english_word in english_words:
+        english_dictionary.setdefault(english_word.lower(), {})[latin_word] = None
+
+
+def merge_dictionaries(dictionary: dict, partial: dict) -> None:
+    """
+    Merge a partial dictionary built from a later shard of the source files into a dictionary.
+
+    Latin entries from the partial dictionary replace earlier ones and its reverse english lists are appended without
+    duplicates, so merging shards in order gives the same result as reading every file in one pass.
+
+    :param dictionary: The dictionary with 'english', 'latin', 'folded' and 'forms' maps, updated in place.
+    :param partial: The dictionary built from the next shard.
+    :return: None
+    """
+
+    dictionary['latin'].update(partial['latin'])
+
+    for section in _SET_SECTIONS:
+        section_dictionary: dict = dictionary[section]
+
+        for key, latin_words in partial[section].items():
+            section_dictionary.setdefault(key, {}).update(latin_words)
+
+
+def freeze_dictionary(dictionary: dict) -> dict:
+    """
+    Freeze a dictionary being built into its lookup form.
+
+    The reverse english, folded and forms sets become tuples, which are smaller and keep the order the Latin words were first
+    seen in. Latin definitions are stored as tuples too, matching what a compiled index returns, and the gloss frequency of
+    every Latin word is added under 'frequency', see gloss_frequencies.
+
+    :param dictionary: The dictionary with 'english', 'latin', 'folded' and 'forms' maps.
+    :return: The same dictionary, with frozen entries.
+    """
+
+    for section in _SET_SECTIONS:
+        section_dictionary: dict = dictionary[section]
+
+        for key, latin_words in section_dictionary.items():
+            section_dictionary[key] = tuple(latin_words)
+
+    for entry in dictionary['latin'].values():
+        if entry['english'] is not None:
+            entry['english'] = tuple(entry['english'])
+
+    dictionary['frequency'] = gloss_frequencies(dictionary)
+
+    return dictionary
+
+
+def gloss_frequencies(dictionary: Mapping) -> dict[str, int]:
+    """
+    Measure how often each Latin word is used to translate an English gloss across the lexicon.
+
+    Every English gloss counts once, shared evenly among the Latin words it translates to. A word that is the only
+    translation of its glosses scores a full gloss for each of them, while a vague word whose senses are also glossed by
+    many other words only gets a small share of each, however many senses it has.
+
+    :param dictionary: The dictionary with an 'english' map, built, frozen or compiled.
+    :return: A dictionary of Latin word to its frequency, in thousandths of a gloss.
+    """
+
+    frequencies: dict[str, int] = {}
+
+    for latin_words in dictionary['english'].values():
+        share: int = FREQUENCY_SCALE // len(latin_words)
+
+        for latin_word in latin_words:
+            frequencies[latin_word] = frequencies.get(latin_word, 0) + share
+
+    return frequencies
+
+
+def _resolve_workers(workers: int) -> int:
+    """
+    Resolve a worker count, where 0 means one worker per CPU.
+
+    :param workers: The requested number of worker processes.
+    :return: The number of worker processes to use.
+    """
+
+    if workers == 0:
+        return os.cpu_count() or 1
+
+    return max(workers, 1)
+
+
+def _shard(file_list: list[str], workers: int) -> list[list[str]]:
+    """
+    Split the source files into contiguous shards, a few per worker so that uneven shards balance out.
+
+    :param file_list: The dictionary JSON files.
+    :param workers: The number of worker processes.
+    :return: The shards in file order.
+    """
+
+    shard_size: int = max(-(-len(file_list) // (workers * 4)), 1)
+
+    return [file_list[i:i + shard_size] for i in range(0, len(file_list), shard_size)]
+
+
+def _generate_partial(file_list: list[str]) -> dict:
+    """
+    Build the dictionary for one shard of the source files.
+
+    :param file_list: The dictionary JSON files to read.
+    :return: A dictionary with 'english', 'latin', 'folded' and 'forms' maps.
+    """
+
+    dictionary: dict = new_dictionary()
+
+    for file in file_list:
+        with open(file, mode='r', encoding='utf-8') as f:
+            temp_data = json.load(f)
+
+        latin_word, english_words = parse_entry(temp_data)
+
+        if latin_word is None:
+            continue
+
+        add_entry(dictionary, latin_word, english_words, inflection.expand(latin_word, inflection.read_morphology(temp_data)))
+
+    return dictionary
+
+
+@instrumentation.timed('dictionary generate')
+def generate_dictionary(file_list: list[str], workers: int = 1) -> dict:
+    """
+    Get the Latin-English dictionary.
+
+    This function retrieves and constructs a Latin-English dictionary from JSON files located in the specified directory.
+    With more than one worker the file list is sharded across a process pool and the partial dictionaries are merged in
+    order.
+
+    :param file_list: The dictionary JSON files to read.
+    :param workers: The number of worker processes, 0 for one per CPU.
+    :return: A dictionary containing Latin and English word mappings with morphology information.
+    """
+
+    workers = _resolve_workers(workers)
+
+    print(f'Generating dictionary... {len(file_list)} files found')
+    start_time = time.time()
+
+    if workers > 1 and len(file_list) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        dictionary: dict = new_dictionary()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_generate_partial, _shard(file_list, workers)):
+                merge_dictionaries(dictionary, partial)
+    else:
+        dictionary = _generate_partial(file_list)
+
+    dictionary = freeze_dictionary(dictionary)
+
+    print(f'Dictionary generated in {time.time() - start_time} seconds')
+
+    return dictionary
+
+
+def read_source(file: str) -> dict:
+    """
+    Read a dictionary source file into a manifest record.
+
+    :param file: The dictionary JSON file.
+    :return: A record with the file's size, modification time, content hash, Latin word, definitions and morphology.
+    """
+
+    stat = os.stat(file)
+
+    with open(file, mode='rb') as f:
+        raw: bytes = f.read()
+
+    data: dict = json.loads(raw.decode('utf-8'))
+    latin_word, english_words = parse_entry(data)
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+        'word': latin_word,
+        'definitions': english_words,
+        'morphology': inflection.read_morphology(data),
+    }
+
+
+def _read_shard(file_list: list[str]) -> list[dict]:
+    """
+    Read one shard of the source files into manifest records.
+
+    :param file_list: The dictionary JSON files to read.
+    :return: The records in file order.
+    """
+
+    return [read_source(file) for file in file_list]
+
+
+def read_sources(file_list: list[str], workers: int = 1) -> dict[str, dict]:
+    """
+    Read dictionary source files into manifest records, optionally across a process pool.
+
+    :param file_list: The dictionary JSON files to read.
+    :param workers: The number of worker processes, 0 for one per CPU.
+    :return: The records keyed by file, in file order.
+    """
+
+    workers = _resolve_workers(workers)
+
+    if workers <= 1 or len(file_list) <= 1:
+        return dict(zip(file_list, _read_shard(file_list)))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    records: list[dict] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_records in executor.map(_read_shard, _shard(file_list, workers)):
+            records.extend(shard_records)
+
+    return dict(zip(file_list, records))
+
+
+def _stat_sources(file_list: list[str]) -> dict[str, tuple[int, int]]:
+    """
+    Stat the dictionary source files.
+
+    :param file_list: The dictionary JSON files.
+    :return: A mapping of file path to its (size, modification time in nanoseconds).
+    """
+
+    states: dict[str, tuple[int, int]] = {}
+
+    for file in file_list:
+        stat = os.stat(file)
+        states[file] = (stat.st_size, stat.st_mtime_ns)
+
+    return states
+
+
+def _fingerprint(states: dict[str, tuple[int, int]]) -> bytes:
+    """
+    Fingerprint a set of source file states.
+
+    :param states: A mapping of file path to its (size, modification time in nanoseconds).
+    :return: A SHA-256 digest of the states.
+    """
+
+    digest = hashlib.sha256()
+
+    for file in sorted(states):
+        size, mtime_ns = states[file]
+        digest.update(f'{file}\0{size}\0{mtime_ns}\n'.encode('utf-8'))
+
+    return digest.digest()
+
+
+def source_fingerprint(file_list: list[str]) -> bytes:
+    """
+    Fingerprint the dictionary source files by path, size and modification time.
+
+    :param file_list: The dictionary JSON files.
+    :return: A SHA-256 digest that changes whenever a file is added, removed or modified.
+    """
+
+    return _fingerprint(_stat_sources(file_list))
+
+
+def _pad(buffer: bytearray, alignment: int = 8) -> None:
+    """
+    Pad a buffer with null bytes up to the given alignment.
+
+    :param buffer: The buffer to pad.
+    :param alignment: The alignment in bytes.
+    :return: None
+    """
+
+    buffer.extend(b'\0' * (-len(buffer) % alignment))
+
+
+def _key_hash(key: bytes) -> int:
+    """
+    Hash a key for _keys_digest.
+
+    :param key: The encoded key.
+    :return: The SHA-256 digest of the key, as an integer.
+    """
+
+    return int.from_bytes(hashlib.sha256(key).digest(), 'little')
+
+
+def _keys_digest(keys: Iterable[bytes]) -> bytes:
+    """
+    Hash the keys of a map.
+
+    The digest is the sum of the SHA-256 digests of the keys, so that it does not depend on their order and an update
+    can add and remove keys from it without hashing the others again.
+
+    :param keys: The encoded keys.
+    :return: A 32 byte digest of the keys.
+    """
+
+    return (sum(map(_key_hash, keys)) % (1 << 256)).to_bytes(32, 'little')
+
+
+def english_fingerprint(english_dictionary: Mapping) -> bytes:
+    """
+    Fingerprint the English keys of a dictionary, to tell when data derived from them, such as the synonym table, is
+    out of date.
+
+    Compiled indexes store this fingerprint when they are built, so only plain dictionaries have their keys hashed here.
+
+    :param english_dictionary: The 'english' map of the Latin-English dictionary.
+    :return: A digest of the keys, see _keys_digest.
+    """
+
+    if isinstance(english_dictionary, _CompiledMap) and english_dictionary.keys_digest is not None:
+        return english_dictionary.keys_digest
+
+    return _keys_digest(key.encode('utf-8') for key in english_dictionary)
+
+
+def _empty_slots(key_count: int) -> array.array:
+    """
+    Create an empty open-addressing hash table with room for a number of keys.
+
+    :param key_count: The number of keys.
+    :return: A power-of-two sized slot array, at most half full once the keys are added, of 0xFFFFFFFF.
+    """
+
+    slot_count: int = 1
+    while slot_count < key_count * 2:
+        slot_count *= 2
+
+    return array.array('I', [_NONE]) * slot_count
+
+
+def _insert_slot(slots: array.array, key: bytes, position: int) -> None:
+    """
+    Add an entry to an open-addressing hash table, in the first free slot from the one its key hashes to.
+
+    :param slots: The slot array.
+    :param key: The encoded key of the entry.
+    :param position: The position of the entry.
+    :return: None
+    """
+
+    mask: int = len(slots) - 1
+    slot: int = zlib.crc32(key) & mask
+
+    while slots[slot] != _NONE:
+        slot = (slot + 1) & mask
+
+    slots[slot] = position
+
+
+def _hash_slots(keys: list[bytes]) -> array.array:
+    """
+    Build an open-addressing hash table over the keys of a section.
+
+    :param keys: The encoded keys, in entry order.
+    :return: A power-of-two sized slot array holding entry positions, 0xFFFFFFFF for empty slots.
+    """
+
+    slots: array.array = _empty_slots(len(keys))
+
+    for position, key in enumerate(keys):
+        _insert_slot(slots, key, position)
+
+    return slots
+
+
+def encode_index(dictionary: Mapping, fingerprint: bytes, frequencies: Mapping[str, int] | None = None) -> bytearray:
+    """
+    Encode a dictionary in the compiled binary index format.
+
+    The index holds a single string table followed by, for each of the 'english', 'latin', 'folded' and 'forms' maps, an
+    entry array, a flat value array, a hash table over the keys and the positions of the entries in key order. Every
+    entry is three unsigned ints: the key's string id, the start of its values and their count (0xFFFFFFFF when the
+    source had no definitions). The gloss frequencies of the Latin words and the string ids of their plain spellings
+    are stored in two more arrays, parallel to the latin entries, and the header holds a digest of the English keys,
+    see english_fingerprint.
+
+    Entries are written in key order, but update_dictionary appends the entries it adds and leaves the ones it removes
+    out of the hash table and key order only, so that it can patch an index without encoding it again.
+
+    :param dictionary: The dictionary as returned by generate_dictionary.
+    :param fingerprint: The source fingerprint stored in the header.
+    :param frequencies: The gloss frequencies of the Latin words, computed from the dictionary if None.
+    :return: The encoded index.
+    """
+
+    if frequencies is None:
+        frequencies = gloss_frequencies(dictionary)
+
+    string_ids: dict[str, int] = {}
+    strings: list[bytes] = []
+
+    def intern(text: str) -> int:
+        string_id = string_ids.get(text)
+
+        if string_id is None:
+            string_id = len(strings)
+            string_ids[text] = string_id
+            strings.append(text.encode('utf-8'))
+
+        return string_id
+
+    sections: list[tuple[array.array, array.array, array.array, array.array]] = []
+    english_digest: bytes = bytes(32)
+    latin_frequencies: array.array = array.array('I')
+    latin_spellings: array.array = array.array('I')
+
+    for language in INDEX_SECTIONS:
+        entries: array.array = array.array('I')
+        values: array.array = array.array('I')
+        language_dict: dict = dictionary.get(language, {})
+        keys: list[bytes] = sorted(key.encode('utf-8') for key in language_dict)
+
+        if language == 'english':
+            english_digest = _keys_digest(keys)
+
+        for encoded_key in keys:
+            key: str = encoded_key.decode('utf-8')
+            value = language_dict[key]
+
+            if language == 'latin':
+                value = value.get('english')
+                latin_frequencies.append(frequencies.get(key, 0))
+                latin_spellings.append(intern(plain(key)))
+
+            entries.append(intern(key))
+
+            if value is None:
+                entries.extend((0, _NONE))
+                continue
+
+            entries.extend((len(values), len(value)))
+            values.extend(intern(item) for item in value)
+
+        sections.append((entries, values, _hash_slots(keys), array.array('I', range(len(keys)))))
+
+    string_offsets: array.array = array.array('I', [0])
+    for encoded in strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    return _pack_index(fingerprint, sections, latin_frequencies, latin_spellings, string_offsets, b''.join(strings), english_digest)
+
+
+def _pack_index(fingerprint: bytes, sections: list[tuple[array.array, array.array, array.array, array.array]], latin_frequencies: array.array, latin_spellings: array.array, string_offsets: array.array, strings: bytes, english_digest: bytes) -> bytearray:
+    """
+    Lay the blocks of an index out after its header. See encode_index for the format.
+
+    :param fingerprint: The source fingerprint stored in the header.
+    :param sections: The entries, values, hash table and key order of each map, in INDEX_SECTIONS order.
+    :param latin_frequencies: The gloss frequencies of the latin entries.
+    :param latin_spellings: The string ids of the plain spellings of the latin entries.
+    :param string_offsets: The offsets of the strings in the string table, followed by its length.
+    :param strings: The string table.
+    :param english_digest: The digest of the English keys.
+    :return: The encoded index.
+    """
+
+    body: bytearray = bytearray(_HEADER.size + _SECTION.size * len(INDEX_SECTIONS))
+    _pad(body)
+
+    section_offsets: list[list[int]] = []
+    for blocks in sections:
+        section_offsets.append([])
+
+        for block in blocks:
+            section_offsets[-1].append(len(body))
+            body.extend(block.tobytes())
+            _pad(body)
+
+    frequencies_at: int = len(body)
+    body.extend(latin_frequencies.tobytes())
+    _pad(body)
+
+    spellings_at: int = len(body)
+    body.extend(latin_spellings.tobytes())
+    _pad(body)
+
+    string_offsets_at: int = len(body)
+    body.extend(string_offsets.tobytes())
+    _pad(body)
+
+    strings_at: int = len(body)
+    body.extend(strings)
+
+    _HEADER.pack_into(
+        body, 0, INDEX_MAGIC, INDEX_VERSION, int(sys.byteorder == 'little'), fingerprint,
+        len(string_offsets) - 1, string_offsets_at, strings_at, frequencies_at, spellings_at, english_digest
+    )
+
+    for position, ((entries, values, slots, order), offsets) in enumerate(zip(sections, section_offsets)):
+        _SECTION.pack_into(body, _HEADER.size + _SECTION.size * position, len(entries) // 3, len(values), len(slots), len(order), *offsets)
+
+    return body
+
+
+def write_index(dictionary: Mapping, index_path: str, fingerprint: bytes, frequencies: Mapping[str, int] | None = None) -> None:
+    """
+    Write a dictionary to a compiled binary index file. See encode_index for the format.
+
+    :param dictionary: The dictionary as returned by generate_dictionary.
+    :param index_path: The path to write the index to.
+    :param fingerprint: The source fingerprint stored in the header.
+    :param frequencies: The gloss frequencies of the Latin words, computed from the dictionary if None.
+    :return: None
+    """
+
+    _write_body(index_path, encode_index(dictionary, fingerprint, frequencies))
+
+
+def _write_body(index_path: str, body: bytearray) -> None:
+    """
+    Replace an index file with an encoded index.
+
+    :param index_path: The path to write the index to.
+    :param body: The encoded index.
+    :return: None
+    """
+
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    temp_path: str = f'{index_path}.tmp'
+
+    with open(temp_path, mode='wb') as file:
+        file.write(body)
+
+    os.replace(temp_path, index_path)
+
+
+class _CompiledMap(Mapping):
+    """
+    A read-only view of one map inside a compiled index.
+
+    Keys are found through the section's hash table, iterated in key order and their values are only decoded when looked
+    up.
+    """
+
+    def __init__(self, index: 'CompiledDictionary', entries: memoryview, values: memoryview, slots: memoryview, order: memoryview, wrap_english: bool, frequencies: memoryview | None = None, spellings: memoryview | None = None, keys_digest: bytes | None = None) -> None:
+        self._index = index
+        self._entries = entries
+        self._values = values
+        self._slots = slots
+        self._order = order
+        self._mask = len(slots) - 1
+        self._wrap_english = wrap_english
+        self._frequencies = frequencies
+        self._spellings = spellings
+        self.keys_digest: bytes | None = keys_digest
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in self._order:
+            yield self._index._string(self._entries[position * 3])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __getitem__(self, key: str):
+        position: int | None = self._find(key) if isinstance(key, str) else None
+
+        if position is None:
+            raise KeyError(key)
+
+        return self._value(position)
+
+    def frequency(self, key: str) -> int:
+        """
+        Get the gloss frequency stored for a Latin word when the index was built.
+
+        :param key: The Latin word.
+        :return: The frequency, 0 if the word is missing or this is not the latin map.
+        """
+
+        position: int | None = self._find(key) if self._frequencies is not None else None
+
+        if position is None:
+            return 0
+
+        return self._frequencies[position]
+
+    def spelling(self, key: str) -> str | None:
+        """
+        Get the plain spelling stored for a Latin word when the index was built, see plain.
+
+        :param key: The Latin word.
+        :return: The plain spelling, or None if the word is missing or this is not the latin map.
+        """
+
+        position: int | None = self._find(key) if self._spellings is not None else None
+
+        if position is None:
+            return None
+
+        return self._index._string(self._spellings[position])
+
+    def _items(self) -> Iterator[tuple[str, object]]:
+        for position in self._order:
+            yield (self._index._string(self._entries[position * 3]), self._value(position))
+
+    def _value(self, position: int):
+        start: int = self._entries[position * 3 + 1]
+        count: int = self._entries[position * 3 + 2]
+
+        value: tuple[str, ...] | None = None
+        if count != _NONE:
+            value = tuple(self._index._string(string_id) for string_id in self._values[start:start + count])
+
+        if self._wrap_english:
+            return {"english" : value}
+
+        return value
+
+    def _find(self, key: str) -> int | None:
+        target: bytes = key.encode('utf-8')
+        slot: int = zlib.crc32(target) & self._mask
+
+        while True:
+            position: int = self._slots[slot]
+
+            if position == _NONE:
+                return None
+
+            if self._index._bytes(self._entries[position * 3]) == target:
+                return position
+
+            slot = (slot + 1) & self._mask
+
+
+class CompiledDictionary(Mapping):
+    """
+    A memory-mapped Latin-English dictionary.
+
+    This behaves like the dictionary returned by generate_dictionary, with 'english', 'latin', 'folded' and 'forms'
+    keys, but reads entries lazily from a compiled index file instead of holding every entry in memory.
+    """
+
+    def __init__(self, index_path: str) -> None:
+        self.path: str = index_path
+
+        with open(index_path, mode='rb') as file:
+            buffer: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._attach(buffer)
+        except ValueError as e:
+            buffer.close()
+            raise ValueError(f'{e}: {index_path}') from None
+
+    def _attach(self, buffer: mmap.mmap) -> None:
+        """
+        Read the header of an index and set up views of its sections.
+
+        :param buffer: The whole index, memory-mapped.
+        :return: None
+        """
+
+        try:
+            header = _HEADER.unpack_from(buffer, 0)
+            section_headers = [_SECTION.unpack_from(buffer, _HEADER.size + _SECTION.size * position) for position in range(len(INDEX_SECTIONS))]
+        except struct.error:
+            raise ValueError('Invalid dictionary index')
+
+        magic, version, little_endian, fingerprint, string_count, string_offsets_at, strings_at, frequencies_at, spellings_at, english_digest = header
+
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or bool(little_endian) != (sys.byteorder == 'little'):
+            raise ValueError('Incompatible dictionary index')
+
+        # Check that every block fits in the file before taking views of it, so that a truncated index is rejected
+        blocks: list[tuple[int, int]] = [(string_offsets_at, (string_count + 1) * 4)]
+        for language, (entry_count, value_count, slot_count, key_count, entries_at, values_at, slots_at, order_at) in zip(INDEX_SECTIONS, section_headers):
+            blocks.extend(((entries_at, entry_count * 12), (values_at, value_count * 4), (slots_at, slot_count * 4), (order_at, key_count * 4)))
+
+            if language == 'latin':
+                blocks.extend(((frequencies_at, entry_count * 4), (spellings_at, entry_count * 4)))
+
+        if any(at + size > len(buffer) for at, size in blocks):
+            raise ValueError('Invalid dictionary index')
+
+        if strings_at + struct.unpack_from('I', buffer, string_offsets_at + string_count * 4)[0] > len(buffer):
+            raise ValueError('Invalid dictionary index')
+
+        self.fingerprint: bytes = fingerprint
+        self._buffer: mmap.mmap = buffer
+
+        view: memoryview = memoryview(buffer)
+
+        self._string_offsets: memoryview = view[string_offsets_at:string_offsets_at + (string_count + 1) * 4].cast('I')
+        self._strings_at: int = strings_at
+        self._views: list[memoryview] = [self._string_offsets]
+        self._maps: dict[str, _CompiledMap] = {}
+
+        for language, (entry_count, value_count, slot_count, key_count, entries_at, values_at, slots_at, order_at) in zip(INDEX_SECTIONS, section_headers):
+            entries: memoryview = view[entries_at:entries_at + entry_count * 12].cast('I')
+            values: memoryview = view[values_at:values_at + value_count * 4].cast('I')
+            slots: memoryview = view[slots_at:slots_at + slot_count * 4].cast('I')
+            order: memoryview = view[order_at:order_at + key_count * 4].cast('I')
+
+            self._views.extend((entries, values, slots, order))
+
+            if language == 'latin':
+                frequencies: memoryview = view[frequencies_at:frequencies_at + entry_count * 4].cast('I')
+                spellings: memoryview = view[spellings_at:spellings_at + entry_count * 4].cast('I')
+                self._views.extend((frequencies, spellings))
+                self._maps[language] = _CompiledMap(self, entries, values, slots, order, True, frequencies, spellings)
+            else:
+                self._maps[language] = _CompiledMap(self, entries, values, slots, order, False, keys_digest=english_digest if language == 'english' else None)
+
+        self._views.append(view)
+
+    def _bytes(self, string_id: int) -> bytes:
+        start: int = self._strings_at + self._string_offsets[string_id]
+        end: int = self._strings_at + self._string_offsets[string_id + 1]
+
+        return self._buffer[start:end]
+
+    def _string(self, string_id: int) -> str:
+        return self._bytes(string_id).decode('utf-8')
+
+    def __getitem__(self, language: str) -> _CompiledMap:
+        return self._maps[language]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._maps)
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def to_dict(self) -> dict:
+        """
+        Decode the whole index back into the plain dictionary structure returned by generate_dictionary.
+
+        :return: A dictionary containing Latin and English word mappings.
+        """
+
+        return {language: dict(self._maps[language]._items()) for language in INDEX_SECTIONS}
+
+    def close(self) -> None:
+        """
+        Release the memory map. Views taken from this dictionary must not be used afterwards.
+
+        :return: None
+        """
+
+        if self._buffer.closed:
+            return
+
+        self._maps = {}
+
+        for view in self._views:
+            view.release()
+
+        self._buffer.close()
+
+    def __enter__(self) -> 'CompiledDictionary':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def merge_entries(dictionary: Mapping, latin_words: Iterable[str]) -> tuple[str, ...] | None:
+    """
+    Merge the definitions of several Latin headwords.
+
+    :param dictionary: The Latin-English dictionary.
+    :param latin_words: The headwords.
+    :return: Their definitions in order without duplicates, or None if none of them has any.
+    """
+
+    english_words: dict[str, None] = {}
+    defined: bool = False
+
+    for latin_word in latin_words:
+        entry: dict | None = dictionary['latin'].get(latin_word)
+
+        if entry is not None and entry['english'] is not None:
+            defined = True
+            english_words.update(dict.fromkeys(entry['english']))
+
+    return tuple(english_words) if defined else None
+
+
+def gloss_frequency(dictionary: Mapping, latin_word: str) -> int:
+    """
+    Get how often a Latin word is used to translate an English gloss across the lexicon, see gloss_frequencies.
+
+    The frequencies are computed once when the dictionary is built, stored in compiled indexes and under
+    'frequency' in frozen dictionaries, so this is a single lookup.
+
+    :param dictionary: The Latin-English dictionary.
+    :param latin_word: The Latin headword.
+    :return: The frequency in thousandths of a gloss, 0 if the word is missing or has no definitions.
+    """
+
+    latin_dictionary: Mapping = dictionary['latin']
+
+    if isinstance(latin_dictionary, _CompiledMap):
+        return latin_dictionary.frequency(latin_word)
+
+    return dictionary.get('frequency', {}).get(latin_word, 0)
+
+
+def plain_spelling(dictionary: Mapping, latin_word: str) -> str:
+    """
+    Get the plain spelling of a Latin word, see plain.
+
+    Compiled indexes store it for every headword when they are built, so only other words, such as
+    machine translations, are normalized here.
+
+    :param dictionary: The Latin-English dictionary.
+    :param latin_word: The Latin word.
+    :return: The word without diacritics, in lowercase.
+    """
+
+    latin_dictionary: Mapping = dictionary['latin']
+
+    if isinstance(latin_dictionary, _CompiledMap):
+        spelling: str | None = latin_dictionary.spelling(latin_word)
+
+        if spelling is not None:
+            return spelling
+
+    return plain(latin_word)
+
+
+def lookup_folded(dictionary: Mapping, latin_word: str) -> dict | None:
+    """
+    Look up a Latin word ignoring diacritics, case and i/j, u/v spelling.
+
+    :param dictionary: The Latin-English dictionary, built or compiled.
+    :param latin_word: The Latin word to look up.
+    :return: A latin entry merging the definitions of every headword with the same folded spelling, in the order the
+        headwords were first seen, or None if there is no such headword.
+    """
+
+    latin_words: tuple[str, ...] | None = dictionary['folded'].get(fold(latin_word))
+
+    if latin_words is None:
+        return None
+
+    return {"english" : merge_entries(dictionary, latin_words)}
+
+
+def lookup_inflected(dictionary: Mapping, latin_word: str) -> dict | None:
+    """
+    Look up an inflected Latin form, such as 'amabat', through the precomputed forms index.
+
+    The form is folded like in lookup_folded, so diacritics, case and i/j, u/v spelling do not matter.
+
+    :param dictionary: The Latin-English dictionary, built or compiled.
+    :param latin_word: The Latin form to look up.
+    :return: A latin entry with the headwords the form can come from under "lemmas" and their merged definitions under
+        "english", or None if the form is unknown.
+    """
+
+    latin_words: tuple[str, ...] | None = dictionary['forms'].get(fold(latin_word))
+
+    if latin_words is None:
+        return None
+
+    return {"english" : merge_entries(dictionary, latin_words), "lemmas" : tuple(latin_words)}
+
+
+def manifest_path(index_path: str) -> str:
+    """
+    Get the path of the source manifest kept next to a compiled index.
+
+    :param index_path: The path of the compiled index.
+    :return: The manifest path.
+    """
+
+    return f'{os.path.splitext(index_path)[0]}.manifest.db'
+
+
+def _open_index(index_path: str) -> CompiledDictionary | None:
+    """
+    Open a compiled index if it exists and is readable.
+
+    :param index_path: The path of the compiled index.
+    :return: The memory-mapped dictionary, or None if it could not be opened.
+    """
+
+    try:
+        return CompiledDictionary(index_path)
+    except (OSError, ValueError):
+        return None
+
+
+def _open_manifest(path: str) -> tuple[sqlite3.Connection, dict] | None:
+    """
+    Open a source manifest.
+
+    :param path: The manifest path.
+    :return: The connection and the manifest's metadata, or None if it is missing, unreadable or from another index
+        version.
+    """
+
+    if not os.path.exists(path):
+        return None
+
+    connection: sqlite3.Connection = sqlite3.connect(path)
+
+    try:
+        meta: dict = dict(connection.execute('SELECT key, value FROM meta'))
+    except sqlite3.Error:
+        connection.close()
+        return None
+
+    if meta.get('version') != INDEX_VERSION:
+        connection.close()
+        return None
+
+    return (connection, meta)
+
+
+def _manifest_row(file: str, position: int, record: dict) -> tuple:
+    """
+    Turn a manifest record into a row of the manifest's files table.
+
+    :param file: The source file.
+    :param position: The position of the file, see _assign_positions.
+    :param record: The manifest record, see read_source.
+    :return: The row.
+    """
+
+    return (file, position, record['size'], record['mtime_ns'], record['sha256'], record['word'], json.dumps(record['definitions']), json.dumps(record['morphology']))
+
+
+def _manifest_record(latin_word: str | None, definitions: str, morphology: str) -> dict:
+    """
+    Read the Latin word, definitions and morphology of a manifest record back from its row.
+
+    :param latin_word: The word column.
+    :param definitions: The definitions column.
+    :param morphology: The morphology column.
+    :return: The record, without the file's state.
+    """
+
+    return {'word': latin_word, 'definitions': json.loads(definitions), 'morphology': json.loads(morphology)}
+
+
+def _write_manifest(path: str, fingerprint: bytes, records: dict[str, dict], compact_size: int) -> None:
+    """
+    Write a fresh source manifest.
+
+    The manifest is an SQLite database with a row per source file, so that an update only writes the rows of the files
+    that changed, and the index's fingerprint and compiled size.
+
+    :param path: The manifest path.
+    :param fingerprint: The fingerprint of the index the manifest describes.
+    :param records: The manifest records keyed by source file, in file order.
+    :param compact_size: The size of the index as compiled, see update_dictionary.
+    :return: None
+    """
+
+    temp_path: str = f'{path}.tmp'
+
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection: sqlite3.Connection = sqlite3.connect(temp_path)
+
+    try:
+        connection.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value)')
+        connection.execute('CREATE TABLE files (path TEXT PRIMARY KEY, position INTEGER NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, sha256 TEXT NOT NULL, word TEXT, definitions TEXT, morphology TEXT)')
+        connection.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (_manifest_row(file, (position + 1) * _POSITION_STEP, record) for position, (file, record) in enumerate(records.items())))
+        connection.execute('CREATE INDEX files_word ON files (word)')
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [('version', INDEX_VERSION), ('fingerprint', fingerprint.hex()), ('compact_size', compact_size)])
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(temp_path, path)
+
+
+def _assign_positions(file_list: list[str], known: dict[str, int]) -> tuple[dict[str, int], bool] | None:
+    """
+    Give every source file a position that sorts like file_list, keeping the positions of the files in the manifest.
+
+    Files are compiled _POSITION_STEP apart, so that added files fit between the ones around them. When there is no
+    room left, every file is numbered again.
+
+    :param file_list: The dictionary JSON files, in order.
+    :param known: The positions of the files in the manifest.
+    :return: The positions of the files in file_list and whether the known files were numbered again, or None if the
+        known files are not in the same order as in the manifest.
+    """
+
+    positions: dict[str, int] = {}
+    pending: list[str] = []
+    previous: int = 0
+    renumbered: bool = False
+
+    for file in file_list:
+        position: int | None = known.get(file)
+
+        if position is None:
+            pending.append(file)
+            continue
+
+        if position <= previous:
+            return None
+
+        if position - previous <= len(pending):
+            renumbered = True
+
+        for offset, added in enumerate(pending, start=1):
+            positions[added] = previous + (position - previous) * offset // (len(pending) + 1)
+
+        positions[file] = position
+        previous = position
+        pending = []
+
+    for offset, added in enumerate(pending, start=1):
+        positions[added] = previous + offset * _POSITION_STEP
+
+    if renumbered:
+        positions = {file: (position + 1) * _POSITION_STEP for position, file in enumerate(file_list)}
+
+    return (positions, renumbered)
+
+
+def _write_fingerprint(index_path: str, fingerprint: bytes) -> None:
+    """
+    Overwrite the source fingerprint in a compiled index header.
+
+    :param index_path: The path of the compiled index.
+    :param fingerprint: The new fingerprint.
+    :return: None
+    """
+
+    with open(index_path, mode='r+b') as file:
+        file.seek(_FINGERPRINT_OFFSET)
+        file.write(fingerprint)
+
+
+def _record_forms(record: dict) -> set[str]:
+    """
+    Get the folded inflected forms contributed by a manifest record.
+
+    :param record: The manifest record.
+    :return: The folded forms.
+    """
+
+    return {fold(form) for form in inflection.expand(record['word'], record.get('morphology'))}
+
+
+def _contributes(section: str, key: str, record: dict) -> bool:
+    """
+    Check whether a manifest record adds its Latin word to a key of a reverse map.
+
+    :param section: The reverse map, 'english', 'folded' or 'forms'.
+    :param key: The key of the reverse map.
+    :param record: The manifest record.
+    :return: Whether the record's word is listed under the key in a full build.
+    """
+
+    match section:
+        case 'english':
+            return any(english_word.lower() == key for english_word in record.get('definitions') or [])
+        case 'folded':
+            return fold(record['word']) == key
+        case _:
+            return key in _record_forms(record)
+
+
+def _source_order(latin_words: Iterable[str], affected: Iterable[str], first_position: Callable[[str], int | None]) -> list[str]:
+    """
+    Put the affected Latin words of a reverse list back where a full build would list them.
+
+    A full build lists each word at the first source file that adds it to the key. The other words keep their relative
+    order, so the affected words are taken out and inserted back by the position of that file.
+
+    :param latin_words: The current list.
+    :param affected: The Latin words whose source files changed.
+    :param first_position: A function giving the position of the first source file adding a word to the key, or None
+        if none does.
+    :return: The new list, empty if no word is left.
+    """
+
+    affected = set(affected)
+    merged: list[str] = [latin_word for latin_word in latin_words if latin_word not in affected]
+    added: list[tuple[int, str]] = []
+
+    for latin_word in affected:
+        position: int | None = first_position(latin_word)
+
+        if position is not None:
+            added.append((position, latin_word))
+
+    for position, latin_word in sorted(added):
+        merged.insert(bisect_left(merged, position, key=first_position), latin_word)
+
+    return merged
+
+
+def _copy_array(view: memoryview) -> array.array:
+    """
+    Copy a block of a memory-mapped index into an array that can be patched.
+
+    :param view: The block, cast to unsigned ints.
+    :return: The array.
+    """
+
+    copy: array.array = array.array('I')
+    copy.frombytes(view.cast('B'))
+
+    return copy
+
+
+class _IndexStrings:
+    """
+    The string table of an index being patched.
+
+    New strings are appended as they are needed, and the ones no longer used are left in place until the index is
+    compacted.
+    """
+
+    def __init__(self, offsets: array.array, data: bytearray) -> None:
+        self.offsets: array.array = offsets
+        self.data: bytearray = data
+        self._ids: dict[str, int] = {}
+
+    def encoded(self, string_id: int) -> bytes:
+        return bytes(self.data[self.offsets[string_id]:self.offsets[string_id + 1]])
+
+    def get(self, string_id: int) -> str:
+        text: str = self.encoded(string_id).decode('utf-8')
+        self._ids.setdefault(text, string_id)
+
+        return text
+
+    def intern(self, text: str) -> int:
+        string_id: int | None = self._ids.get(text)
+
+        if string_id is None:
+            string_id = len(self.offsets) - 1
+            self.data.extend(text.encode('utf-8'))
+            self.offsets.append(len(self.data))
+            self._ids[text] = string_id
+
+        return string_id
+
+
+class _IndexSection:
+    """
+    One map of an index being patched, copied out of the memory map.
+
+    Added keys get a new entry at the end of the entry array, and removed ones are only taken out of the hash table and
+    key order, see encode_index.
+    """
+
+    def __init__(self, strings: _IndexStrings, compiled_map: _CompiledMap) -> None:
+        self.strings: _IndexStrings = strings
+        self.entries: array.array = _copy_array(compiled_map._entries)
+        self.values: array.array = _copy_array(compiled_map._values)
+        self.slots: array.array = _copy_array(compiled_map._slots)
+        self.order: array.array = _copy_array(compiled_map._order)
+        self.frequencies: array.array | None = _copy_array(compiled_map._frequencies) if compiled_map._frequencies is not None else None
+        self.spellings: array.array | None = _copy_array(compiled_map._spellings) if compiled_map._spellings is not None else None
+
+    def _key(self, position: int) -> bytes:
+        return self.strings.encoded(self.entries[position * 3])
+
+    def _slot(self, key: bytes) -> int:
+        mask: int = len(self.slots) - 1
+        slot: int = zlib.crc32(key) & mask
+
+        while self.slots[slot] != _NONE and self._key(self.slots[slot]) != key:
+            slot = (slot + 1) & mask
+
+        return slot
+
+    def find(self, key: str) -> int | None:
+        """
+        Find the entry of a key.
+
+        :param key: The key.
+        :return: The position of its entry, or None if it has none.
+        """
+
+        position: int = self.slots[self._slot(key.encode('utf-8'))]
+
+        return None if position == _NONE else position
+
+    def get(self, position: int) -> list[int] | None:
+        """
+        Get the value of an entry.
+
+        :param position: The position of the entry.
+        :return: The string ids of its values, or None if the source had no definitions.
+        """
+
+        start: int = self.entries[position * 3 + 1]
+        count: int = self.entries[position * 3 + 2]
+
+        return None if count == _NONE else list(self.values[start:start + count])
+
+    def put(self, key: str, value: list[int] | None) -> bool:
+        """
+        Set the value of a key, adding an entry for it if it has none.
+
+        :param key: The key.
+        :param value: The string ids of its values, or None for no definitions.
+        :return: Whether an entry was added.
+        """
+
+        encoded: bytes = key.encode('utf-8')
+        position: int = self.slots[self._slot(encoded)]
+        added: bool = position == _NONE
+
+        if added:
+            if (len(self.order) + 1) * 2 > len(self.slots):
+                self.slots = _empty_slots(len(self.order) + 1)
+
+                for live in self.order:
+                    _insert_slot(self.slots, self._key(live), live)
+
+            position = len(self.entries) // 3
+            self.entries.extend((self.strings.intern(key), 0, _NONE))
+            _insert_slot(self.slots, encoded, position)
+            self.order.insert(bisect_left(self.order, encoded, key=self._key), position)
+        elif self.get(position) == value:
+            return False
+
+        if value is not None:
+            self.entries[position * 3 + 1] = len(self.values)
+            self.entries[position * 3 + 2] = len(value)
+            self.values.extend(value)
+        else:
+            self.entries[position * 3 + 1] = 0
+            self.entries[position * 3 + 2] = _NONE
+
+        return added
+
+    def remove(self, key: str) -> None:
+        """
+        Remove a key, if it has an entry.
+
+        :param key: The key.
+        :return: None
+        """
+
+        encoded: bytes = key.encode('utf-8')
+        slot: int = self._slot(encoded)
+
+        if self.slots[slot] == _NONE:
+            return
+
+        del self.order[bisect_left(self.order, encoded, key=self._key)]
+
+        # Move the entries after the freed slot back into it when their probe sequence passes it, so that lookups do not
+        # stop early at an empty slot
+        mask: int = len(self.slots) - 1
+        self.slots[slot] = _NONE
+        following: int = slot
+
+        while True:
+            following = (following + 1) & mask
+            moved: int = self.slots[following]
+
+            if moved == _NONE:
+                break
+
+            home: int = zlib.crc32(self._key(moved)) & mask
+
+            if (following - home) & mask >= (following - slot) & mask:
+                self.slots[slot] = moved
+                self.slots[following] = _NONE
+                slot = following
+
+
+def _patch_index(compiled: CompiledDictionary, manifest: sqlite3.Connection, positions: dict[str, int], removed: list[str], changed: dict[str, dict], fingerprint: bytes) -> bytearray:
+    """
+    Patch source file changes into a compiled index, without decoding the entries they do not touch.
+
+    The Latin entries of the words defined by removed, changed and added files are taken from the last file still
+    defining them, and these words are put back in the reverse english, folded and forms lists they were or are now
+    under, at the position of the first file adding them, so that the result is the same as a full build. The gloss
+    frequencies of the words in a changed english list are adjusted by the change in its share.
+
+    :param compiled: The compiled index.
+    :param manifest: The source manifest of the index, not yet updated.
+    :param positions: The positions of the source files, see _assign_positions.
+    :param removed: The source files that no longer exist.
+    :param changed: New manifest records for added or modified files.
+    :param fingerprint: The new source fingerprint.
+    :return: The patched index.
+    """
+
+    replaced: set[str] = {*removed, *changed}
+    old_records: list[dict] = []
+
+    for file in replaced:
+        row: tuple | None = manifest.execute('SELECT word, definitions, morphology FROM files WHERE path = ?', (file,)).fetchone()
+
+        if row is not None:
+            old_records.append(_manifest_record(*row))
+
+    affected_records: list[dict] = [record for record in [*old_records, *changed.values()] if record['word'] is not None]
+    affected: set[str] = {record['word'] for record in affected_records}
+    sources: dict[str, list[tuple[int, dict]]] = {}
+
+    def word_sources(latin_word: str) -> list[tuple[int, dict]]:
+        found: list[tuple[int, dict]] | None = sources.get(latin_word)
+
+        if found is None:
+            rows = manifest.execute('SELECT path, word, definitions, morphology FROM files WHERE word = ?', (latin_word,))
+            found = [(positions[path], _manifest_record(*columns)) for path, *columns in rows if path not in replaced]
+            found.extend((positions[file], record) for file, record in changed.items() if record['word'] == latin_word)
+            found.sort(key=lambda source: source[0])
+            sources[latin_word] = found
+
+        return found
+
+    string_offsets: array.array = _copy_array(compiled._string_offsets)
+    strings: _IndexStrings = _IndexStrings(string_offsets, bytearray(compiled._buffer[compiled._strings_at:compiled._strings_at + string_offsets[-1]]))
+    sections: dict[str, _IndexSection] = {language: _IndexSection(strings, compiled[language]) for language in INDEX_SECTIONS}
+    latin: _IndexSection = sections['latin']
+
+    for latin_word in affected:
+        position: int | None = latin.find(latin_word)
+        if position is not None:
+            # The lists the word joins reuse the string of its key
+            strings.get(latin.entries[position * 3])
+
+        found: list[tuple[int, dict]] = word_sources(latin_word)
+
+        if len(found) == 0:
+            latin.remove(latin_word)
+            continue
+
+        definitions: list[str] | None = found[-1][1]['definitions']
+
+        if latin.put(latin_word, [strings.intern(english_word) for english_word in definitions] if definitions is not None else None):
+            latin.frequencies.append(0)
+            latin.spellings.append(strings.intern(plain(latin_word)))
+
+    keys: dict[str, set[str]] = {
+        'english': {english_word.lower() for record in affected_records for english_word in record['definitions'] or []},
+        'folded': {fold(latin_word) for latin_word in affected},
+        'forms': {form for record in affected_records for form in _record_forms(record)},
+    }
+    english_digest: int = int.from_bytes(compiled['english'].keys_digest, 'little')
+    frequency_changes: dict[str, int] = {}
+
+    for section in _SET_SECTIONS:
+        index_section: _IndexSection = sections[section]
+
+        for key in keys[section]:
+            def first_position(latin_word: str) -> int | None:
+                return next((position for position, record in word_sources(latin_word) if _contributes(section, key, record)), None)
+
+            position = index_section.find(key)
+            old_words: list[str] = [strings.get(string_id) for string_id in index_section.get(position)] if position is not None else []
+            latin_words: list[str] = _source_order(old_words, affected, first_position)
+
+            if latin_words == old_words:
+                continue
+
+            if section == 'english':
+                for latin_word in old_words:
+                    frequency_changes[latin_word] = frequency_changes.get(latin_word, 0) - FREQUENCY_SCALE // len(old_words)
+
+                for latin_word in latin_words:
+                    frequency_changes[latin_word] = frequency_changes.get(latin_word, 0) + FREQUENCY_SCALE // len(latin_words)
+
+                if position is None:
+                    english_digest += _key_hash(key.encode('utf-8'))
+                elif len(latin_words) == 0:
+                    english_digest -= _key_hash(key.encode('utf-8'))
+
+            if len(latin_words) != 0:
+                index_section.put(key, [strings.intern(latin_word) for latin_word in latin_words])
+            else:
+                index_section.remove(key)
+
+    for latin_word, frequency_change in frequency_changes.items():
+        position = latin.find(latin_word)
+
+        if frequency_change != 0 and position is not None:
+            latin.frequencies[position] += frequency_change
+
+    return _pack_index(
+        fingerprint, [(section.entries, section.values, section.slots, section.order) for section in sections.values()],
+        latin.frequencies, latin.spellings, strings.offsets, strings.data, (english_digest % (1 << 256)).to_bytes(32, 'little')
+    )
+
+
+@instrumentation.timed('dictionary compile')
+def compile_dictionary(file_list: list[str], index_path: str, workers: int = 1) -> None:
+    """
+    Parse every dictionary source file and write a fresh compiled index and manifest.
+
+    :param file_list: The dictionary JSON files to read.
+    :param index_path: The path to write the index to.
+    :param workers: The number of worker processes used to parse the files, 0 for one per CPU.
+    :return: None
+    """
+
+    print(f'Compiling dictionary... {len(file_list)} files found')
+    start_time = time.time()
+
+    records: dict[str, dict] = read_sources(file_list, workers)
+    dictionary: dict = new_dictionary()
+
+    for record in records.values():
+        if record['word'] is not None:
+            add_entry(dictionary, record['word'], record['definitions'], inflection.expand(record['word'], record['morphology']))
+
+    fingerprint: bytes = _fingerprint({file: (record['size'], record['mtime_ns']) for file, record in records.items()})
+
+    write_index(dictionary, index_path, fingerprint, gloss_frequencies(dictionary))
+    _write_manifest(manifest_path(index_path), fingerprint, records, os.path.getsize(index_path))
+
+    print(f'Dictionary compiled in {time.time() - start_time} seconds')
+
+
+@instrumentation.timed('dictionary update')
+def update_dictionary(file_list: list[str], index_path: str, workers: int = 1) -> None:
+    """
+    Bring a compiled index up to date with its source files.
+
+    Only files whose size or modification time differ from the manifest are read, and of those only the ones whose
+    content hash changed are patched into the index, see _patch_index, so that the time taken follows the number of
+    changed files rather than the size of the dictionary. Only their rows of the manifest are written. Once patches have
+    made the index twice its compiled size, it is encoded again to drop the entries and strings they left unused. A
+    missing or inconsistent index or manifest, or files listed in another order than when they were compiled, fall back
+    to a full compile.
+
+    :param file_list: The dictionary JSON files the index is built from.
+    :param index_path: The path of the compiled index.
+    :param workers: The number of worker processes used for a full compile, 0 for one per CPU.
+    :return: None
+    """
+
+    compiled: CompiledDictionary | None = _open_index(index_path)
+    opened: tuple[sqlite3.Connection, dict] | None = _open_manifest(manifest_path(index_path))
+
+    if compiled is None or opened is None or opened[1].get('fingerprint') != compiled.fingerprint.hex():
+        if compiled is not None:
+            compiled.close()
+
+        if opened is not None:
+            opened[0].close()
+
+        compile_dictionary(file_list, index_path, workers)
+        return
+
+    manifest, meta = opened
+
+    try:
+        known: dict[str, int] = {}
+        known_states: dict[str, tuple[int, int]] = {}
+
+        for file, position, size, mtime_ns in manifest.execute('SELECT path, position, size, mtime_ns FROM files'):
+            known[file] = position
+            known_states[file] = (size, mtime_ns)
+
+        placed: tuple[dict[str, int], bool] | None = _assign_positions(file_list, known)
+
+        if placed is not None:
+            positions, renumbered = placed
+            states: dict[str, tuple[int, int]] = _stat_sources(file_list)
+            removed: list[str] = [file for file in known if file not in states]
+            changed: dict[str, dict] = {}
+            touched: list[tuple[int, int, str]] = []
+
+            for file, state in states.items():
+                if known_states.get(file) == state:
+                    continue
+
+                new_record: dict = read_source(file)
+
+                if file in known and manifest.execute('SELECT sha256 FROM files WHERE path = ?', (file,)).fetchone()[0] == new_record['sha256']:
+                    touched.append((new_record['size'], new_record['mtime_ns'], file))
+                    continue
+
+                changed[file] = new_record
+
+            fingerprint: bytes = _fingerprint(states)
+            compact_size: int = meta['compact_size']
+
+            if len(removed) == 0 and len(changed) == 0:
+                compiled.close()
+                _write_fingerprint(index_path, fingerprint)
+            else:
+                print(f'Updating dictionary index... {len(changed)} changed, {len(removed)} removed')
+                start_time = time.time()
+
+                body: bytearray = _patch_index(compiled, manifest, positions, removed, changed, fingerprint)
+                compiled.close()
+                _write_body(index_path, body)
+
+                if len(body) > 2 * compact_size:
+                    with CompiledDictionary(index_path) as patched:
+                        dictionary: dict = patched.to_dict()
+
+                    write_index(dictionary, index_path, fingerprint)
+                    compact_size = os.path.getsize(index_path)
+
+                print(f'Dictionary updated in {time.time() - start_time} seconds')
+
+            with manifest:
+                manifest.executemany('DELETE FROM files WHERE path = ?', [(file,) for file in removed])
+
+                if renumbered:
+                    manifest.executemany('UPDATE files SET position = ? WHERE path = ?', [(positions[file], file) for file in file_list if file in known])
+
+                manifest.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)', [_manifest_row(file, positions[file], record) for file, record in changed.items()])
+                manifest.executemany('UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?', touched)
+                manifest.executemany('UPDATE meta SET value = ? WHERE key = ?', [(fingerprint.hex(), 'fingerprint'), (compact_size, 'compact_size')])
+    finally:
+        compiled.close()
+        manifest.close()
+
+    if placed is None:
+        print('Dictionary files are listed in a new order')
+        compile_dictionary(file_list, index_path, workers)
+
+
+@instrumentation.timed('dictionary load')
+def load_dictionary(file_list: list[str], index_path: str, workers: int = 1) -> CompiledDictionary:
+    """
+    Load the compiled dictionary index, updating it first if the source files have changed.
+
+    :param file_list: The dictionary JSON files the index is built from.
+    :param index_path: The path of the compiled index.
+    :param workers: The number of worker processes used for a full compile, 0 for one per CPU.
+    :return: The memory-mapped dictionary.
+    """
+
+    compiled: CompiledDictionary | None = _open_index(index_path)
+
+    if compiled is not None:
+        if compiled.fingerprint == source_fingerprint(file_list):
+            print(f'Loaded dictionary index {index_path}')
+            return compiled
+
+        compiled.close()
+
+    update_dictionary(file_list, index_path, workers)
+
+    return CompiledDictionary(index_path)
@@ -0,0 +1,399 @@
+import os
+import json
+import socket
+import asyncio
+import functools
+from collections.abc import Iterable, Mapping
+
+from . import candidate_generator
+from . import fuzzy_matcher
+from . import instrumentation
+from . import phrase_matcher
+
+
+# The longest request or response line, so that large batches fit in one message
+MESSAGE_LIMIT: int = 64 * 1024 * 1024
+
+
+def lookup_result(query: str, language: str, dictionary: Mapping, matcher: phrase_matcher.PhraseMatcher | None = None, fuzzy: fuzzy_matcher.FuzzyMatcher | None = None, fold: bool = False, inflected: bool = False, top_k: int = 5, base: bool = False, spans: bool = False, generator: candidate_generator.CandidateGenerator | None = None) -> dict:
+    """
+    Translate a word or phrase into the result written by minerva-cli lookup.
+
+    :param query: The word or phrase.
+    :param language: The language of the query, 'english' or 'latin'.
+    :param dictionary: The Latin-English dictionary.
+    :param matcher: A phrase matcher over the English keys, needed for spans.
+    :param fuzzy: A fuzzy matcher over the keys of the query's language, used when the query has no exact match.
+    :param fold: Whether Latin queries are matched ignoring macrons, case and i/j, u/v spelling.
+    :param inflected: Whether inflected Latin queries are resolved to their headwords.
+    :param top_k: The number of closest keys to merge for fuzzy lookups, and of candidates to return.
+    :param base: Whether to also translate the base form of English queries.
+    :param spans: Whether to list every dictionary phrase found in English queries.
+    :param generator: A candidate generator, to also rank the Latin candidates of English queries.
+    :return: A dictionary with the query, its translations and the requested extras.
+    """
+
+    from .assignments import composition
+
+    translations = composition.translate(word=query, language=language, dictionary=dictionary, accent_insensitive=fold, inflected=inflected)
+    result: dict = {'query': query}
+
+    if translations is None and fuzzy is not None:
+        matches: list[tuple[str, int]] = fuzzy.lookup(query, top_k=top_k)
+        result['matches'] = [{'key': key, 'distance': distance} for key, distance in matches]
+        translations = composition.merge_translations(dictionary, language, [key for key, _ in matches])
+
+    if language == 'latin' and translations is not None:
+        if 'lemmas' in translations:
+            result['lemmas'] = list(translations['lemmas'])
+
+        translations = translations.get('english')
+
+    result['translations'] = list(translations) if translations is not None else None
+
+    if base and language == 'english':
+        base_translations = composition.translate(word=query, language='english', dictionary=dictionary, use_base=True)
+        result['base_translations'] = list(base_translations) if base_translations is not None else None
+
+    if spans and language == 'english':
+        tokens: list[str] = phrase_matcher.tokenize(query)
+        result['spans'] = [
+            {'start': start, 'end': end, 'phrase': ' '.join(tokens[start:end]), 'translations': list(latin_words)}
+            for (start, end), latin_words in matcher.candidates(tokens).items()
+        ]
+
+    if generator is not None and language == 'english':
+        result['candidates'] = generator.generate(query, top_k)
+
+    return result
+
+
+def _string_list(request: dict, field: str) -> list[str]:
+    """
+    Get a field of a request that must be a list of strings.
+
+    :param request: The request.
+    :param field: The field name.
+    :return: The list.
+    """
+
+    value = request[field]
+
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise TypeError(f'Request field {field} must be a list of strings')
+
+    return value
+
+
+class DictionaryService:
+    """
+    Answer lookup and candidate requests from a dictionary kept in memory.
+
+    The phrase matcher, fuzzy matchers, lemmatizer and synonym table are built once, so every request after the first
+    costs only the lookups themselves.
+    """
+
+    def __init__(self, dictionary: Mapping, synonyms=None, fuzzy_distance: int = 0, base: bool = True) -> None:
+        """
+        Create a dictionary service.
+
+        :param dictionary: The Latin-English dictionary.
+        :param synonyms: A function returning the synonyms of a phrase, such as SynonymTable.get. Synonyms are not used
+            if None.
+        :param fuzzy_distance: The largest edit distance for fuzzy lookups, 0 to not build fuzzy matchers.
+        :param base: Whether to load the lemmatizer, for base forms.
+        """
+
+        self.dictionary: Mapping = dictionary
+        self.matcher: phrase_matcher.PhraseMatcher = phrase_matcher.PhraseMatcher(dictionary['english'])
+        self.fuzzy: dict[str, fuzzy_matcher.FuzzyMatcher] = fuzzy_matcher.build_fuzzy_matchers(dictionary, fuzzy_distance) if fuzzy_distance > 0 else {}
+        self.base: bool = base
+        self.requests: int = 0
+
+        lemmatize = None
+        if base:
+            from . import lemmatizer
+
+            lemmatize = lemmatizer.get_lemmatizer().lemmatize
+
+            # Load the POS tagger now rather than on the first request
+            lemmatize(['warming', 'up'])
+
+        self.lemmatize = lemmatize
+        self.synonyms = synonyms
+        self.generator: candidate_generator.CandidateGenerator = candidate_generator.CandidateGenerator(dictionary, self.matcher, lemmatize, synonyms, self.fuzzy.get('english'))
+        self._lookup_generators: dict[tuple[bool, bool, bool], candidate_generator.CandidateGenerator] = {}
+
+    def lookup_generator(self, base: bool, synonyms: bool, fuzzy: bool) -> candidate_generator.CandidateGenerator:
+        """
+        Get the candidate generator for lookups with the given options, so that served lookups rank candidates like
+        minerva-cli lookup does with the same options.
+
+        :param base: Whether to use base forms, if the lemmatizer is loaded.
+        :param synonyms: Whether to use synonyms, if the service has a synonym table.
+        :param fuzzy: Whether to use close matches, if the service has fuzzy matchers.
+        :return: A candidate generator sharing the service's matchers, built on first use.
+        """
+
+        options: tuple[bool, bool, bool] = (base and self.lemmatize is not None, synonyms and self.synonyms is not None, fuzzy and 'english' in self.fuzzy)
+        generator: candidate_generator.CandidateGenerator | None = self._lookup_generators.get(options)
+
+        if generator is None:
+            lemmatize = self.lemmatize if options[0] else None
+            synonym_lookup = self.synonyms if options[1] else None
+            english_fuzzy: fuzzy_matcher.FuzzyMatcher | None = self.fuzzy['english'] if options[2] else None
+
+            generator = self._lookup_generators[options] = candidate_generator.CandidateGenerator(self.dictionary, self.matcher, lemmatize, synonym_lookup, english_fuzzy)
+
+        return generator
+
+    def handle(self, request: dict) -> dict:
+        """
+        Answer a request.
+
+        Requests are dictionaries with an 'op' of:
+        - 'ping', answered with the number of English keys.
+        - 'lookup', with 'queries' and the options of lookup_result as keys, answered with one result per query.
+          Candidates use base forms, synonyms and close matches only when 'base', 'synonyms' and 'fuzzy' are set.
+          Asking for base forms from a service started without the lemmatizer is an error.
+        - 'candidates', with 'sentences' and an optional 'top_k', answered with the ranked Latin candidates of each
+          sentence.
+        - 'stats', answered with the instrumentation summary.
+
+        :param request: The request.
+        :return: The response, with 'results' for lookups and candidates.
+        """
+
+        self.requests += 1
+
+        match request.get('op'):
+            case 'ping':
+                return {'entries': len(self.dictionary['english']), 'requests': self.requests}
+            case 'lookup':
+                language: str = request.get('language', 'english')
+
+                if language not in ('english', 'latin'):
+                    raise ValueError(f'Unsupported language: {language}')
+
+                if request.get('base') and self.lemmatize is None:
+                    raise ValueError('Base forms are not loaded')
+
+                fuzzy: fuzzy_matcher.FuzzyMatcher | None = self.fuzzy.get(language) if request.get('fuzzy') else None
+                generator = None
+                if request.get('candidates'):
+                    generator = self.lookup_generator(bool(request.get('base')), bool(request.get('synonyms')), bool(request.get('fuzzy')))
+
+                options: dict = {
+                    'fold': bool(request.get('fold')),
+                    'inflected': bool(request.get('inflected')),
+                    'top_k': int(request.get('top_k', 5)),
+                    'base': bool(request.get('base')),
+                    'spans': bool(request.get('spans')),
+                }
+
+                return {'results': [lookup_result(query, language, self.dictionary, self.matcher, fuzzy, generator=generator, **options) for query in _string_list(request, 'queries')]}
+            case 'candidates':
+                top_k: int | None = request.get('top_k')
+
+                return {'results': self.generator.generate_all(_string_list(request, 'sentences'), top_k)}
+            case 'stats':
+                return {'requests': self.requests, 'instrumentation': instrumentation.summary()}
+            case op:
+                raise ValueError(f'Unsupported request: {op}')
+
+
+async def _handle_connection(service: DictionaryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Answer the requests of one client, one JSON line each, until it disconnects.
+    """
+
+    try:
+        while line := await reader.readline():
+            request = None
+
+            try:
+                request = json.loads(line)
+                response: dict = service.handle(request)
+            except KeyError as e:
+                response = {'error': f'Missing request field: {e}'}
+            except (ValueError, TypeError, AttributeError) as e:
+                response = {'error': str(e)}
+
+            if isinstance(request, dict) and 'id' in request:
+                response['id'] = request['id']
+
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        # The client went away, or sent a line longer than MESSAGE_LIMIT
+        pass
+    except asyncio.CancelledError:
+        # The service is shutting down with the client still connected
+        pass
+    finally:
+        writer.close()
+
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def _socket_in_use(socket_path: str) -> bool:
+    """
+    Check whether a server is already listening on a Unix socket.
+
+    :param socket_path: The socket path.
+    :return: True if a connection succeeds.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+
+    return True
+
+
+async def _serve(service: DictionaryService, socket_path: str) -> None:
+    """
+    Serve requests on a Unix socket until the task is cancelled or SIGTERM is received.
+    """
+
+    import signal
+
+    if os.path.exists(socket_path):
+        if _socket_in_use(socket_path):
+            raise RuntimeError(f'Dictionary service already running on {socket_path}')
+
+        os.unlink(socket_path)
+
+    server = await asyncio.start_unix_server(functools.partial(_handle_connection, service), path=socket_path, limit=MESSAGE_LIMIT)
+
+    try:
+        os.chmod(socket_path, 0o600)
+
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+        except (ValueError, RuntimeError):
+            # Signals can only be handled on the main thread, elsewhere the service stops when its task is cancelled
+            pass
+
+        print(f'Serving dictionary on {socket_path}')
+
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def serve(service: DictionaryService, socket_path: str) -> None:
+    """
+    Run the dictionary service on a Unix socket until interrupted.
+
+    Requests are answered in order on each connection, and connections are served concurrently by one event loop.
+    Lookups are fast enough to answer inline, so no request waits on a thread or process pool.
+
+    :param service: The dictionary service.
+    :param socket_path: The path of the Unix socket, replaced if a stale one is left over.
+    :return: None
+    """
+
+    try:
+        asyncio.run(_serve(service, socket_path))
+    except KeyboardInterrupt:
+        pass
+
+    print(f'Dictionary service stopped after {service.requests} requests')
+
+
+class DictionaryClient:
+    """
+    A blocking client for the dictionary service, for short-lived commands that should not load the dictionary.
+    """
+
+    def __init__(self, socket_path: str, timeout: float | None = 60.0) -> None:
+        """
+        Connect to the dictionary service.
+
+        :param socket_path: The path of the service's Unix socket.
+        :param timeout: The number of seconds to wait for a response, forever if None.
+        """
+
+        self._socket: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+
+        try:
+            self._socket.connect(socket_path)
+        except OSError:
+            self._socket.close()
+            raise
+
+        self._file = self._socket.makefile('rwb')
+
+    def request(self, request: dict) -> dict:
+        """
+        Send a request and wait for its response.
+
+        :param request: The request, see DictionaryService.handle.
+        :return: The response.
+        """
+
+        self._file.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+
+        line: bytes = self._file.readline()
+
+        if not line:
+            raise ConnectionError('Dictionary service closed the connection')
+
+        response: dict = json.loads(line)
+
+        if 'error' in response:
+            raise ValueError(response['error'])
+
+        return response
+
+    def lookup(self, queries: Iterable[str], language: str = 'english', **options) -> list[dict]:
+        """
+        Look up words or phrases.
+
+        :param queries: The words or phrases.
+        :param language: The language of the queries, 'english' or 'latin'.
+        :param options: The options of lookup_result: fold, inflected, fuzzy, top_k, base, spans and candidates, and
+            synonyms for candidates.
+        :return: One lookup_result per query, in order.
+        """
+
+        return self.request({'op': 'lookup', 'queries': list(queries), 'language': language, **options})['results']
+
+    def candidates(self, sentences: Iterable[str], top_k: int | None = None) -> list[list[str]]:
+        """
+        Get the ranked Latin candidates of English sentences.
+
+        :param sentences: The English sentences.
+        :param top_k: The maximum number of candidates per sentence, every candidate if None.
+        :return: One candidate list per sentence, in order.
+        """
+
+        return self.request({'op': 'candidates', 'sentences': list(sentences), 'top_k': top_k})['results']
+
+    def close(self) -> None:
+        """
+        Close the connection.
+
+        :return: None
+        """
+
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> 'DictionaryClient':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,256 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Mapping
+
+from . import dictionary_manager
+from . import instrumentation
+
+
+def _pattern(word: str) -> dict[str, int]:
+    """
+    Get the bitmask of the positions of each character of a word.
+
+    :param word: The word.
+    :return: A dictionary of character to bitmask.
+    """
+
+    masks: dict[str, int] = {}
+
+    for position, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | (1 << position)
+
+    return masks
+
+
+def _distance(pattern: dict[str, int], length: int, text: str, max_distance: int) -> int:
+    """
+    Compute the optimal string alignment distance with Myers' bit-parallel algorithm, extended with Hyyrö's
+    transposition step, one text character at a time.
+
+    :param pattern: The masks of the first string, from _pattern.
+    :param length: The length of the first string.
+    :param text: The second string.
+    :param max_distance: The largest distance of interest.
+    :return: The distance, or max_distance + 1 if it is larger than max_distance.
+    """
+
+    if abs(length - len(text)) > max_distance:
+        return max_distance + 1
+
+    if length == 0:
+        return len(text)
+
+    full: int = (1 << length) - 1
+    last: int = 1 << (length - 1)
+
+    vp: int = full
+    vn: int = 0
+    d0: int = 0
+    previous_match: int = 0
+    score: int = length
+
+    for char in text:
+        match: int = pattern.get(char, 0)
+        transposition: int = ((~d0 & match) << 1) & previous_match
+
+        d0 = ((((match & vp) + vp) ^ vp) | match | vn | transposition) & full
+        hp: int = (vn | ~(d0 | vp)) & full
+        hn: int = d0 & vp
+
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        vp = (hn | ~(d0 | hp)) & full
+        vn = d0 & hp
+        previous_match = match
+
+    return score if score <= max_distance else max_distance + 1
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Get the optimal string alignment distance between two strings: insertions, deletions, substitutions and swaps of
+    adjacent characters each cost one.
+
+    :param a: The first string.
+    :param b: The second string.
+    :param max_distance: The largest distance of interest.
+    :return: The distance, or max_distance + 1 if it is larger than max_distance.
+    """
+
+    return _distance(_pattern(a), len(a), b, max_distance)
+
+
+def _deletes(word: str, max_distance: int) -> set[str]:
+    """
+    Get every string obtained by deleting up to max_distance characters from a word, including the word itself.
+
+    :param word: The word.
+    :param max_distance: The largest number of deletions.
+    :return: The deletes.
+    """
+
+    deletes: set[str] = {word}
+    edge: set[str] = {word}
+
+    for _ in range(max_distance):
+        edge = {candidate[:i] + candidate[i + 1:] for candidate in edge for i in range(len(candidate))}
+        deletes |= edge
+
+    return deletes
+
+
+class FuzzyMatcher:
+    """
+    A SymSpell deletion index over the keys of a dictionary map, for lookups that tolerate typos.
+
+    Every key is indexed under each string obtained by deleting up to max_distance characters from its first
+    prefix_length characters. A query then only has to generate its own deletes and check the keys sharing one with an
+    exact edit distance, instead of comparing itself with every key.
+
+    Keys starting with the leading word, the "to " of English verbs, are indexed from the character after it: otherwise
+    it would take up most of their prefix, and every verb would share the few deletes left with thousands of others.
+    Each delete lists its keys by length, so that a query only checks the keys it could be within max_distance of.
+    """
+
+    def __init__(self, keys: Iterable[str], max_distance: int = 2, prefix_length: int = 7, normalize: Callable[[str], str] = str.lower, leading: str = 'to ') -> None:
+        """
+        Build a fuzzy matcher.
+
+        :param keys: The keys to match against, such as dictionary['english'].
+        :param max_distance: The largest edit distance that lookups can use.
+        :param prefix_length: The number of leading characters indexed; longer keys are only told apart by distance
+            checks, which keeps the index small.
+        :param normalize: The function applied to keys and queries before comparing them, such as
+            dictionary_manager.fold for Latin.
+        :param leading: The normalized word that keys are indexed past, '' to index every key from its start.
+        """
+
+        self.max_distance: int = max_distance
+        self.prefix_length: int = prefix_length
+        self.normalize: Callable[[str], str] = normalize
+        self.leading: str = leading
+
+        self._keys: dict[str, list[str]] = {}
+        self._positions: dict[str, int] = {}
+        self._deletes: dict[str, list[str]] = {}
+
+        for key in keys:
+            normalized: str = normalize(key)
+
+            if normalized in self._keys:
+                self._keys[normalized].append(key)
+                continue
+
+            self._keys[normalized] = [key]
+            self._positions[normalized] = len(self._positions)
+
+            indexed: str = normalized[len(leading):] if leading and normalized.startswith(leading) else normalized
+
+            for delete in _deletes(indexed[:prefix_length], max_distance):
+                self._deletes.setdefault(delete, []).append(normalized)
+
+        for bucket in self._deletes.values():
+            bucket.sort(key=len)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @instrumentation.timed('fuzzy lookup')
+    def lookup(self, word: str, max_distance: int | None = None, top_k: int = 5) -> list[tuple[str, int]]:
+        """
+        Find the keys closest to a word.
+
+        :param word: The word or phrase to look up.
+        :param max_distance: The largest edit distance to accept, at most the one the index was built with.
+        :param top_k: The maximum number of keys to return.
+        :return: Up to top_k (key, distance) pairs, closest first, keys at the same distance in index order.
+        """
+
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        normalized: str = self.normalize(word)
+        matches: dict[str, int] = {}
+        checked: set[str] = set()
+
+        if normalized in self._keys:
+            matches[normalized] = 0
+            checked.add(normalized)
+
+        pattern: dict[str, int] = _pattern(normalized)
+        characters: set[str] = set(normalized)
+        shortest: int = len(normalized) - max_distance
+        longest: int = len(normalized) + max_distance
+
+        # A key within max_distance of the word shares at least one delete of its indexed prefix with it
+        for delete in self._probes(normalized, max_distance):
+            bucket: list[str] | None = self._deletes.get(delete)
+
+            if bucket is None:
+                continue
+
+            for position in range(bisect_left(bucket, shortest, key=len), bisect_right(bucket, longest, key=len)):
+                candidate: str = bucket[position]
+
+                if candidate in checked:
+                    continue
+
+                checked.add(candidate)
+
+                # Each edit adds or removes at most two distinct characters, which rules most candidates out cheaply
+                if len(characters.symmetric_difference(candidate)) > 2 * max_distance:
+                    continue
+
+                distance: int = _distance(pattern, len(normalized), candidate, max_distance)
+
+                if distance <= max_distance:
+                    matches[candidate] = distance
+
+        ranked: list[str] = sorted(matches, key=lambda key: (matches[key], self._positions[key]))
+
+        return [(key, matches[normalized_key]) for normalized_key in ranked for key in self._keys[normalized_key]][:top_k]
+
+    def _probes(self, word: str, max_distance: int) -> set[str]:
+        """
+        Get the deletes to look a normalized word up under.
+
+        Besides the deletes of its own prefix, for keys indexed from their start, the word is split after every head
+        within max_distance of the leading word, for keys indexed past it. The rest of the word only needs the edits
+        the head leaves over, plus one for a swap across the split.
+
+        :param word: The normalized word.
+        :param max_distance: The largest edit distance of the lookup.
+        :return: The deletes.
+        """
+
+        probes: set[str] = _deletes(word[:self.prefix_length], max_distance)
+
+        if not self.leading:
+            return probes
+
+        for split in range(max(len(self.leading) - max_distance, 0), min(len(self.leading) + max_distance, len(word)) + 1):
+            head_distance: int = edit_distance(word[:split], self.leading, max_distance)
+
+            if head_distance <= max_distance:
+                probes |= _deletes(word[split:split + self.prefix_length], min(max_distance - head_distance + 1, max_distance))
+
+        return probes
+
+
+def build_fuzzy_matchers(dictionary: Mapping, max_distance: int = 2) -> dict[str, FuzzyMatcher]:
+    """
+    Build fuzzy matchers over both directions of a dictionary.
+
+    English keys are matched case-insensitively and Latin keys ignoring diacritics, case and i/j, u/v spelling.
+
+    :param dictionary: The Latin-English dictionary.
+    :param max_distance: The largest edit distance that lookups can use.
+    :return: A dictionary with 'english' and 'latin' matchers.
+    """
+
+    return {
+        'english': FuzzyMatcher(dictionary['english'], max_distance),
+        'latin': FuzzyMatcher(dictionary['latin'], max_distance, normalize=dictionary_manager.fold),
+    }
@@ -0,0 +1,453 @@
+import unicodedata
+
+
+# The source files only guarantee 'word' and 'definitions', so morphology is read from whichever of these fields an
+# entry has, at the top level or inside a nested 'morphology' object.
+_POS_KEYS: tuple[str, ...] = ('part_of_speech', 'partOfSpeech', 'pos', 'type')
+_PARTS_KEYS: tuple[str, ...] = ('principal_parts', 'principalParts', 'parts')
+_CLASS_KEYS: tuple[str, ...] = ('declension', 'conjugation')
+_GENDER_KEYS: tuple[str, ...] = ('gender',)
+_FORMS_KEYS: tuple[str, ...] = ('forms', 'inflections')
+
+_NOUN_ENDINGS: dict[str, str] = {
+    '1': 'a ae am arum is as',
+    '2': 'i o um e orum os is',
+    '2n': 'i o um a orum is',
+    '3': 'is i em e es um ibus',
+    '3n': 'is i e a um ibus',
+    '4': 'us ui um u uum ibus',
+    '4n': 'us ui u ua uum ibus',
+    '5': 'es ei em e erum ebus',
+}
+_GENITIVE_ENDINGS: tuple[tuple[str, str], ...] = (('ae', '1'), ('ei', '5'), ('is', '3'), ('us', '4'), ('i', '2'))
+
+_FIRST_SECOND: str = 'us a um i ae o am orum arum os as is e'
+_THIRD: str = 'is i em e es ia ium ibus'
+_COMPARATIVE: str = 'ior ius ioris iori iorem iore iores iora iorum ioribus'
+
+# Per conjugation: the imperfect, present subjunctive and participle themes, the imperative, the present and future
+# endings and the passive infinitive.
+_CONJUGATIONS: dict[str, dict[str, str]] = {
+    '1': {
+        'imperfect': 'aba', 'subjunctive': 'e', 'imperative': 'a ate', 'participle': 'a',
+        'active': 'o as at amus atis ant', 'passive': 'or aris atur amur amini antur',
+        'future_active': 'abo abis abit abimus abitis abunt', 'future_passive': 'abor aberis abitur abimur abimini abuntur',
+        'passive_infinitive': 'ari',
+    },
+    '2': {
+        'imperfect': 'eba', 'subjunctive': 'ea', 'imperative': 'e ete', 'participle': 'e',
+        'active': 'eo es et emus etis ent', 'passive': 'eor eris etur emur emini entur',
+        'future_active': 'ebo ebis ebit ebimus ebitis ebunt', 'future_passive': 'ebor eberis ebitur ebimur ebimini ebuntur',
+        'passive_infinitive': 'eri',
+    },
+    '3': {
+        'imperfect': 'eba', 'subjunctive': 'a', 'imperative': 'e ite', 'participle': 'e',
+        'active': 'o is it imus itis unt', 'passive': 'or eris itur imur imini untur',
+        'future_active': 'am es et emus etis ent', 'future_passive': 'ar eris etur emur emini entur',
+        'passive_infinitive': 'i',
+    },
+    '3io': {
+        'imperfect': 'ieba', 'subjunctive': 'ia', 'imperative': 'e ite', 'participle': 'ie',
+        'active': 'io is it imus itis iunt', 'passive': 'ior eris itur imur imini iuntur',
+        'future_active': 'iam ies iet iemus ietis ient', 'future_passive': 'iar ieris ietur iemur iemini ientur',
+        'passive_infinitive': 'i',
+    },
+    '4': {
+        'imperfect': 'ieba', 'subjunctive': 'ia', 'imperative': 'i ite', 'participle': 'ie',
+        'active': 'io is it imus itis iunt', 'passive': 'ior iris itur imur imini iuntur',
+        'future_active': 'iam ies iet iemus ietis ient', 'future_passive': 'iar ieris ietur iemur iemini ientur',
+        'passive_infinitive': 'iri',
+    },
+}
+_ACTIVE_PERSONS: str = 'm s t mus tis nt'
+_PASSIVE_PERSONS: str = 'r ris tur mur mini ntur'
+_PERFECT: str = 'i isti it imus istis erunt ere isse eram eras erat eramus eratis erant ero eris erit erimus eritis erint erim issem isses isset issemus issetis issent'
+
+_SUM: str = 'sum es est sumus estis sunt eram eras erat eramus eratis erant ero eris erit erimus eritis erunt sim sis sit simus sitis sint essem esses esset essemus essetis essent este esse'
+_SUM_PERFECT: str = 'fui fuisti fuit fuimus fuistis fuerunt fuere fuisse fueram fueras fuerat fueramus fueratis fuerant fuero fueris fuerit fuerimus fueritis fuerint fuerim fuissem fuisses fuisset fuissemus fuissetis fuissent futurus futura futurum fore'
+
+# Compounds of sum, with the prefix used before forms of sum starting with s, before those starting with e, and before
+# the perfect. Possum drops the f of the perfect and has no future participle or future infinitive.
+_SUM_COMPOUNDS: dict[str, tuple[str, str, str]] = {
+    **{prefix: (prefix, prefix, prefix) for prefix in ('ab', 'ad', 'de', 'in', 'inter', 'ob', 'prae', 'sub', 'super', '')},
+    'pos': ('pos', 'pot', 'pot'),
+    'pro': ('pro', 'prod', 'pro'),
+}
+
+# Endings stripped from the headword to complete abbreviated principal parts such as 'puella, -ae' or 'amo, -are'
+_ABBREVIATION_ENDINGS: tuple[str, ...] = ('eo', 'io', 'or', 'us', 'um', 'er', 'en', 'es', 'is', 'ex', 'ix', 'a', 'o', 'e', 'x', 's')
+
+
+def _plain(text: str) -> str:
+    """
+    Lowercase a Latin word and remove its diacritics so that endings can be matched.
+
+    :param text: The word.
+    :return: The plain word.
+    """
+
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char)).lower().strip()
+
+
+def _field(data: dict, keys: tuple[str, ...]):
+    """
+    Get the first of several fields present in an entry or its nested 'morphology' object.
+
+    :param data: The JSON contents of a dictionary file.
+    :param keys: The field names to try, in order.
+    :return: The field value, or None if none of them is present.
+    """
+
+    for source in (data, data.get('morphology')):
+        if not isinstance(source, dict):
+            continue
+
+        for key in keys:
+            if source.get(key) not in (None, '', [], {}):
+                return source[key]
+
+    return None
+
+
+def _strings(value) -> list[str]:
+    """
+    Flatten a field holding a string, a list or a mapping of strings into a list of strings.
+
+    :param value: The field value.
+    :return: The strings it holds.
+    """
+
+    if isinstance(value, str):
+        return [value]
+
+    if isinstance(value, dict):
+        value = list(value.values())
+
+    if isinstance(value, (list, tuple)):
+        return [string for item in value for string in _strings(item)]
+
+    return []
+
+
+def read_morphology(data: dict) -> dict | None:
+    """
+    Read the morphology of a dictionary entry.
+
+    Entries are only required to have a word and definitions, so every field is optional and read tolerantly: the part
+    of speech from 'part_of_speech', 'pos' or 'type', the principal parts from 'principal_parts' or 'parts' (a list or a
+    comma-separated string, abbreviations such as '-ae' allowed), the 'declension' or 'conjugation' number, the
+    'gender', and any explicitly listed 'forms' or 'inflections'. Each can also be nested in a 'morphology' object.
+
+    :param data: The JSON contents of a dictionary file.
+    :return: A dictionary of the fields found, or None if the entry has no morphology.
+    """
+
+    morphology: dict = {}
+
+    pos = _field(data, _POS_KEYS)
+    if isinstance(pos, str):
+        morphology['pos'] = pos.lower()
+
+    parts = _field(data, _PARTS_KEYS)
+    if isinstance(parts, str):
+        parts = parts.split(',')
+    parts = [part.strip() for part in _strings(parts) if part.strip() != '']
+    if len(parts) != 0:
+        morphology['parts'] = parts
+
+    inflection_class = _field(data, _CLASS_KEYS)
+    if isinstance(inflection_class, (int, str)):
+        morphology['class'] = str(inflection_class).lower()
+
+    gender = _field(data, _GENDER_KEYS)
+    if isinstance(gender, str):
+        morphology['gender'] = gender.lower()
+
+    forms = [form for form in _strings(_field(data, _FORMS_KEYS)) if form.strip() != '']
+    if len(forms) != 0:
+        morphology['forms'] = forms
+
+    return morphology or None
+
+
+def _complete(headword: str, part: str) -> str:
+    """
+    Complete an abbreviated principal part, such as the '-ae' of 'puella, -ae', from the headword.
+
+    :param headword: The plain headword.
+    :param part: The plain principal part.
+    :return: The full principal part.
+    """
+
+    if not part.startswith('-'):
+        return part
+
+    # Headwords in -er keep the e before a vowel (puer, -i) and drop it before the consonants the part repeats
+    # (magister, -tri), while a part starting with e replaces it (celer, -eris)
+    if headword.endswith('er') and len(part) > 1:
+        body: str = part[1:]
+
+        if body[0] == 'e':
+            return headword[:-2] + body
+
+        if body[0] in 'aiou':
+            return headword + body
+
+        if 'r' in body and headword[:-2].endswith(body[:body.index('r')]):
+            return headword[:-2 - body.index('r')] + body
+
+    for ending in _ABBREVIATION_ENDINGS:
+        if headword.endswith(ending) and len(headword) > len(ending):
+            return headword[:-len(ending)] + part[1:]
+
+    return headword + part[1:]
+
+
+def _attach(stem: str, endings: str) -> list[str]:
+    return [stem + ending for ending in endings.split()]
+
+
+def _noun(parts: list[str], gender: str, declension: str) -> list[str]:
+    """
+    Generate the forms of a regular noun.
+
+    :param parts: The nominative and, if known, genitive singular.
+    :param gender: The gender, '' if unknown.
+    :param declension: The declension number, '' if unknown.
+    :return: The forms, or an empty list if the declension cannot be worked out.
+    """
+
+    nominative: str = parts[0]
+    stem: str | None = None
+
+    if len(parts) > 1:
+        for ending, genitive_declension in _GENITIVE_ENDINGS:
+            if parts[1].endswith(ending) and (declension in ('', genitive_declension)):
+                declension, stem = genitive_declension, parts[1][:-len(ending)]
+                break
+    elif declension in ('', '1') and nominative.endswith('a'):
+        declension, stem = '1', nominative[:-1]
+    elif declension in ('', '2') and nominative.endswith(('us', 'um')):
+        declension, stem = '2', nominative[:-2]
+
+    if stem is None or declension not in ('1', '2', '3', '4', '5'):
+        return []
+
+    neuter: bool = gender.startswith('n') or (declension == '2' and nominative.endswith('um')) or (declension == '4' and nominative.endswith('u'))
+    forms: list[str] = [nominative, *_attach(stem, _NOUN_ENDINGS[declension + 'n' if neuter and declension in ('2', '3', '4') else declension])]
+
+    if declension == '3' and (nominative.endswith(('is', 'es')) and nominative[:-2] == stem or neuter and nominative.endswith(('e', 'al', 'ar'))):
+        forms.extend(_attach(stem, 'ia ium' if neuter else 'ium'))
+
+    return forms
+
+
+def _adjective(parts: list[str]) -> list[str]:
+    """
+    Generate the forms of a regular adjective, with its comparative and superlative.
+
+    :param parts: The principal parts, such as 'bonus, bona, bonum', 'acer, acris, acre', 'fortis, forte' or
+        'felix, felicis'.
+    :return: The forms, or an empty list if the declension cannot be worked out.
+    """
+
+    nominative: str = parts[0]
+
+    if len(parts) == 3 and parts[1].endswith('a') and parts[2].endswith('um'):
+        stem: str = parts[1][:-1]
+        superlative: str = nominative + 'rimus' if nominative.endswith('er') else stem + 'issimus'
+        forms: list[str] = [nominative, *_attach(stem, _FIRST_SECOND)]
+    elif len(parts) == 1 and nominative.endswith('us'):
+        stem = nominative[:-2]
+        superlative = stem + 'issimus'
+        forms = _attach(stem, _FIRST_SECOND)
+    elif len(parts) > 1 and parts[1].endswith('is'):
+        stem = parts[1][:-2]
+        superlative = (nominative if nominative.endswith('er') else stem) + ('rimus' if nominative.endswith('er') else 'issimus')
+        forms = [*parts, *_attach(stem, _THIRD)]
+    elif len(parts) == 2 and nominative.endswith('is') and parts[1].endswith('e'):
+        stem = nominative[:-2]
+        superlative = stem + 'issimus'
+        forms = [*parts, *_attach(stem, _THIRD)]
+    else:
+        return []
+
+    return [*forms, *_attach(stem, _COMPARATIVE), *_attach(superlative[:-2], _FIRST_SECOND)]
+
+
+def _sum(present: str) -> list[str] | None:
+    """
+    Generate the forms of sum or one of its compounds.
+
+    :param present: The plain first person present.
+    :return: The forms, or None if the verb is not sum or a compound of it.
+    """
+
+    for before_s, before_e, before_perfect in _SUM_COMPOUNDS.values():
+        if present != before_s + 'sum':
+            continue
+
+        forms: list[str] = []
+
+        for form in _SUM.split():
+            if before_e == 'pot' and form == 'este':
+                continue
+            elif before_e == 'pot' and form.startswith('ess'):
+                forms.append('pos' + form[2:])
+            else:
+                forms.append((before_s if form.startswith('s') else before_e) + form)
+
+        for form in _SUM_PERFECT.split():
+            if before_perfect == 'pot':
+                if form.startswith('fu') and not form.startswith('futur'):
+                    forms.append('pot' + form[1:])
+            else:
+                forms.append(before_perfect + form)
+
+        return forms
+
+    return None
+
+
+def _verb(parts: list[str], conjugation: str, deponent: bool) -> list[str]:
+    """
+    Generate the forms of a regular verb.
+
+    :param parts: The principal parts: the first person present, the infinitive and, if known, the perfect and the
+        supine or perfect participle.
+    :param conjugation: The conjugation number, '' if unknown.
+    :param deponent: Whether the verb is deponent; inferred from its principal parts if they say so.
+    :return: The forms, or an empty list if the conjugation cannot be worked out.
+    """
+
+    present: str = parts[0]
+
+    sum_forms: list[str] | None = _sum(present)
+
+    if sum_forms is not None:
+        return sum_forms
+
+    if len(parts) < 2:
+        return []
+
+    infinitive: str = parts[1]
+    deponent = deponent or present.endswith('or')
+
+    # A third conjugation passive infinitive only adds -i to the stem, so queri is quer-i, not qu-eri like vereri
+    if deponent:
+        if infinitive.endswith('ari'):
+            infinitive = infinitive[:-3] + 'are'
+        elif infinitive.endswith('eri') and present.endswith('eor'):
+            infinitive = infinitive[:-3] + 'ere'
+        elif infinitive.endswith('iri') and present.endswith('ior'):
+            infinitive = infinitive[:-3] + 'ire'
+        elif infinitive.endswith('i'):
+            infinitive = infinitive[:-1] + 'ere'
+
+    stem: str = infinitive[:-3]
+
+    if infinitive.endswith('are'):
+        conjugation = '1'
+    elif infinitive.endswith('ire'):
+        conjugation = '4'
+    elif infinitive.endswith('ere'):
+        if conjugation not in ('2', '3', '3io'):
+            conjugation = '2' if present.endswith(('eo', 'eor')) else '3io' if present.endswith(('io', 'ior')) else '3'
+    else:
+        return []
+
+    table: dict[str, str] = _CONJUGATIONS[conjugation]
+    forms: list[str] = [present, parts[1]]
+
+    # Present system
+    if not deponent:
+        forms.extend(_attach(stem, table['active']))
+        forms.extend(_attach(stem + table['imperfect'], _ACTIVE_PERSONS))
+        forms.extend(_attach(stem, table['future_active']))
+        forms.extend(_attach(stem + table['subjunctive'], _ACTIVE_PERSONS))
+        forms.extend(_attach(infinitive, _ACTIVE_PERSONS))
+        forms.extend(_attach(stem, table['imperative']))
+        forms.append(infinitive)
+
+    forms.extend(_attach(stem, table['passive']))
+    forms.extend(_attach(stem + table['imperfect'], _PASSIVE_PERSONS))
+    forms.extend(_attach(stem, table['future_passive']))
+    forms.extend(_attach(stem + table['subjunctive'], _PASSIVE_PERSONS))
+    forms.extend(_attach(infinitive, _PASSIVE_PERSONS))
+    forms.append(stem + table['passive_infinitive'])
+
+    # Present participle, gerund and gerundive
+    forms.extend(_attach(stem + table['participle'], 'ns'))
+    forms.extend(_attach(stem + table['participle'] + 'nt', _THIRD))
+    forms.extend(_attach(stem + table['participle'] + 'nd', _FIRST_SECOND))
+
+    # Perfect system and participles, from the remaining principal parts
+    for part in parts[2:]:
+        part = part.split(' ')[0]
+
+        if part.endswith('i') and not deponent:
+            forms.extend(_attach(part[:-1], _PERFECT))
+        elif part.endswith(('us', 'um')):
+            forms.extend(_attach(part[:-2], _FIRST_SECOND))
+            forms.extend(_attach(part[:-2] + 'ur', _FIRST_SECOND))
+            forms.extend(_attach(part[:-2], 'u'))
+
+    return forms
+
+
+def expand(latin_word: str, morphology: dict | None) -> list[str]:
+    """
+    Generate the inflected forms of a dictionary entry.
+
+    Regular declension and conjugation paradigms are generated from the entry's principal parts, with the part of
+    speech taken from the morphology or, failing that, guessed from the shape of the principal parts. Explicitly listed
+    forms are always included. Irregular words are only as complete as their listed forms.
+
+    :param latin_word: The Latin headword.
+    :param morphology: The morphology returned by read_morphology, or None.
+    :return: The forms, lowercased and without diacritics, headword first, without duplicates.
+    """
+
+    if morphology is None:
+        return []
+
+    headword: str = _plain(latin_word.split(',')[0])
+    parts: list[str] = [_complete(headword, _plain(part)) for part in morphology.get('parts', ())]
+    pos: str = morphology.get('pos', '')
+    inflection_class: str = ''.join(char for char in morphology.get('class', '') if char.isalnum())
+    inflection_class = {'first': '1', 'second': '2', 'third': '3', 'fourth': '4', 'fifth': '5'}.get(inflection_class, inflection_class)
+    inflection_class = inflection_class.removesuffix('st').removesuffix('nd').removesuffix('rd').removesuffix('th')
+
+    if inflection_class not in ('1', '2', '3', '3io', '4', '5'):
+        inflection_class = ''
+
+    if len(parts) == 0 or parts[0] != headword:
+        parts.insert(0, headword)
+
+    # A genitive in -i can look like a passive infinitive (pueri, queri), but only a verb's first principal part is
+    # a first person present in -o or -or
+    if pos == '':
+        present: bool = parts[0].endswith(('o', 'or'))
+
+        if len(parts) == 2 and not present and parts[1].endswith(tuple(ending for ending, _ in _GENITIVE_ENDINGS)):
+            pos = 'noun'
+        elif _sum(parts[0]) is not None or len(parts) > 1 and present and parts[1].endswith(('re', 'ri', 'i', 'sse')):
+            pos = 'verb'
+        elif len(parts) == 3:
+            pos = 'adjective'
+        elif len(parts) == 2:
+            pos = 'noun'
+
+    if pos.startswith('v'):
+        forms: list[str] = _verb(parts, inflection_class, 'dep' in pos)
+    elif pos.startswith('adj'):
+        forms = _adjective(parts)
+    elif pos.startswith('n') and not pos.startswith('num'):
+        forms = _noun(parts, morphology.get('gender', ''), inflection_class)
+    else:
+        forms = []
+
+    forms.extend(_plain(form) for form in morphology.get('forms', ()))
+
+    return list(dict.fromkeys([headword, *forms]))
+
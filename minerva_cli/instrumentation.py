@@ -0,0 +1,218 @@
+import sys
+import json
+import time
+import functools
+from collections.abc import Callable
+
+
+_enabled: bool = False
+_profiler = None
+_profile_path: str | None = None
+
+_stages: dict[str, list] = {}
+_counters: dict[str, int] = {}
+_caches: dict[str, object] = {}
+
+
+class _Stage:
+    """
+    A context manager adding the time taken by its body to a stage.
+    """
+
+    __slots__ = ('name', 'start_time')
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.start_time: float = 0.0
+
+    def __enter__(self) -> None:
+        self.start_time = time.perf_counter()
+
+    def __exit__(self, *args) -> None:
+        record(self.name, time.perf_counter() - self.start_time)
+
+
+class _NullStage:
+    """
+    A context manager that does nothing, used while instrumentation is off.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+_NULL_STAGE: _NullStage = _NullStage()
+
+
+def enable(profile_path: str | None = None) -> None:
+    """
+    Start recording stage timings, counters and cache hit rates.
+
+    :param profile_path: The path to dump cProfile statistics to when the report is written, no profile if None.
+    :return: None
+    """
+
+    global _enabled, _profiler, _profile_path
+
+    _enabled = True
+    _profile_path = profile_path
+
+    if profile_path is not None:
+        import cProfile
+
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def enabled() -> bool:
+    """
+    Check whether instrumentation is on.
+
+    :return: True if it is on.
+    """
+
+    return _enabled
+
+
+def record(name: str, elapsed: float) -> None:
+    """
+    Add one call to a stage.
+
+    :param name: The stage name.
+    :param elapsed: The time taken by the call, in seconds.
+    :return: None
+    """
+
+    totals: list | None = _stages.get(name)
+
+    if totals is None:
+        _stages[name] = [1, elapsed]
+    else:
+        totals[0] += 1
+        totals[1] += elapsed
+
+
+def stage(name: str) -> '_Stage | _NullStage':
+    """
+    Time a block as one call to a stage.
+
+    :param name: The stage name shown in the summary.
+    :return: A context manager timing its body, or doing nothing while instrumentation is off.
+    """
+
+    if not _enabled:
+        return _NULL_STAGE
+
+    return _Stage(name)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """
+    Time every call of a function as a stage.
+
+    While instrumentation is off, the wrapper only adds one flag check to each call.
+
+    :param name: The stage name shown in the summary.
+    :return: A decorator.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+
+            start_time: float = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start_time)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a counter.
+
+    :param name: The counter name.
+    :param amount: The amount to add.
+    :return: None
+    """
+
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def watch_cache(name: str, cache: object) -> None:
+    """
+    Include a cache's hit rate in the summary.
+
+    :param name: The cache name.
+    :param cache: An object with hits and misses attributes, such as a Lemmatizer, or a functools.lru_cache wrapped
+        function.
+    :return: None
+    """
+
+    _caches[name] = cache
+
+
+def _cache_stats(cache: object) -> dict:
+    """
+    Get the hit and miss counts of a watched cache.
+    """
+
+    if hasattr(cache, 'cache_info'):
+        info = cache.cache_info()
+        hits, misses = info.hits, info.misses
+    else:
+        hits, misses = cache.hits, cache.misses
+
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / (hits + misses) if hits + misses != 0 else None}
+
+
+def summary() -> dict:
+    """
+    Get the recorded stage timings, counters and cache hit rates.
+
+    :return: A dictionary with 'stages', 'counters' and 'caches'. Stages are listed by total time, each with its call
+        count, total seconds and mean milliseconds per call.
+    """
+
+    stages: dict = {
+        name: {'calls': calls, 'total_s': total, 'mean_ms': total * 1000 / calls}
+        for name, (calls, total) in sorted(_stages.items(), key=lambda item: item[1][1], reverse=True)
+    }
+
+    return {
+        'stages': stages,
+        'counters': dict(sorted(_counters.items())),
+        'caches': {name: _cache_stats(cache) for name, cache in sorted(_caches.items())},
+    }
+
+
+def report() -> None:
+    """
+    Print the summary to stderr as one JSON object, and dump the cProfile statistics if a profile was requested.
+
+    :return: None
+    """
+
+    global _profiler
+
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_profile_path)
+        _profiler = None
+
+        print(f'Profile written to {_profile_path}, read it with python -m pstats {_profile_path}', file=sys.stderr)
+
+    print(json.dumps({'instrumentation': summary()}, indent=4), file=sys.stderr)
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+from . import instrumentation
+
+
+class Lemmatizer:
+    """
+    Convert English words to their base forms.
+
+    One inflect engine is kept for the lifetime of the object, each sentence is POS-tagged in a single batch, and base
+    forms are kept in a bounded LRU cache so that a word seen before costs a dictionary hit instead of a tagger run. A
+    cached word keeps the base form from the first sentence it was tagged in.
+    """
+
+    def __init__(self, cache_size: int = 65536) -> None:
+        """
+        Create a lemmatizer.
+
+        :param cache_size: The maximum number of words to keep base forms for.
+        """
+
+        import inflect
+
+        self.cache_size: int = cache_size
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._engine = inflect.engine()
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def _base(self, word: str, word_type: str) -> str:
+        """
+        Convert a tagged word to its base form.
+
+        :param word: The word.
+        :param word_type: The Penn Treebank tag of the word.
+        :return: The base form, or the word itself if it has none.
+        """
+
+        import pyinflect
+
+        try:
+            if word_type.startswith("N"):
+                singular = self._engine.singular_noun(word)
+
+                if singular is not False:
+                    return singular
+            elif word_type.startswith("V"):
+                inflections = pyinflect.getInflection(word, 'VB')
+
+                if inflections:
+                    return inflections[0]
+        except Exception:
+            pass
+
+        return word
+
+    @instrumentation.timed('lemmatization')
+    def lemmatize(self, words: list[str]) -> list[str]:
+        """
+        Convert the words of a sentence to their base forms.
+
+        :param words: The words of the sentence, in order.
+        :return: The base form of each word.
+        """
+
+        base_words: list[str | None] = []
+        missing: bool = False
+
+        for word in words:
+            base_word: str | None = self._cache.get(word)
+
+            if base_word is None:
+                missing = True
+                self.misses += 1
+            else:
+                self._cache.move_to_end(word)
+                self.hits += 1
+
+            base_words.append(base_word)
+
+        if not missing:
+            return base_words
+
+        import nltk
+
+        tagged: bool = True
+
+        try:
+            with instrumentation.stage('pos tagging'):
+                tagged_words: list[tuple[str, str]] = nltk.pos_tag(words)
+        except Exception:
+            # Untagged base forms are only a fallback, so they are not cached in place of the tagged ones
+            tagged = False
+            tagged_words = [(word, '') for word in words]
+
+        for position, (word, word_type) in enumerate(tagged_words):
+            if base_words[position] is not None:
+                continue
+
+            base_word = self._base(word, word_type)
+            base_words[position] = base_word
+
+            if not tagged:
+                continue
+
+            self._cache[word] = base_word
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return base_words
+
+    def convert(self, text: str) -> str:
+        """
+        Convert every word of a space-separated text to its base form.
+
+        :param text: The text to convert.
+        :return: The converted text.
+        """
+
+        return ' '.join(self.lemmatize([word for word in text.split(' ') if word != '']))
+
+
+_lemmatizer: Lemmatizer | None = None
+
+
+def get_lemmatizer() -> Lemmatizer:
+    """
+    Get the shared lemmatizer, creating it on first use.
+
+    :return: The shared Lemmatizer.
+    """
+
+    global _lemmatizer
+
+    if _lemmatizer is None:
+        _lemmatizer = Lemmatizer()
+        instrumentation.watch_cache('lemmatizer', _lemmatizer)
+
+    return _lemmatizer
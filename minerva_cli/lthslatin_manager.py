@@ -1,18 +1,30 @@
 import time
 import selenium.webdriver
-from googletrans import Translator
 from selenium.webdriver.common.by import By
 
 
-def check_translation_delay() -> int | None:
+def check_translation_delay(translator=None) -> int | None:
     """
     Check the delay for the translation service.
 
+    :param translator: The translator to check, such as a translation_cache.CachedTranslator, a new googletrans
+        Translator if None. A cached translator is checked through its backend, since its cache would answer the probe
+        without reaching the service.
     :return: The delay for the translation service. None if broken.
     """
 
+    if translator is None:
+        from googletrans import Translator
+    else:
+        from . import translation_cache
+
+        if isinstance(translator, translation_cache.CachedTranslator):
+            translator = translator.backend
+
     try:
-        translator = Translator()
+        if translator is None:
+            translator = Translator()
+
         translater_delay = time.time()
         translator.translate('le tit', src='fr', dest='en')
         
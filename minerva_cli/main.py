@@ -1,25 +1,37 @@
-import os
-from dotenv import load_dotenv
+import sys
+
+from . import startup
+
+# The import hook goes in before anything else is imported, so that the startup report covers every import
+if '--startup-report' in sys.argv[1:]:
+    startup.enable()
 
+import os
 import glob
+import json
 import time
+import argparse
 import threading
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from colorama import Fore, Style, init
+import contextlib
+from dotenv import load_dotenv
+
+from . import dictionary_manager
+from . import instrumentation
 
-from . import driver
-from . import schoology_manager
-from . import lthslatin_manager
-from .assignments import composition
+# Selenium, requests, bs4 and the NLTK stack are imported where they are first used so that commands which only
+# touch the dictionary start quickly. Run with --startup-report to see what each command imports.
 
 
 def login_and_get_session(schoology_url, username, password):
+    from . import schoology_manager
+
     print('Logging in...')
     session = schoology_manager.login(url=schoology_url, username=username, password=password)
     return session
 
 def select_latin_course(session, schoology_url):
+    from . import schoology_manager
+
     print('Checking for Latin courses...')
     courses = schoology_manager.get_courses(session, schoology_url)
     sections = schoology_manager.find_latin_courses(courses)
@@ -38,6 +50,8 @@ def select_latin_course(session, schoology_url):
     return sections[choice]
 
 def spawn_webwindow_and_login(session, schoology_url):
+    from . import driver
+
     print('Spawning web window...')
     webwindow = driver.get_driver('Chrome')
     
@@ -58,6 +72,8 @@ def spawn_webwindow_and_login(session, schoology_url):
     return webwindow
 
 def find_lths_latin_app(session, course_url, schoology_url):
+    from bs4 import BeautifulSoup
+
     print('Loading course page...')
 
     try:
@@ -88,6 +104,8 @@ def load_lths_latin_app(webwindow, schoology_app_url, lths_latin_url):
     return True
 
 def print_colored_square_ascii():
+    from colorama import Fore, Style, init
+
     init(autoreset=True)
     # Define color blocks
     O = Fore.YELLOW + "■" + Style.RESET_ALL  # Orange (use yellow as closest)
@@ -99,6 +117,8 @@ def print_colored_square_ascii():
     print(f"{B} {P}")
 
 def mode_watcher(webwindow, user):
+    from . import lthslatin_manager
+
     global mode, assignment
 
     mode = None
@@ -108,8 +128,183 @@ def mode_watcher(webwindow, user):
         mode, assignment = lthslatin_manager.find_mode(webwindow, mode, ['composition'], user)
         time.sleep(1)
 
-def main():
-    load_dotenv()
+def composition_dictionary_paths(data_dir, cache_dir):
+    composition_dictionary_files: list[str] = glob.glob(os.path.join(data_dir, 'dictionary', '*.json'))
+    composition_dictionary_index: str = os.path.join(cache_dir or data_dir, 'dictionary.idx')
+
+    return composition_dictionary_files, composition_dictionary_index
+
+def load_composition_dictionary(data_dir, cache_dir, dictionary_workers):
+    composition_dictionary_files, composition_dictionary_index = composition_dictionary_paths(data_dir, cache_dir)
+
+    with startup.stage('dictionary load'):
+        return dictionary_manager.load_dictionary(composition_dictionary_files, composition_dictionary_index, dictionary_workers)
+
+def compile_command(args):
+    data_dir = os.getenv('DATA_DIR')
+    cache_dir = os.getenv('CACHE_DIR')
+    dictionary_workers = int(os.getenv('DICTIONARY_WORKERS') or 1)
+
+    composition_dictionary_files, composition_dictionary_index = composition_dictionary_paths(data_dir, cache_dir)
+
+    with startup.stage('dictionary compile'):
+        dictionary_manager.compile_dictionary(composition_dictionary_files, composition_dictionary_index, dictionary_workers)
+
+def read_queries(args):
+    if args.queries:
+        yield from args.queries
+        return
+
+    if args.file:
+        with open(args.file, mode='r', encoding='utf-8') as file:
+            yield from (line.strip() for line in file if line.strip() != '')
+        return
+
+    yield from (line.strip() for line in sys.stdin if line.strip() != '')
+
+def service_socket_path(data_dir, cache_dir):
+    return os.getenv('SERVICE_SOCKET') or os.path.join(cache_dir or data_dir, 'minerva.sock')
+
+def lookup_command(args):
+    from . import dictionary_service
+
+    data_dir = os.getenv('DATA_DIR')
+    cache_dir = os.getenv('CACHE_DIR')
+    dictionary_workers = int(os.getenv('DICTIONARY_WORKERS') or 1)
+
+    interactive: bool = not args.queries and not args.file and sys.stdin.isatty()
+
+    if args.server:
+        options = {'fold': args.fold, 'inflected': args.inflected, 'fuzzy': args.fuzzy > 0, 'top_k': args.top_k, 'base': args.base, 'spans': args.spans, 'candidates': args.candidates, 'synonyms': args.synonyms}
+
+        with dictionary_service.DictionaryClient(service_socket_path(data_dir, cache_dir)) as client:
+            queries: list[str] = []
+            remaining: bool = True
+            query_iterator = read_queries(args)
+
+            # Queries are sent in batches, or one at a time when typed in
+            while remaining:
+                query = next(query_iterator, None)
+                remaining = query is not None
+
+                if remaining:
+                    queries.append(query)
+
+                if len(queries) != 0 and (not remaining or interactive or len(queries) == 256):
+                    for result in client.lookup(queries, args.language, **options):
+                        sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+                    sys.stdout.flush()
+                    queries = []
+
+        return
+
+    from . import phrase_matcher
+
+    # Progress messages go to stderr so that stdout is only JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        composition_dictionary = load_composition_dictionary(data_dir, cache_dir, dictionary_workers)
+
+        composition_matcher = None
+        if (args.spans or args.candidates) and args.language == 'english':
+            with startup.stage('phrase matcher build'):
+                composition_matcher = phrase_matcher.PhraseMatcher(composition_dictionary['english'])
+
+        composition_fuzzy = None
+        if args.fuzzy > 0:
+            from . import fuzzy_matcher
+
+            with startup.stage('fuzzy matcher build'):
+                normalize = dictionary_manager.fold if args.language == 'latin' else str.lower
+                composition_fuzzy = fuzzy_matcher.FuzzyMatcher(composition_dictionary[args.language], args.fuzzy, normalize=normalize)
+
+        composition_generator = None
+        if args.candidates and args.language == 'english':
+            from . import candidate_generator
+
+            # The same options as the dictionary service uses for a lookup request
+            composition_lemmatize = None
+            if args.base:
+                from . import lemmatizer
+
+                composition_lemmatize = lemmatizer.get_lemmatizer().lemmatize
+
+            composition_synonyms = None
+            if args.synonyms:
+                from . import synonym_manager
+
+                with startup.stage('synonym table load'):
+                    composition_synonyms = synonym_manager.load_synonym_table(composition_dictionary['english'], os.path.join(cache_dir or data_dir, 'synonyms.json')).get
+
+            composition_generator = candidate_generator.CandidateGenerator(composition_dictionary, composition_matcher, composition_lemmatize, composition_synonyms, composition_fuzzy)
+
+    for query in read_queries(args):
+        result: dict = dictionary_service.lookup_result(query, args.language, composition_dictionary, composition_matcher, composition_fuzzy, args.fold, args.inflected, args.top_k, args.base, args.spans, composition_generator)
+
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+        if interactive:
+            sys.stdout.flush()
+
+def batch_command(args):
+    from . import batch_translator
+
+    data_dir = os.getenv('DATA_DIR')
+    cache_dir = os.getenv('CACHE_DIR')
+    dictionary_workers = int(os.getenv('DICTIONARY_WORKERS') or 1)
+
+    composition_dictionary_files, composition_dictionary_index = composition_dictionary_paths(data_dir, cache_dir)
+    synonym_table_path = None
+
+    if args.synonyms:
+        synonym_table_path = os.path.join(cache_dir or data_dir, 'synonyms.json')
+
+    # Progress messages go to stderr so that stdout can hold the JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        # Bring the index up to date once, the batch translator then maps it and builds the synonym table from it
+        with startup.stage('dictionary load'):
+            dictionary_manager.load_dictionary(composition_dictionary_files, composition_dictionary_index, dictionary_workers).close()
+
+    input_file = sys.stdin if args.input == '-' else open(args.input, mode='r', encoding='utf-8')
+    output_file = sys.stdout if args.output is None else open(args.output, mode='w', encoding='utf-8')
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr), startup.stage('batch translation'):
+            batch_translator.translate_batch(batch_translator.read_sentences(input_file), output_file, composition_dictionary_index, args.workers, args.chunk_size, synonym_table_path, args.base, args.fuzzy, args.top_k)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+        if output_file is not sys.stdout:
+            output_file.close()
+
+def serve_command(args):
+    from . import dictionary_service
+
+    data_dir = os.getenv('DATA_DIR')
+    cache_dir = os.getenv('CACHE_DIR')
+    dictionary_workers = int(os.getenv('DICTIONARY_WORKERS') or 1)
+
+    composition_dictionary = load_composition_dictionary(data_dir, cache_dir, dictionary_workers)
+
+    composition_synonyms = None
+    if args.synonyms:
+        from . import synonym_manager
+
+        with startup.stage('synonym table load'):
+            composition_synonyms = synonym_manager.load_synonym_table(composition_dictionary['english'], os.path.join(cache_dir or data_dir, 'synonyms.json')).get
+
+    with startup.stage('service warm-up'):
+        service = dictionary_service.DictionaryService(composition_dictionary, composition_synonyms, args.fuzzy, not args.no_base)
+
+    dictionary_service.serve(service, args.socket or service_socket_path(data_dir, cache_dir))
+
+def run():
+    from . import schoology_manager
+    from . import lthslatin_manager
+    from . import phrase_matcher
+    from . import synonym_manager
+    from .assignments import composition
 
     username = os.getenv('MINERVA_USERNAME'),
     password = os.getenv('MINERVA_PASSWORD'),
@@ -117,14 +312,52 @@ def main():
     lths_latin_url = os.getenv('LTHSLATIN_URL')
     data_dir = os.getenv('DATA_DIR')
     cache_dir = os.getenv('CACHE_DIR')
+    dictionary_workers = int(os.getenv('DICTIONARY_WORKERS') or 1)
+    fuzzy_distance = int(os.getenv('FUZZY_DISTANCE') or 0)
+    candidate_limit = int(os.getenv('CANDIDATE_LIMIT') or 0) or None
+    translator_backend = os.getenv('TRANSLATOR_BACKEND')
+    translation_cache_ttl = float(os.getenv('TRANSLATION_CACHE_TTL') or 30 * 24 * 60 * 60) or None
+    translation_cache_size = int(os.getenv('TRANSLATION_CACHE_SIZE') or 100000) or None
 
-    print('Installing NLTK info')
-    composition.install_wordnet()
+    print('Checking NLTK info')
+    with startup.stage('nltk data check'):
+        composition.install_wordnet()
 
-    print('Installing NLTK info complete')
+    print('Checking NLTK info complete')
 
-    composition_dictionary_files: list[str] = glob.glob(os.path.join(data_dir, 'dictionary', '*.json'))
-    composition_dictionary = composition.generate_dictionary(composition_dictionary_files)
+    composition_dictionary = load_composition_dictionary(data_dir, cache_dir, dictionary_workers)
+
+    with startup.stage('phrase matcher build'):
+        composition_matcher = phrase_matcher.PhraseMatcher(composition_dictionary['english'])
+
+    with startup.stage('synonym table load'):
+        composition_synonyms = synonym_manager.load_synonym_table(composition_dictionary['english'], os.path.join(cache_dir or data_dir, 'synonyms.json'))
+
+    composition_fuzzy = None
+    if fuzzy_distance > 0:
+        from . import fuzzy_matcher
+
+        with startup.stage('fuzzy matcher build'):
+            composition_fuzzy = fuzzy_matcher.FuzzyMatcher(composition_dictionary['english'], fuzzy_distance)
+
+    composition_translator = None
+    if translator_backend:
+        from . import translation_cache
+
+        with startup.stage('translation cache open'):
+            composition_translator = translation_cache.open_translator(translator_backend, os.path.join(cache_dir or data_dir, 'translations.sqlite'), translation_cache_ttl, translation_cache_size)
+
+        translation_delay = lthslatin_manager.check_translation_delay(composition_translator)
+
+        if translation_delay is None:
+            print('Translation service unavailable, translation fallback disabled')
+
+            if isinstance(composition_translator, translation_cache.CachedTranslator):
+                composition_translator.close()
+
+            composition_translator = None
+        else:
+            print(f'Translation delay: {translation_delay} seconds')
 
     session = login_and_get_session(schoology_url, username, password)
     username, password = None, None # Clear from memory
@@ -174,7 +407,7 @@ def main():
         elif user_input == 'solve':
             if mode == 'composition':
                 print('Solving composition assignment...')
-                composition.solve(webwindow, False, None, composition_dictionary, True, cache_dir, human_mode)
+                composition.solve(webwindow, composition_translator is not None, composition_translator, composition_dictionary, True, cache_dir, human_mode, composition_matcher, composition_synonyms, composition_fuzzy, candidate_limit)
             else:
                 print('No assignment to solve or unsupported mode.')
         elif user_input == 'human':
@@ -184,7 +417,84 @@ def main():
                 print('Human mode enabled.')
             else:
                 print('Human mode disabled.')
-        
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='minerva-cli', description='A LTHS Latin Automation Tool')
+    parser.add_argument('--startup-report', action='store_true', help='print import and startup stage timings to stderr')
+    parser.add_argument('--instrument', action='store_true', help='print per-stage timings, counters and cache hit rates to stderr on exit')
+    parser.add_argument('--profile', metavar='PATH', help='also dump cProfile statistics to this file, implies --instrument')
+
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('run', help='log in and solve assignments interactively (default)')
+    subparsers.add_parser('compile', help='compile the dictionary index from DATA_DIR')
+
+    lookup_parser = subparsers.add_parser('lookup', help='translate words or phrases offline, one JSON line per query')
+    lookup_parser.add_argument('queries', nargs='*', help='words or phrases to translate, read from --file or stdin if omitted')
+    lookup_parser.add_argument('-l', '--language', choices=['english', 'latin'], default='english', help='the language of the queries')
+    lookup_parser.add_argument('-f', '--file', help='read queries from a file, one per line')
+    lookup_parser.add_argument('--fuzzy', type=int, default=0, metavar='DISTANCE', help='match queries with no exact translation to keys up to this edit distance away')
+    lookup_parser.add_argument('--top-k', type=int, default=5, help='the number of closest keys to merge for --fuzzy')
+    lookup_parser.add_argument('--inflected', action='store_true', help='resolve inflected Latin queries to their headwords')
+    lookup_parser.add_argument('--fold', action='store_true', help='match Latin queries ignoring macrons, case and i/j, u/v spelling')
+    lookup_parser.add_argument('--base', action='store_true', help='also translate the base form of English queries')
+    lookup_parser.add_argument('--spans', action='store_true', help='list every dictionary phrase found in English queries')
+    lookup_parser.add_argument('--candidates', action='store_true', help='rank the Latin candidates of English queries, up to --top-k')
+    lookup_parser.add_argument('--synonyms', action='store_true', help='also rank the translations of synonyms with --candidates, from the synonym table')
+    lookup_parser.add_argument('--server', action='store_true', help='send the queries to a running minerva-cli serve instead of loading the dictionary')
+
+    serve_parser = subparsers.add_parser('serve', help='keep the dictionary loaded and answer lookups over a Unix socket')
+    serve_parser.add_argument('--socket', help='the socket path, SERVICE_SOCKET or minerva.sock in CACHE_DIR by default')
+    serve_parser.add_argument('--synonyms', action='store_true', help='use the synonym table for candidate requests')
+    serve_parser.add_argument('--fuzzy', type=int, default=0, metavar='DISTANCE', help='build fuzzy matchers for lookups up to this edit distance')
+    serve_parser.add_argument('--no-base', action='store_true', help='do not load the lemmatizer, so base forms are not available')
+
+    batch_parser = subparsers.add_parser('batch', help='translate a text file of English sentences offline with a process pool, one JSON line per sentence')
+    batch_parser.add_argument('input', help='the text file to translate, one sentence per line, or - for stdin')
+    batch_parser.add_argument('-o', '--output', help='write JSON lines to this file instead of stdout')
+    batch_parser.add_argument('-j', '--workers', type=int, default=0, help='the number of worker processes, 0 for one per CPU')
+    batch_parser.add_argument('--chunk-size', type=int, default=256, help='the number of sentences sent to a worker at a time')
+    batch_parser.add_argument('--base', action='store_true', help='also translate the base forms of the words')
+    batch_parser.add_argument('--synonyms', action='store_true', help='also translate the synonyms of the words, from the synonym table')
+    batch_parser.add_argument('--fuzzy', type=int, default=0, metavar='DISTANCE', help='also translate the dictionary phrases up to this edit distance from misspelled words')
+    batch_parser.add_argument('--top-k', type=int, default=None, help='the maximum number of candidates per sentence')
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Only when main is called with its own arguments, after this module's imports
+    if args.startup_report and not startup.enabled():
+        startup.enable(partial=True)
+
+    load_dotenv()
+
+    profile_path = args.profile or os.getenv('PROFILE_OUTPUT') or None
+    instrument = args.instrument or os.getenv('INSTRUMENT', '').lower() in ('1', 'true', 'yes') or profile_path is not None
+
+    if instrument:
+        instrumentation.enable(profile_path)
+
+    try:
+        match args.command:
+            case 'compile':
+                compile_command(args)
+            case 'lookup':
+                lookup_command(args)
+            case 'batch':
+                batch_command(args)
+            case 'serve':
+                serve_command(args)
+            case _:
+                run()
+    finally:
+        if args.startup_report:
+            startup.report()
+
+        if instrument:
+            instrumentation.report()
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+
+from . import instrumentation
+
+
+@instrumentation.timed('tokenization')
+def tokenize(text: str) -> list[str]:
+    """
+    Split English text into the tokens used for phrase matching.
+
+    This applies the same normalization composition.solve uses for prompts: lowercase, with commas and periods removed.
+
+    :param text: The text to tokenize.
+    :return: A list of tokens.
+    """
+
+    return text.lower().replace(',', '').replace('.', '').split()
+
+
+class PhraseMatcher:
+    """
+    Find every English dictionary phrase in a sentence.
+
+    This is a token-level Aho-Corasick automaton over the keys of the dictionary's 'english' map, so all matching
+    spans of a sentence, single words and multi-word glosses alike, are found in one pass over its tokens.
+    """
+
+    def __init__(self, english_dictionary: Mapping) -> None:
+        """
+        Build the automaton.
+
+        :param english_dictionary: The 'english' map of the Latin-English dictionary.
+        """
+
+        self.english_dictionary: Mapping = english_dictionary
+        self.max_length: int = 0
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[tuple[int, str]]] = [[]]
+
+        for phrase in english_dictionary:
+            self._insert(phrase)
+
+        self._link()
+
+    def _insert(self, phrase: str) -> None:
+        tokens: list[str] = tokenize(phrase)
+
+        if len(tokens) == 0:
+            return
+
+        node: int = 0
+        for token in tokens:
+            child: int | None = self._goto[node].get(token)
+
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][token] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+
+            node = child
+
+        self._outputs[node].append((len(tokens), phrase))
+        self.max_length = max(self.max_length, len(tokens))
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+
+        while queue:
+            node: int = queue.popleft()
+
+            for token, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback: int = self._fail[node]
+                while fallback != 0 and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def find(self, tokens: Iterable[str]) -> Iterator[tuple[int, int, str]]:
+        """
+        Find every dictionary phrase in a sequence of tokens.
+
+        :param tokens: The tokens of the sentence, as returned by tokenize.
+        :return: An iterator of (start, end, phrase) tuples, where tokens[start:end] matches the dictionary key phrase.
+        """
+
+        node: int = 0
+
+        for position, token in enumerate(tokens):
+            while node != 0 and token not in self._goto[node]:
+                node = self._fail[node]
+
+            node = self._goto[node].get(token, 0)
+
+            for length, phrase in self._outputs[node]:
+                yield (position + 1 - length, position + 1, phrase)
+
+    @instrumentation.timed('phrase lookup')
+    def candidates(self, tokens: list[str]) -> dict[tuple[int, int], tuple[str, ...]]:
+        """
+        Map every span of a sentence that matches a dictionary phrase to its Latin translations.
+
+        :param tokens: The tokens of the sentence, as returned by tokenize.
+        :return: A dictionary of (start, end) spans to their Latin candidates, in span order.
+        """
+
+        matches: dict[tuple[int, int], dict[str, None]] = {}
+
+        for start, end, phrase in self.find(tokens):
+            latin_words = self.english_dictionary.get(phrase)
+
+            if latin_words:
+                matches.setdefault((start, end), {}).update(dict.fromkeys(latin_words))
+
+        return {span: tuple(matches[span]) for span in sorted(matches)}
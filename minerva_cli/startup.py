@@ -0,0 +1,118 @@
+import sys
+import time
+import builtins
+from contextlib import contextmanager
+from collections.abc import Iterator
+
+
+_start_time: float = time.perf_counter()
+_original_import = builtins.__import__
+_partial: bool = False
+
+_stages: list[tuple[str, float]] = []
+_imports: list[tuple[str, float, float, int]] = []
+_children: list[float] = []
+
+
+def _import_name(name: str, globals: dict | None, fromlist, level: int) -> str:
+    """
+    Get the absolute name of an import for the report.
+    """
+
+    if level > 0:
+        package: str = (globals or {}).get('__package__') or ''
+        package = package.rsplit('.', level - 1)[0] if level > 1 else package
+        name = f'{package}.{name}' if name else package
+
+    if fromlist and name in sys.modules and hasattr(sys.modules[name], '__path__'):
+        name = f'{name}.{{{",".join(fromlist)}}}'
+
+    return name
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """
+    Time an import statement, recording it if it loaded any new modules.
+    """
+
+    if level == 0 and name in sys.modules and not fromlist:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    module_count: int = len(sys.modules)
+    _children.append(0.0)
+    start_time: float = time.perf_counter()
+
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed: float = time.perf_counter() - start_time
+        children: float = _children.pop()
+
+        if len(_children) != 0:
+            _children[-1] += elapsed
+
+        if len(sys.modules) > module_count:
+            _imports.append((_import_name(name, globals, fromlist, level), elapsed - children, elapsed, len(_children)))
+
+
+def enable(partial: bool = False) -> None:
+    """
+    Start recording the time taken by every import that loads new modules.
+
+    :param partial: Whether modules of interest were already imported, so that the report is labelled as partial.
+    :return: None
+    """
+
+    global _partial
+
+    _partial = partial
+    builtins.__import__ = _timed_import
+
+
+def enabled() -> bool:
+    """
+    Check whether imports are being recorded.
+
+    :return: True if they are.
+    """
+
+    return builtins.__import__ is _timed_import
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a named startup stage.
+
+    :param name: The stage name shown in the report.
+    :return: A context manager timing its body.
+    """
+
+    start_time: float = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        _stages.append((name, time.perf_counter() - start_time))
+
+
+def report() -> None:
+    """
+    Print the recorded imports, in the same layout as python -X importtime, followed by the stage timings.
+
+    :return: None
+    """
+
+    builtins.__import__ = _original_import
+
+    if _partial:
+        print('import time: partial, imports made before the report was enabled are not listed', file=sys.stderr)
+
+    print('import time: self [us] | cumulative | imported package', file=sys.stderr)
+    for name, self_time, cumulative_time, depth in _imports:
+        print(f'import time: {self_time * 1e6:9.0f} | {cumulative_time * 1e6:10.0f} | {"  " * depth}{name}', file=sys.stderr)
+
+    for name, elapsed in _stages:
+        print(f'stage: {elapsed * 1000:9.1f} ms | {name}', file=sys.stderr)
+
+    print(f'total: {(time.perf_counter() - _start_time) * 1000:9.1f} ms | {len(sys.modules)} modules loaded', file=sys.stderr)
@@ -0,0 +1,125 @@
+import os
+import json
+import time
+from collections.abc import Mapping
+
+from . import dictionary_manager
+
+
+TABLE_VERSION: int = 1
+
+
+def dictionary_fingerprint(english_dictionary: Mapping) -> str:
+    """
+    Fingerprint the English keys of a dictionary, read from the header of a compiled index.
+
+    :param english_dictionary: The 'english' map of the Latin-English dictionary.
+    :return: A hex digest of the keys, see dictionary_manager.english_fingerprint.
+    """
+
+    return dictionary_manager.english_fingerprint(english_dictionary).hex()
+
+
+def build_synonym_table(english_dictionary: Mapping) -> dict[str, tuple[str, ...]]:
+    """
+    Build the table of WordNet synonyms that have a Latin translation.
+
+    Every WordNet lemma is mapped to the lemmas it shares a synset with, keeping only those that are keys of the
+    dictionary's 'english' map. Lemmas left with no such synonyms are dropped.
+
+    :param english_dictionary: The 'english' map of the Latin-English dictionary.
+    :return: A dictionary of phrase to its translatable synonyms.
+    """
+
+    from nltk.corpus import wordnet
+
+    keys: set[str] = set(english_dictionary)
+    table: dict[str, tuple[str, ...]] = {}
+
+    for lemma_name in wordnet.all_lemma_names():
+        phrase: str = lemma_name.replace('_', ' ').lower()
+        synonyms: dict[str, None] = {}
+
+        for synset in wordnet.synsets(lemma_name):
+            for lemma in synset.lemmas():
+                synonym: str = lemma.name().replace('_', ' ').lower()
+
+                if synonym != phrase and synonym in keys:
+                    synonyms[synonym] = None
+
+        if len(synonyms) != 0:
+            table[phrase] = tuple(synonyms)
+
+    return table
+
+
+class SynonymTable:
+    """
+    A precomputed phrase to synonyms table, looked up without loading WordNet.
+    """
+
+    def __init__(self, synonyms: dict[str, tuple[str, ...]]) -> None:
+        self.synonyms: dict[str, tuple[str, ...]] = synonyms
+
+    def get(self, phrase: str) -> tuple[str, ...]:
+        """
+        Get the translatable synonyms of a phrase.
+
+        :param phrase: The English phrase, with words separated by spaces.
+        :return: The synonyms, empty if there are none.
+        """
+
+        return self.synonyms.get(phrase.lower(), ())
+
+    def __len__(self) -> int:
+        return len(self.synonyms)
+
+
+def save_synonym_table(table: dict[str, tuple[str, ...]], table_path: str, fingerprint: str) -> None:
+    """
+    Save a synonym table to disk.
+
+    :param table: The synonym table.
+    :param table_path: The path to save the table to.
+    :param fingerprint: The fingerprint of the dictionary the table was built for.
+    :return: None
+    """
+
+    os.makedirs(os.path.dirname(os.path.abspath(table_path)), exist_ok=True)
+    temp_path: str = f'{table_path}.tmp'
+
+    with open(temp_path, mode='w', encoding='utf-8') as file:
+        json.dump({'version': TABLE_VERSION, 'fingerprint': fingerprint, 'synonyms': table}, file, separators=(',', ':'))
+
+    os.replace(temp_path, table_path)
+
+
+def load_synonym_table(english_dictionary: Mapping, table_path: str) -> SynonymTable:
+    """
+    Load the synonym table for a dictionary, building it from WordNet first if it is missing or out of date.
+
+    :param english_dictionary: The 'english' map of the Latin-English dictionary.
+    :param table_path: The path of the on-disk table.
+    :return: The synonym table.
+    """
+
+    fingerprint: str = dictionary_fingerprint(english_dictionary)
+
+    try:
+        with open(table_path, mode='r', encoding='utf-8') as file:
+            data: dict = json.load(file)
+
+        if data.get('version') == TABLE_VERSION and data.get('fingerprint') == fingerprint:
+            return SynonymTable({phrase: tuple(synonyms) for phrase, synonyms in data['synonyms'].items()})
+    except (OSError, ValueError, KeyError):
+        pass
+
+    print('Building synonym table...')
+    start_time = time.time()
+
+    table: dict[str, tuple[str, ...]] = build_synonym_table(english_dictionary)
+    save_synonym_table(table, table_path, fingerprint)
+
+    print(f'Synonym table built in {time.time() - start_time} seconds, {len(table)} phrases')
+
+    return SynonymTable(table)
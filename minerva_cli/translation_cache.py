@@ -0,0 +1,260 @@
+import os
+import time
+import sqlite3
+import hashlib
+import inspect
+from collections.abc import Mapping
+
+from . import instrumentation
+
+
+SCHEMA_VERSION: int = 1
+
+
+class Translation:
+    """
+    The result of a translation, with the same text, src and dest attributes as a googletrans result.
+    """
+
+    def __init__(self, text: str, src: str, dest: str) -> None:
+        self.text: str = text
+        self.src: str = src
+        self.dest: str = dest
+
+    def __repr__(self) -> str:
+        return f'Translation(text={self.text!r}, src={self.src!r}, dest={self.dest!r})'
+
+
+class GoogleTranslator:
+    """
+    A translator backend that calls Google Translate through googletrans.
+    """
+
+    name: str = 'google'
+
+    def __init__(self) -> None:
+        from googletrans import Translator
+
+        self._translator = Translator()
+
+    def translate(self, text: str, dest: str = 'la', src: str = 'en') -> Translation:
+        """
+        Translate a text.
+
+        :param text: The text to translate.
+        :param dest: The language to translate to.
+        :param src: The language to translate from.
+        :return: The translation.
+        """
+
+        result = self._translator.translate(text, dest=dest, src=src)
+
+        # Newer googletrans releases return a coroutine
+        if inspect.isawaitable(result):
+            import asyncio
+
+            result = asyncio.run(result)
+
+        return Translation(str(result.text), src, dest)
+
+
+class StubTranslator:
+    """
+    A translator backend that never leaves the machine, for tests and offline benchmarks.
+
+    Texts found in the given translations are translated to their value and any other text is returned unchanged.
+    """
+
+    name: str = 'stub'
+
+    def __init__(self, translations: Mapping[str, str] | None = None, delay: float = 0.0) -> None:
+        """
+        Create a stub translator.
+
+        :param translations: A dictionary of text to its translation.
+        :param delay: The number of seconds each call sleeps, to stand in for network latency.
+        """
+
+        self.translations: Mapping[str, str] = translations or {}
+        self.delay: float = delay
+        self.calls: int = 0
+
+    def translate(self, text: str, dest: str = 'la', src: str = 'en') -> Translation:
+        """
+        Translate a text.
+
+        :param text: The text to translate.
+        :param dest: The language to translate to.
+        :param src: The language to translate from.
+        :return: The translation.
+        """
+
+        self.calls += 1
+
+        if self.delay > 0:
+            time.sleep(self.delay)
+
+        return Translation(self.translations.get(text, text), src, dest)
+
+
+TRANSLATOR_BACKENDS: dict[str, type] = {
+    'google': GoogleTranslator,
+    'stub': StubTranslator,
+}
+
+
+class CachedTranslator:
+    """
+    A persistent translation cache in front of any translator backend.
+
+    Translations are stored in SQLite under the SHA-256 of the backend name, languages and text, so a text already
+    translated is answered from disk without calling the backend again. Entries older than ttl seconds are translated
+    again, and once the cache holds more than max_entries the least recently used are evicted.
+    """
+
+    def __init__(self, backend, cache_path: str, ttl: float | None = 30 * 24 * 60 * 60, max_entries: int | None = 100000) -> None:
+        """
+        Open a translation cache, creating it if it does not exist.
+
+        :param backend: The translator to call on a miss, anything with a translate(text, dest, src) method returning
+            an object with a text attribute, such as GoogleTranslator or StubTranslator.
+        :param cache_path: The path of the SQLite database.
+        :param ttl: The number of seconds a translation stays valid, forever if None.
+        :param max_entries: The maximum number of translations to keep, unlimited if None.
+        """
+
+        self.backend = backend
+        self.cache_path: str = cache_path
+        self.ttl: float | None = ttl
+        self.max_entries: int | None = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+
+        self._connection: sqlite3.Connection = sqlite3.connect(cache_path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+
+        if self._connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            with self._connection:
+                self._connection.execute('DROP TABLE IF EXISTS translations')
+                self._connection.execute('CREATE TABLE translations (key BLOB PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL) WITHOUT ROWID')
+                self._connection.execute('CREATE INDEX translations_accessed ON translations (accessed)')
+                self._connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        self._count: int = self._connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+        instrumentation.watch_cache('translations', self)
+
+    def _key(self, text: str, dest: str, src: str) -> bytes:
+        """
+        Get the cache key of a translation.
+
+        :param text: The text to translate.
+        :param dest: The language to translate to.
+        :param src: The language to translate from.
+        :return: The SHA-256 digest identifying the translation.
+        """
+
+        backend_name: str = getattr(self.backend, 'name', type(self.backend).__name__)
+
+        return hashlib.sha256('\0'.join((backend_name, src, dest, text)).encode('utf-8')).digest()
+
+    @instrumentation.timed('translation')
+    def translate(self, text: str, dest: str = 'la', src: str = 'en') -> Translation:
+        """
+        Translate a text, from the cache if possible.
+
+        :param text: The text to translate.
+        :param dest: The language to translate to.
+        :param src: The language to translate from.
+        :return: The translation.
+        """
+
+        key: bytes = self._key(text, dest, src)
+        now: float = time.time()
+        row: tuple | None = self._connection.execute('SELECT text, created FROM translations WHERE key = ?', (key,)).fetchone()
+
+        if row is not None and (self.ttl is None or now - row[1] <= self.ttl):
+            self.hits += 1
+
+            with self._connection:
+                self._connection.execute('UPDATE translations SET accessed = ? WHERE key = ?', (now, key))
+
+            return Translation(row[0], src, dest)
+
+        self.misses += 1
+        translated: str = str(self.backend.translate(text, dest=dest, src=src).text)
+
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO translations (key, text, created, accessed) VALUES (?, ?, ?, ?)', (key, translated, now, now))
+
+            if row is None:
+                self._count += 1
+
+            if self.max_entries is not None and self._count > self.max_entries:
+                self._evict(now)
+
+        return Translation(translated, src, dest)
+
+    def _evict(self, now: float) -> None:
+        """
+        Delete expired translations, then the least recently used ones, down to max_entries.
+
+        Some headroom is cleared below the limit so that eviction runs once per batch of inserts rather than on every
+        one.
+
+        :param now: The current time.
+        :return: None
+        """
+
+        if self.ttl is not None:
+            self._connection.execute('DELETE FROM translations WHERE created < ?', (now - self.ttl,))
+
+        target: int = self.max_entries - self.max_entries // 10
+        self._count = self._connection.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+        if self._count > target:
+            self._connection.execute('DELETE FROM translations WHERE key IN (SELECT key FROM translations ORDER BY accessed LIMIT ?)', (self._count - target,))
+            self._count = target
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """
+        Close the cache database.
+
+        :return: None
+        """
+
+        self._connection.close()
+
+    def __enter__(self) -> 'CachedTranslator':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def open_translator(backend_name: str, cache_path: str | None, ttl: float | None = 30 * 24 * 60 * 60, max_entries: int | None = 100000) -> 'CachedTranslator | GoogleTranslator | StubTranslator':
+    """
+    Create a translator backend, behind a persistent cache when a cache path is given.
+
+    :param backend_name: The backend, 'google' or 'stub'.
+    :param cache_path: The path of the SQLite cache, no cache if None.
+    :param ttl: The number of seconds a cached translation stays valid, forever if None.
+    :param max_entries: The maximum number of cached translations, unlimited if None.
+    :return: The translator.
+    """
+
+    backend_type: type | None = TRANSLATOR_BACKENDS.get(backend_name)
+
+    if backend_type is None:
+        raise ValueError(f'Unsupported translator backend: {backend_name}')
+
+    if cache_path is None:
+        return backend_type()
+
+    return CachedTranslator(backend_type(), cache_path, ttl, max_entries)
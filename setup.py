@@ -7,6 +7,9 @@ setup(
     install_requires=[
         'selenium',
     ],
+    extras_require={
+        'test': ['pytest'],
+    },
     entry_points={
         'console_scripts': [
             'minerva-cli=minerva_cli.main:main',
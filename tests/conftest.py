@@ -0,0 +1,42 @@
+from collections.abc import Callable
+
+import pytest
+
+from minerva_cli import dictionary_manager
+
+
+def build_dictionary(entries: dict[str, list[str]]) -> dict:
+    """
+    Build a frozen dictionary from Latin words and their English definitions, as generate_dictionary would.
+    """
+
+    dictionary: dict = dictionary_manager.new_dictionary()
+
+    for latin_word, english_words in entries.items():
+        dictionary_manager.add_entry(dictionary, latin_word, english_words)
+
+    return dictionary_manager.freeze_dictionary(dictionary)
+
+
+@pytest.fixture
+def build() -> Callable[[dict[str, list[str]]], dict]:
+    """
+    Build frozen dictionaries, see build_dictionary.
+    """
+
+    return build_dictionary
+
+
+@pytest.fixture
+def write_index(tmp_path) -> Callable[[dict], str]:
+    """
+    Write dictionaries to a compiled index in the test's temporary directory, returning its path.
+    """
+
+    def write(dictionary: dict) -> str:
+        index_path: str = str(tmp_path / 'dictionary.idx')
+        dictionary_manager.write_index(dictionary, index_path, bytes(32))
+
+        return index_path
+
+    return write
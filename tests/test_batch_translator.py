@@ -0,0 +1,22 @@
+import io
+import json
+
+from minerva_cli import batch_translator
+
+
+def test_workers_write_the_same_lines_in_order(build, write_index):
+    index_path: str = write_index(build({'amo': ['love'], 'domus': ['home', 'house'], 'salve': ['good morning']}))
+    lines: list[str] = [f'good morning I love my {word}' for word in ('home', 'house', 'garden')] * 20
+    outputs: list[list[dict]] = []
+
+    for workers in (1, 2):
+        output = io.StringIO()
+
+        assert batch_translator.translate_batch(batch_translator.read_sentences(lines), output, index_path, workers, chunk_size=7, fuzzy_distance=2) == len(lines)
+
+        outputs.append([json.loads(line) for line in output.getvalue().splitlines()])
+
+    assert outputs[0] == outputs[1]
+    assert [result['line'] for result in outputs[0]] == list(range(1, len(lines) + 1))
+    assert outputs[0][0]['candidates'] == ['salve', 'domus', 'amo']
+    assert batch_translator._worker == {}
@@ -0,0 +1,111 @@
+import pytest
+
+from minerva_cli import candidate_generator
+from minerva_cli import dictionary_manager
+
+
+# 'res' has more senses than 'materia', but every one of them is shared with other words
+LEXICON: dict[str, list[str]] = {
+    'res': ['thing', 'matter', 'affair', 'business'],
+    'materia': ['matter', 'material', 'timber'],
+    'causa': ['thing', 'matter', 'affair', 'case'],
+    'negotium': ['thing', 'affair', 'business'],
+}
+
+
+def test_precise_words_outrank_vague_ones(build):
+    dictionary: dict = build(LEXICON)
+    generator = candidate_generator.CandidateGenerator(dictionary)
+
+    assert [dictionary_manager.gloss_frequency(dictionary, latin_word) for latin_word in ('materia', 'causa', 'res')] == [2333, 1999, 1499]
+    assert generator.generate('matter') == ['materia', 'causa', 'res']
+
+
+def test_compiled_index_stores_gloss_frequencies(build, write_index):
+    dictionary: dict = build(LEXICON)
+    index_path: str = write_index(dictionary)
+
+    with dictionary_manager.CompiledDictionary(index_path) as compiled:
+        for latin_word in LEXICON:
+            assert dictionary_manager.gloss_frequency(compiled, latin_word) == dictionary['frequency'][latin_word]
+
+        assert dictionary_manager.gloss_frequency(compiled, 'nihil') == 0
+        assert candidate_generator.CandidateGenerator(compiled).generate('matter') == ['materia', 'causa', 'res']
+
+
+SENTENCE: str = 'They ran home on the beautifull good morning'
+
+ENTRIES: dict[str, list[str]] = {
+    'amo': ['love'],
+    'curro': ['run'],
+    'domus': ['home', 'house'],
+    'casa': ['house', 'cottage'],
+    'pulcher': ['beautiful'],
+    'bonus': ['good'],
+    'salve': ['good morning'],
+}
+
+
+def lemmatize(tokens: list[str]) -> list[str]:
+    return [{'ran': 'run', 'loved': 'love', 'homes': 'home'}.get(token, token) for token in tokens]
+
+
+def synonyms(phrase: str) -> list[str]:
+    return {'home': ['house']}.get(phrase, [])
+
+
+@pytest.fixture
+def generator(build) -> candidate_generator.CandidateGenerator:
+    from minerva_cli import fuzzy_matcher
+
+    dictionary: dict = build(ENTRIES)
+
+    return candidate_generator.CandidateGenerator(dictionary, lemmatize=lemmatize, synonyms=synonyms, fuzzy=fuzzy_matcher.FuzzyMatcher(dictionary['english']))
+
+
+def test_candidates_found_several_ways_keep_their_best_score(generator):
+    scores: dict[str, tuple[int, int, int]] = generator.score(SENTENCE)
+
+    # domus is an exact match, a base form match and a synonym match of 'home', bonus and salve are also base form matches
+    assert scores == {
+        'domus': (candidate_generator.MATCH_EXACT, 1, 1500),
+        'bonus': (candidate_generator.MATCH_EXACT, 1, 1000),
+        'salve': (candidate_generator.MATCH_EXACT, 2, 1000),
+        'curro': (candidate_generator.MATCH_LEMMA, 1, 1000),
+        'casa': (candidate_generator.MATCH_SYNONYM, 1, 1500),
+        'pulcher': (candidate_generator.MATCH_FUZZY, 1, 1000),
+    }
+
+
+def test_candidates_are_ranked_by_match_type_span_length_and_frequency(generator):
+    assert generator.generate(SENTENCE) == ['salve', 'domus', 'bonus', 'curro', 'casa', 'pulcher']
+
+
+def test_top_k_keeps_the_best_candidates(generator):
+    ranked: list[str] = generator.generate(SENTENCE)
+
+    for top_k in range(len(ranked) + 2):
+        assert generator.generate(SENTENCE, top_k) == ranked[:top_k]
+
+    assert generator.generate_all([SENTENCE, 'love'], 2) == [ranked[:2], ['amo']]
+
+
+def test_spans_cover_the_matched_tokens(generator):
+    assert generator.span_candidates(SENTENCE) == {
+        (1, 2): ('curro',),
+        (2, 3): ('domus', 'casa'),
+        (5, 6): ('pulcher',),
+        (6, 7): ('bonus',),
+        (6, 8): ('salve',),
+    }
+    assert generator.span_candidates('good') == {(0, 1): ('bonus',)}
+    assert generator.span_candidates('morning good') == {(1, 2): ('bonus',)}
+    assert generator.span_candidates('') == {}
+    assert generator.generate('') == []
+
+
+def test_inflected_spans_use_the_synonyms_of_their_base_form(generator):
+    assert generator.score('homes') == {
+        'domus': (candidate_generator.MATCH_LEMMA, 1, 1500),
+        'casa': (candidate_generator.MATCH_SYNONYM, 1, 1500),
+    }
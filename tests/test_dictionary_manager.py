@@ -0,0 +1,114 @@
+import os
+import json
+import random
+import hashlib
+
+import pytest
+
+from minerva_cli import dictionary_manager
+from minerva_cli import synonym_manager
+
+
+def test_compiled_index_stores_plain_spellings(build, write_index):
+    dictionary: dict = build({'Iūlius': ['Julius'], 'jūs': ['right', 'law']})
+    index_path: str = write_index(dictionary)
+
+    with dictionary_manager.CompiledDictionary(index_path) as compiled:
+        assert dictionary_manager.plain_spelling(compiled, 'Iūlius') == 'iulius'
+        assert dictionary_manager.plain_spelling(compiled, 'jūs') == 'jus'
+        assert dictionary_manager.plain_spelling(compiled, 'Rōma') == 'roma'
+
+    assert dictionary_manager.plain_spelling(dictionary, 'jūs') == 'jus'
+
+
+def test_compiled_index_stores_the_english_fingerprint(build, write_index):
+    dictionary: dict = build({'amo': ['love'], 'Iūlius': ['Julius'], 'domus': ['home', 'house']})
+    index_path: str = write_index(dictionary)
+    digests: int = sum(int.from_bytes(hashlib.sha256(key).digest(), 'little') for key in (b'love', b'julius', b'home', b'house'))
+    expected: str = (digests % (1 << 256)).to_bytes(32, 'little').hex()
+
+    assert synonym_manager.dictionary_fingerprint(dictionary['english']) == expected
+
+    with dictionary_manager.CompiledDictionary(index_path) as compiled:
+        assert compiled['english'].keys_digest.hex() == expected
+        assert synonym_manager.dictionary_fingerprint(compiled['english']) == expected
+
+
+def test_truncated_indexes_are_rejected(build, write_index):
+    index_path: str = write_index(build({'amo': ['love'], 'domus': ['home', 'house']}))
+
+    with open(index_path, mode='rb') as file:
+        data: bytes = file.read()
+
+    for size in (len(data) // 2, len(data) - 3):
+        with open(index_path, mode='wb') as file:
+            file.write(data[:size])
+
+        with pytest.raises(ValueError, match='Invalid dictionary index'):
+            dictionary_manager.CompiledDictionary(index_path)
+
+
+GLOSSES: list[str] = ['love', 'Home', 'house', 'war', 'to be', 'good', 'road', 'rose']
+
+
+def write_source(directory, name: str, latin_word: str, english_words: list[str], forms: list[str]) -> str:
+    file = directory / name
+    file.write_text(json.dumps({'word': latin_word, 'definitions': english_words, 'forms': forms}), encoding='utf-8')
+
+    # Give every write a new modification time, however coarse the file system's clock
+    stat = os.stat(file)
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9 * len(os.listdir(directory))))
+
+    return str(file)
+
+
+def random_source(directory, name: str, rng: random.Random) -> str:
+    latin_word: str = rng.choice(['verbum', 'vērbum', 'rosa', 'bellum', 'via', 'domus']) + str(rng.randint(0, 3))
+
+    return write_source(directory, name, latin_word, rng.sample(GLOSSES, rng.randint(1, 3)), rng.sample(['amat', 'amant', 'vias', 'rosae'], rng.randint(0, 2)))
+
+
+def compiled_state(index_path: str) -> tuple:
+    with dictionary_manager.CompiledDictionary(index_path) as compiled:
+        latin = compiled['latin']
+
+        return (compiled.to_dict(), {latin_word: latin.frequency(latin_word) for latin_word in latin}, dictionary_manager.english_fingerprint(compiled['english']), [list(compiled[section]) for section in dictionary_manager.INDEX_SECTIONS])
+
+
+def test_updates_match_a_fresh_compile(tmp_path):
+    sources = tmp_path / 'dictionary'
+    sources.mkdir()
+    rng: random.Random = random.Random(0)
+    files: list[str] = [random_source(sources, f'f{position:02}.json', rng) for position in range(40)]
+
+    # f03 and f33 both define verbum9, which f33 comes last to provide
+    write_source(sources, 'f03.json', 'verbum9', ['love', 'war'], ['amat'])
+    write_source(sources, 'f33.json', 'verbum9', ['road', 'Home'], [])
+
+    index_path: str = str(tmp_path / 'dictionary.idx')
+    dictionary_manager.compile_dictionary(files, index_path)
+
+    write_source(sources, 'f03.json', 'verbum9', ['good', 'war', 'rose'], ['vias'])
+    dictionary_manager.update_dictionary(files, index_path)
+
+    with dictionary_manager.CompiledDictionary(index_path) as compiled:
+        assert compiled['latin']['verbum9'] == {'english': ('road', 'Home')}
+
+    for _ in range(8):
+        for file in rng.sample(files, 3):
+            random_source(sources, os.path.basename(file), rng)
+
+        for file in rng.sample(files, 2):
+            os.remove(file)
+            files.remove(file)
+
+        for _ in range(2):
+            files.append(random_source(sources, f'f{rng.randint(0, 99):02}{rng.choice("ab")}.json', rng))
+
+        files = sorted(set(files))
+        dictionary_manager.update_dictionary(files, index_path)
+
+        fresh_path: str = str(tmp_path / 'fresh.idx')
+        dictionary_manager.compile_dictionary(files, fresh_path)
+
+        assert compiled_state(index_path) == compiled_state(fresh_path)
@@ -0,0 +1,137 @@
+import os
+import time
+import socket
+import asyncio
+import threading
+import contextlib
+
+import pytest
+
+from minerva_cli import candidate_generator
+from minerva_cli import dictionary_manager
+from minerva_cli import dictionary_service
+from minerva_cli import fuzzy_matcher
+from minerva_cli import phrase_matcher
+
+
+ENTRIES: dict[str, list[str]] = {
+    'amo': ['love'],
+    'domus': ['home', 'house'],
+    'casa': ['house', 'cottage'],
+}
+
+
+@pytest.fixture
+def dictionary(build) -> dict:
+    return build(ENTRIES)
+
+
+def synonyms(phrase: str) -> list[str]:
+    return {'home': ['house']}.get(phrase, [])
+
+
+def local_lookup(dictionary: dict, query: str, fuzzy: bool, use_synonyms: bool) -> dict:
+    matcher = phrase_matcher.PhraseMatcher(dictionary['english'])
+    english_fuzzy = fuzzy_matcher.FuzzyMatcher(dictionary['english'], 2) if fuzzy else None
+    generator = candidate_generator.CandidateGenerator(dictionary, matcher, None, synonyms if use_synonyms else None, english_fuzzy)
+
+    return dictionary_service.lookup_result(query, 'english', dictionary, matcher, english_fuzzy, generator=generator)
+
+
+def test_served_candidates_follow_the_request_options(dictionary):
+    service = dictionary_service.DictionaryService(dictionary, synonyms, fuzzy_distance=2, base=False)
+
+    for query in ('lvoe', 'home'):
+        for fuzzy in (False, True):
+            for use_synonyms in (False, True):
+                request: dict = {'op': 'lookup', 'queries': [query], 'candidates': True, 'fuzzy': fuzzy, 'synonyms': use_synonyms}
+
+                assert service.handle(request)['results'] == [local_lookup(dictionary, query, fuzzy, use_synonyms)]
+
+    assert service.handle({'op': 'lookup', 'queries': ['lvoe'], 'candidates': True})['results'][0]['candidates'] == []
+    assert service.handle({'op': 'lookup', 'queries': ['lvoe'], 'candidates': True, 'fuzzy': True})['results'][0]['candidates'] == ['amo']
+    assert service.handle({'op': 'candidates', 'sentences': ['home']})['results'] == [['domus', 'casa']]
+
+
+def test_base_forms_are_refused_without_the_lemmatizer(dictionary):
+    service = dictionary_service.DictionaryService(dictionary, base=False)
+
+    with pytest.raises(ValueError, match='Base forms are not loaded'):
+        service.handle({'op': 'lookup', 'queries': ['home'], 'base': True})
+
+
+@contextlib.contextmanager
+def running(service: dictionary_service.DictionaryService, socket_path: str):
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(dictionary_service._serve(service, socket_path))
+    thread = threading.Thread(target=loop.run_until_complete, args=(task,))
+    thread.start()
+
+    try:
+        deadline: float = time.time() + 10
+
+        while not dictionary_service._socket_in_use(socket_path):
+            assert thread.is_alive() and time.time() < deadline
+            time.sleep(0.01)
+
+        yield
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join()
+        loop.close()
+
+
+def test_round_trip_over_a_unix_socket(tmp_path, dictionary):
+    socket_path: str = str(tmp_path / 's.sock')
+    service = dictionary_service.DictionaryService(dictionary, synonyms, fuzzy_distance=2, base=False)
+
+    # A socket left behind by a service that did not shut down cleanly
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+
+    with running(service, socket_path):
+        with dictionary_service.DictionaryClient(socket_path, timeout=10) as client:
+            assert client.request({'op': 'ping', 'id': 7}) == {'entries': 4, 'requests': 1, 'id': 7}
+            assert client.lookup(['love', 'lvoe'], fuzzy=True) == [
+                {'query': 'love', 'translations': ['amo']},
+                {'query': 'lvoe', 'matches': [{'key': 'love', 'distance': 1}], 'translations': ['amo']},
+            ]
+            assert client.candidates(['home'], top_k=1) == [['domus']]
+
+            for request, error in [
+                ({'op': 'lookup', 'queries': 'abc'}, 'Request field queries must be a list of strings'),
+                ({'op': 'candidates'}, "Missing request field: 'sentences'"),
+                ({'op': 'lookup', 'queries': ['love'], 'language': 'greek'}, 'Unsupported language: greek'),
+                ({'op': 'drop'}, 'Unsupported request: drop'),
+            ]:
+                with pytest.raises(ValueError, match=error):
+                    client.request(request)
+
+            # The connection is still usable after errors
+            assert client.request({'op': 'ping'})['requests'] == 8
+
+        with pytest.raises(RuntimeError, match='already running'):
+            asyncio.run(dictionary_service._serve(service, socket_path))
+
+    assert not os.path.exists(socket_path)
+
+
+def test_fuzzy_misses_are_looked_up_once(dictionary):
+    calls: list[str] = []
+
+    class CountingMatcher(fuzzy_matcher.FuzzyMatcher):
+        def lookup(self, word: str, max_distance: int | None = None, top_k: int = 5) -> list[tuple[str, int]]:
+            calls.append(word)
+
+            return super().lookup(word, max_distance, top_k)
+
+    english_fuzzy = CountingMatcher(dictionary['english'], 2)
+    latin_fuzzy = CountingMatcher(dictionary['latin'], 2, normalize=dictionary_manager.fold)
+
+    assert dictionary_service.lookup_result('lvoe', 'english', dictionary, fuzzy=english_fuzzy) == {
+        'query': 'lvoe', 'matches': [{'key': 'love', 'distance': 1}], 'translations': ['amo'],
+    }
+    assert dictionary_service.lookup_result('domos', 'latin', dictionary, fuzzy=latin_fuzzy) == {
+        'query': 'domos', 'matches': [{'key': 'domus', 'distance': 1}], 'translations': ['home', 'house'],
+    }
+    assert calls == ['lvoe', 'domos']
@@ -0,0 +1,19 @@
+import itertools
+
+from minerva_cli import fuzzy_matcher
+
+
+KEYS: list[str] = ['to carry', 'to carve', 'to care', 'to be', 'tonic', 'carry', 'the cart', 'to', 'cart']
+
+
+def test_lookups_match_a_full_scan_around_the_leading_word():
+    matcher = fuzzy_matcher.FuzzyMatcher(KEYS)
+    queries: list[str] = ['to carry', 'ot carry', 'toc arry', 'tocarry', 't carry', 'to  cary', 'tp carve', 'o care', 'tonci', 'tto be', 'cary', 'thecart', 'to']
+
+    for query, max_distance in itertools.product(queries, (0, 1, 2)):
+        expected: list[tuple[str, int]] = sorted(
+            ((key, fuzzy_matcher.edit_distance(query, key, max_distance)) for key in KEYS),
+            key=lambda match: (match[1], KEYS.index(match[0]))
+        )
+
+        assert matcher.lookup(query, max_distance, top_k=len(KEYS)) == [match for match in expected if match[1] <= max_distance]
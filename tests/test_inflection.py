@@ -0,0 +1,45 @@
+from minerva_cli import inflection
+
+
+def forms(latin_word: str, *parts: str) -> list[str]:
+    return inflection.expand(latin_word, {'parts': [latin_word, *parts]})
+
+
+def test_second_declension_er_nouns_are_declined():
+    assert {'pueri', 'puero', 'puerum', 'puerorum', 'pueros', 'pueris'} <= set(forms('puer', 'pueri'))
+    assert {'agri', 'agro', 'agrum', 'agrorum', 'agros', 'agris'} <= set(forms('ager', 'agri'))
+    assert {'magistri', 'magistro', 'magistrum', 'magistrorum'} <= set(forms('magister', 'magistri'))
+    assert {'libri', 'libro', 'librum', 'librorum'} <= set(forms('liber', 'libri'))
+
+
+def test_abbreviated_er_genitives_are_completed():
+    assert 'magistrum' in forms('magister', '-tri')
+    assert 'agrum' in forms('ager', '-gri')
+    assert 'puerum' in forms('puer', '-i')
+    assert 'puellam' in forms('puella', '-ae')
+
+
+def test_verbs_are_still_recognised_without_a_part_of_speech():
+    assert {'amat', 'amabat', 'amavit'} <= set(forms('amo', 'amare', 'amavi', 'amatum'))
+    assert 'monebat' in forms('moneo', 'monere', 'monui', 'monitum')
+
+
+def test_third_conjugation_deponent_stem():
+    queror: list[str] = forms('queror', 'queri', 'questus sum')
+
+    assert {'queritur', 'querebatur', 'queruntur', 'querens'} <= set(queror)
+    assert 'quitur' not in queror
+
+
+def test_second_conjugation_deponent_stem():
+    assert {'veretur', 'verebatur', 'verentur'} <= set(forms('vereor', 'vereri', 'veritus sum'))
+
+
+def test_sum_compounds():
+    possum: list[str] = forms('possum', 'posse', 'potui')
+    prosum: list[str] = forms('prosum', 'prodesse', 'profui')
+
+    assert {'potest', 'possunt', 'poterat', 'possim', 'possem', 'posse', 'potuit'} <= set(possum)
+    assert not {'posest', 'potesse', 'posfuit', 'potfuit'} & set(possum)
+    assert {'prodest', 'prosunt', 'proderat', 'prodesse', 'profuit'} <= set(prosum)
+    assert {'abest', 'aberat', 'abfuit'} <= set(forms('absum', 'abesse', 'afui'))